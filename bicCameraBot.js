@@ -7,12 +7,17 @@ const BicCameraCheckoutService = require('./services/bicCamera/bicCameraCheckout
 const SessionManager = require('./utils/sessionManager');
 const ExcelManager = require('./utils/excelManager');
 const ProxyManager = require('./config/proxyManager');
+const RunState = require('./utils/runState');
+const LeanMode = require('./utils/leanMode');
 
 class BicCameraBot {
     constructor(config) {
         this.config = config;
+        logger.defaultMeta = { ...(logger.defaultMeta || {}), bot: 'BicCamera', pid: process.pid };
         this.sessionManager = new SessionManager();
-        this.excelManager = new ExcelManager(config.excel);
+        this.excelManager = new ExcelManager(config.excel, 'BicCamera');
+        this.runState = new RunState('BicCamera');
+        this.leanMode = LeanMode.fromEnv('BicCamera');
         this.context = null;
     }
 
@@ -20,14 +25,18 @@ class BicCameraBot {
         try {
             const browser = await chromium.connectOverCDP('http://localhost:9222');
 
-            const proxyManager = new ProxyManager();
+            const proxyManager = ProxyManager.shared();
             const proxyServer = proxyManager.getRandomProxy();
             
             this.context = 
                 // browser.contexts()[0] || 
                 await browser.newContext({
-                    proxy: proxyServer || undefined
+                    proxy: proxyServer || undefined,
+                    serviceWorkers: this.leanMode ? 'block' : 'allow'
                 });
+            if (this.leanMode) {
+                await this.leanMode.attach(this.context);
+            }
             
             this.page = await this.context.newPage();
             // await this.page.goto('http://httpbin.org/ip', { waitUntil: 'domcontentloaded' });
@@ -77,15 +86,29 @@ class BicCameraBot {
     async monitorProducts(account, productUrls) {
         // Split URLs by comma and trim whitespace
         const urls = productUrls.split(',').map(url => url.trim());
+        const carted = [];
         
         for (const url of urls) {
             const productInfo = await this.productService.checkProduct(url);
             if (productInfo) {
                 await this.checkoutService.addToCart();
-                await this.checkoutService.checkout(account.Card, account.Address);
-                this.excelManager.logOrder(productInfo);
+                carted.push({ url, productInfo });
             }
         }
+
+        if (carted.length === 0) {
+            return;
+        }
+        const checkedOut = await this.checkoutService.checkout(account.Card, account.Address);
+        if (!checkedOut) {
+            // Leave the URLs pending so the next run retries them
+            logger.warn(`Checkout failed for ${account.Email}; ${carted.length} carted items not recorded as purchased`);
+            return;
+        }
+        for (const { url, productInfo } of carted) {
+            this.excelManager.logOrder(productInfo, 'Purchased', { account: account.Email, url });
+            this.runState.markDone(account.Email, url);
+        }
     }
 
     async close() {
@@ -106,6 +129,14 @@ class BicCameraBot {
             
             // Process each account
             for (const account of accounts) {
+                // Resume: skip accounts whose URLs were all completed in an earlier run
+                const urls = RunState.splitUrls(account.URL);
+                const pendingUrls = this.runState.pending(account.Email, urls);
+                if (urls.length > 0 && pendingUrls.length === 0) {
+                    logger.info(`Skipping completed account: ${account.Email} (${urls.length} URLs already purchased)`);
+                    continue;
+                }
+
                 try {
                     await this.initialize();
                     logger.info(`Processing account: ${account.Email}`);
@@ -118,7 +149,7 @@ class BicCameraBot {
                     }
 
                     // Process products for this account
-                    await this.monitorProducts(account, account.URL);
+                    await this.monitorProducts(account, pendingUrls.join(','));
                     
                     await this.close();
                     
@@ -128,6 +159,7 @@ class BicCameraBot {
                     continue; // Continue with next account even if current one fails
                 }
             }
+            this.runState.finishIfComplete(accounts);
         } catch (error) {
             logger.error('Bot execution failed:', error);
             await this.close(); // Make sure to close browser on error
@@ -136,16 +168,16 @@ class BicCameraBot {
     }
 }
 
-// CLI setup
-program
-    .version('1.0.0')
-    .option('-e, --excel <path>', 'Path to Excel configuration file')
-    .parse(process.argv);
-
-const options = program.opts();
-
 // Main execution
 async function main() {
+    // CLI setup
+    program
+        .version('1.0.0')
+        .option('-e, --excel <path>', 'Path to Excel configuration file')
+        .parse(process.argv);
+
+    const options = program.opts();
+
     if (!options.excel) {
         logger.error('Error: Excel file path is required');
         console.log('Usage: node bicCameraBot.js --excel <path>');
@@ -161,4 +193,8 @@ async function main() {
     }
 }
 
-main(); 
\ No newline at end of file
+if (require.main === module) {
+    main();
+}
+
+module.exports = BicCameraBot; 
\ No newline at end of file
@@ -0,0 +1,45 @@
+// Request rules for lean page mode (utils/leanMode.js). A request is aborted
+// when its resource type is in denyTypes or its URL contains one of
+// denyPatterns, unless the URL contains one of allowPatterns. A platform entry
+// replaces denyTypes and adds to the default pattern lists.
+module.exports = {
+    default: {
+        denyTypes: ['image', 'media', 'font'],
+        denyPatterns: [
+            'google-analytics.com',
+            'googletagmanager.com',
+            'doubleclick.net',
+            'googlesyndication.com',
+            'googleadservices.com',
+            'connect.facebook.net',
+            'facebook.com/tr',
+            'analytics.twitter.com',
+            'static.ads-twitter.com',
+            'analytics.tiktok.com',
+            'bat.bing.com',
+            'clarity.ms',
+            'hotjar.com',
+            'criteo.com',
+            'criteo.net',
+            'adnxs.com',
+            'yjtag.jp',
+            's.yimg.jp/images/listing'
+        ],
+        // Captcha and bot-check widgets must load or login/checkout stalls
+        allowPatterns: [
+            'recaptcha',
+            'hcaptcha.com',
+            'challenges.cloudflare.com',
+            'arkoselabs.com'
+        ]
+    },
+    Rakuten: {
+        denyPatterns: ['rat.rakuten.co.jp']
+    },
+    Yodobashi: {},
+    // The login captcha is solved by reading image pixels, so images stay on
+    BicCamera: {
+        denyTypes: ['media', 'font']
+    },
+    PopMart: {}
+};
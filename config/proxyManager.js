@@ -1,11 +1,52 @@
 const fs = require('fs');
 const path = require('path');
+const http = require('http');
+const logger = require('./logger');
 
+const DEFAULT_PROBE_URL = 'http://www.gstatic.com/generate_204';
+const PROBE_TIMEOUT_MS = 5000;
+const PROBE_CONCURRENCY = 8;
+// Weight of the newest sample in the latency and error averages
+const EWMA_ALPHA = 0.3;
+// Proxies nobody has probed yet are assumed to be this slow
+const UNPROBED_LATENCY_MS = 1500;
+const QUARANTINE_AFTER_FAILURES = 3;
+const QUARANTINE_BASE_MS = 60 * 1000;
+const QUARANTINE_MAX_MS = 30 * 60 * 1000;
+
+let sharedManager = null;
+
+// Proxy pool from config/proxies.txt with per-proxy health scores.
+// Probes send a plain HTTP request through each proxy and fold the latency and
+// the outcome into EWMAs; getRandomProxy() picks proxies with a weight of
+// 1 / (latency * (1 + 4 * errorRate)) and skips quarantined ones. Scores are
+// persisted to data/proxy_scores.json so a restart starts from what was learned.
+// Several bot processes share that file, so saveScores() merges per proxy:
+// the most recently probed entry wins (averages and quarantine) and
+// success/failure counts are added as deltas.
 class ProxyManager {
-    constructor(proxyFilePath = path.join(__dirname, 'proxies.txt')) {
+    constructor(proxyFilePath = path.join(__dirname, 'proxies.txt'), options = {}) {
         this.proxyFilePath = proxyFilePath;
+        this.scoresPath = options.scoresPath || path.join('data', 'proxy_scores.json');
+        this.probeUrl = options.probeUrl || process.env.PROXY_PROBE_URL || DEFAULT_PROBE_URL;
         this.proxies = [];
+        this.scores = {};
+        // Success/failure counts recorded since the last save, per proxy key
+        this.pending = {};
+        this.probeTimer = null;
+        this.probing = null;
         this.loadProxies();
+        this.loadScores();
+    }
+
+    static shared() {
+        // One pool per process, so the health checks run once however many
+        // contexts ask for a proxy
+        if (!sharedManager) {
+            sharedManager = new ProxyManager();
+            sharedManager.startHealthChecks(parseInt(process.env.PROXY_PROBE_INTERVAL_MS, 10) || 60000);
+        }
+        return sharedManager;
     }
 
     loadProxies() {
@@ -41,11 +82,246 @@ class ProxyManager {
         return null;
     }
 
+    static key(proxy) {
+        return proxy.username ? `${proxy.username}@${proxy.server}` : proxy.server;
+    }
+
+    readScores() {
+        try {
+            const data = JSON.parse(fs.readFileSync(this.scoresPath, 'utf8'));
+            return data.proxies || {};
+        } catch (error) {
+            return {};
+        }
+    }
+
+    loadScores() {
+        this.scores = {};
+        for (const [key, entry] of Object.entries(this.readScores())) {
+            // quarantined/share are derived by status() and not part of the score
+            const { quarantined, share, ...score } = entry;
+            this.scores[key] = score;
+        }
+    }
+
+    score(proxy) {
+        const key = ProxyManager.key(proxy);
+        if (!this.scores[key]) {
+            this.scores[key] = {
+                server: proxy.server,
+                username: proxy.username || null,
+                latencyMs: null,
+                errorRate: 0,
+                successes: 0,
+                failures: 0,
+                consecutiveFailures: 0,
+                quarantinedUntil: null,
+                lastProbeAt: null,
+                lastError: null
+            };
+        }
+        return this.scores[key];
+    }
+
+    isQuarantined(proxy, now = Date.now()) {
+        const until = this.score(proxy).quarantinedUntil;
+        return !!until && Date.parse(until) > now;
+    }
+
+    weight(proxy) {
+        const score = this.score(proxy);
+        const latency = score.latencyMs === null ? UNPROBED_LATENCY_MS : Math.max(score.latencyMs, 1);
+        return 1 / (latency * (1 + 4 * score.errorRate));
+    }
+
     getRandomProxy() {
         if (this.proxies.length === 0) return null;
-        const idx = Math.floor(Math.random() * this.proxies.length);
-        return this.proxies[idx];
+        const now = Date.now();
+        const healthy = this.proxies.filter(proxy => !this.isQuarantined(proxy, now));
+        if (healthy.length === 0) {
+            // Everything is quarantined: a uniform pick beats not running at all
+            logger.warn('All proxies are quarantined, picking one at random');
+            return this.proxies[Math.floor(Math.random() * this.proxies.length)];
+        }
+        const weights = healthy.map(proxy => this.weight(proxy));
+        let pick = Math.random() * weights.reduce((sum, weight) => sum + weight, 0);
+        for (let i = 0; i < healthy.length; i++) {
+            pick -= weights[i];
+            if (pick <= 0) {
+                return healthy[i];
+            }
+        }
+        return healthy[healthy.length - 1];
     }
+
+    recordResult(proxy, ok, latencyMs = null, error = null) {
+        // Used by the probes; bots may also report what they saw on real traffic
+        const score = this.score(proxy);
+        const key = ProxyManager.key(proxy);
+        const delta = this.pending[key] || (this.pending[key] = { successes: 0, failures: 0 });
+        delta[ok ? 'successes' : 'failures']++;
+        score.lastProbeAt = new Date().toISOString();
+        score.errorRate = EWMA_ALPHA * (ok ? 0 : 1) + (1 - EWMA_ALPHA) * score.errorRate;
+        if (ok) {
+            score.successes++;
+            score.consecutiveFailures = 0;
+            score.quarantinedUntil = null;
+            score.lastError = null;
+            score.latencyMs = score.latencyMs === null
+                ? latencyMs
+                : EWMA_ALPHA * latencyMs + (1 - EWMA_ALPHA) * score.latencyMs;
+            return;
+        }
+        score.failures++;
+        score.consecutiveFailures++;
+        score.lastError = error;
+        if (score.consecutiveFailures >= QUARANTINE_AFTER_FAILURES) {
+            // Back off exponentially while it keeps failing its probes
+            const extra = score.consecutiveFailures - QUARANTINE_AFTER_FAILURES;
+            const duration = Math.min(QUARANTINE_BASE_MS * 2 ** extra, QUARANTINE_MAX_MS);
+            score.quarantinedUntil = new Date(Date.now() + duration).toISOString();
+            logger.warn(`Proxy ${proxy.server} quarantined for ${Math.round(duration / 1000)}s: ${error}`);
+        }
+    }
+
+    probe(proxy) {
+        // Plain HTTP in absolute form through the proxy; the time to the
+        // response headers is the latency sample
+        return new Promise((resolve) => {
+            const proxyUrl = new URL(proxy.server);
+            const headers = { Host: new URL(this.probeUrl).host };
+            if (proxy.username) {
+                const credentials = Buffer.from(`${proxy.username}:${proxy.password || ''}`).toString('base64');
+                headers['Proxy-Authorization'] = `Basic ${credentials}`;
+            }
+            const started = Date.now();
+            const request = http.request({
+                host: proxyUrl.hostname,
+                port: proxyUrl.port || 80,
+                method: 'GET',
+                path: this.probeUrl,
+                headers,
+                timeout: PROBE_TIMEOUT_MS
+            }, (response) => {
+                const latencyMs = Date.now() - started;
+                response.resume();
+                if (response.statusCode >= 400) {
+                    resolve({ ok: false, latencyMs, error: `HTTP ${response.statusCode}` });
+                } else {
+                    resolve({ ok: true, latencyMs, error: null });
+                }
+            });
+            request.on('timeout', () => request.destroy(new Error(`timed out after ${PROBE_TIMEOUT_MS}ms`)));
+            request.on('error', error => resolve({ ok: false, latencyMs: null, error: error.message }));
+            request.end();
+        });
+    }
+
+    probeAll() {
+        // Coalesces overlapping rounds (timer tick during a slow round)
+        if (!this.probing) {
+            this.probing = this.runProbes().finally(() => {
+                this.probing = null;
+            });
+        }
+        return this.probing;
+    }
+
+    async runProbes() {
+        const queue = [...this.proxies];
+        const worker = async () => {
+            while (queue.length > 0) {
+                const proxy = queue.shift();
+                const result = await this.probe(proxy);
+                this.recordResult(proxy, result.ok, result.latencyMs, result.error);
+            }
+        };
+        await Promise.all(Array(Math.min(PROBE_CONCURRENCY, queue.length)).fill(0).map(() => worker()));
+        this.saveScores();
+        return this.status();
+    }
+
+    startHealthChecks(intervalMs = 60000) {
+        if (this.probeTimer || this.proxies.length === 0) {
+            return;
+        }
+        this.probeAll();
+        this.probeTimer = setInterval(() => this.probeAll(), intervalMs);
+        this.probeTimer.unref();
+    }
+
+    stopHealthChecks() {
+        clearInterval(this.probeTimer);
+        this.probeTimer = null;
+    }
+
+    status() {
+        const now = Date.now();
+        const healthy = this.proxies.filter(proxy => !this.isQuarantined(proxy, now));
+        const total = healthy.reduce((sum, proxy) => sum + this.weight(proxy), 0);
+        return this.proxies.map(proxy => ({
+            ...this.score(proxy),
+            quarantined: this.isQuarantined(proxy, now),
+            // Chance of being picked by getRandomProxy() right now
+            share: total > 0 && !this.isQuarantined(proxy, now) ? this.weight(proxy) / total : 0
+        }));
+    }
+
+    static mergeScore(ours, theirs, delta = { successes: 0, failures: 0 }) {
+        if (!theirs) {
+            return ours;
+        }
+        const stamp = (entry) => Date.parse(entry.lastProbeAt) || 0;
+        const { quarantined, share, ...base } = stamp(theirs) > stamp(ours) ? theirs : ours;
+        return {
+            ...base,
+            // Their counts already include everything saved before, ours only adds what is new
+            successes: (theirs.successes || 0) + delta.successes,
+            failures: (theirs.failures || 0) + delta.failures
+        };
+    }
+
+    saveScores() {
+        try {
+            const dir = path.dirname(this.scoresPath);
+            if (!fs.existsSync(dir)) {
+                fs.mkdirSync(dir, { recursive: true });
+            }
+            // Re-read so entries other processes wrote since our last save survive
+            const saved = this.readScores();
+            for (const proxy of this.proxies) {
+                const key = ProxyManager.key(proxy);
+                this.scores[key] = ProxyManager.mergeScore(this.score(proxy), saved[key], this.pending[key]);
+            }
+            const proxies = { ...saved };
+            for (const entry of this.status()) {
+                proxies[ProxyManager.key(entry)] = entry;
+            }
+            const tempPath = `${this.scoresPath}.${process.pid}.tmp`;
+            fs.writeFileSync(tempPath, JSON.stringify({ updatedAt: new Date().toISOString(), probeUrl: this.probeUrl, proxies }, null, 2));
+            fs.renameSync(tempPath, this.scoresPath);
+            this.pending = {};
+        } catch (error) {
+            logger.warn('Failed to save proxy scores:', error);
+        }
+    }
+}
+
+// `node config/proxyManager.js --probe` runs one probe round, saves the scores
+// and prints them; the dashboard's Probe Now button uses it. --proxies and
+// --probe-url point it at a local stand-in proxy for testing.
+if (require.main === module) {
+    const { program } = require('commander');
+    program
+        .option('--probe', 'probe every proxy once and save the scores')
+        .option('--proxies <path>', 'proxy list file', path.join(__dirname, 'proxies.txt'))
+        .option('--scores <path>', 'scores file', path.join('data', 'proxy_scores.json'))
+        .option('--probe-url <url>', 'plain-HTTP URL fetched through each proxy')
+        .parse(process.argv);
+    const options = program.opts();
+    const manager = new ProxyManager(options.proxies, { scoresPath: options.scores, probeUrl: options.probeUrl });
+    const run = options.probe ? manager.probeAll() : Promise.resolve(manager.status());
+    run.then(status => console.log(JSON.stringify(status, null, 2)));
 }
 
-module.exports = ProxyManager; 
\ No newline at end of file
+module.exports = ProxyManager;
@@ -2,6 +2,9 @@ const User = require('../models/User');
 const jwtService = require('../auth/jwtService');
 const logger = require('../config/logger');
 const validator = require('validator');
+const crypto = require('crypto');
+
+const BULK_LIMIT = 500;
 
 class UserController {
     async getUsers(req, res) {
@@ -11,41 +14,54 @@ class UserController {
                 limit = 10,
                 role,
                 search,
+                status = 'active',
                 sortBy = 'created_at',
                 sortOrder = 'desc'
             } = req.query;
 
-            const offset = (parseInt(page) - 1) * parseInt(limit);
+            const pageNumber = Math.max(1, parseInt(page) || 1);
+            const pageSize = Math.min(Math.max(1, parseInt(limit) || 10), 100);
+            const searchText = search ? String(search).trim() : '';
+
+            // The ETag only depends on the users table revision and the query,
+            // so an unchanged page is answered with 304 before touching the DB
+            const etag = `W/"users-${User.revision}-${Buffer.from(JSON.stringify([
+                pageNumber, pageSize, role || null, searchText, status, sortBy, sortOrder
+            ])).toString('base64url')}"`;
+            res.set('ETag', etag);
+            res.set('Cache-Control', 'private, no-cache');
+            if (req.get('If-None-Match') === etag) {
+                return res.status(304).end();
+            }
+
+            const filter = {
+                role: role || null,
+                search: searchText || null,
+                isActive: status === 'all' ? null : status !== 'inactive'
+            };
             const options = {
-                limit: parseInt(limit),
-                offset,
-                role: role || null
+                ...filter,
+                limit: pageSize,
+                offset: (pageNumber - 1) * pageSize,
+                sortBy,
+                sortOrder
             };
 
             const users = await User.findAll(options);
-            const totalUsers = await User.count({ role: role || null });
-            const totalPages = Math.ceil(totalUsers / parseInt(limit));
-
-            let filteredUsers = users;
-            if (search) {
-                const searchLower = search.toLowerCase();
-                filteredUsers = users.filter(user => 
-                    user.email.toLowerCase().includes(searchLower) ||
-                    (user.first_name && user.first_name.toLowerCase().includes(searchLower)) ||
-                    (user.last_name && user.last_name.toLowerCase().includes(searchLower))
-                );
-            }
+            const totalUsers = await User.count(filter);
+            const totalPages = Math.ceil(totalUsers / pageSize);
 
             res.json({
                 success: true,
                 data: {
-                    users: filteredUsers.map(user => user.toJSON()),
+                    users: users.map(user => user.toJSON()),
                     pagination: {
-                        currentPage: parseInt(page),
+                        currentPage: pageNumber,
+                        pageSize,
                         totalPages,
                         totalUsers,
-                        hasNextPage: parseInt(page) < totalPages,
-                        hasPrevPage: parseInt(page) > 1
+                        hasNextPage: pageNumber < totalPages,
+                        hasPrevPage: pageNumber > 1
                     }
                 }
             });
@@ -243,7 +259,8 @@ class UserController {
             }
 
             await user.save();
-            const updatedUser = await User.findById(user.id);
+            // findById skips inactive users, so a deactivation returns the saved copy
+            const updatedUser = await User.findById(user.id) || user;
 
             logger.info(`User updated: ${user.email} by ${req.user.email}`);
 
@@ -351,10 +368,8 @@ class UserController {
                 });
             }
 
-            user.password = newPassword;
-            await user.save();
-
-            await jwtService.revokeAllUserTokens(user.id);
+            // Also signs the user out everywhere
+            await User.setPasswords([{ id: user.id, password: newPassword }]);
 
             logger.info(`Password reset for user: ${user.email} by ${req.user.email}`);
 
@@ -372,6 +387,188 @@ class UserController {
         }
     }
 
+    parseIdList(ids) {
+        if (!Array.isArray(ids) || ids.length === 0 || ids.length > BULK_LIMIT) {
+            return null;
+        }
+        const parsed = ids.map(id => parseInt(id));
+        if (parsed.some(id => isNaN(id))) {
+            return null;
+        }
+        return [...new Set(parsed)];
+    }
+
+    async bulkCreateUsers(req, res) {
+        try {
+            const { users } = req.body;
+
+            if (!Array.isArray(users) || users.length === 0) {
+                return res.status(400).json({
+                    success: false,
+                    message: 'users must be a non-empty array'
+                });
+            }
+
+            if (users.length > BULK_LIMIT) {
+                return res.status(400).json({
+                    success: false,
+                    message: `At most ${BULK_LIMIT} users can be created per request`
+                });
+            }
+
+            // All-or-nothing: report every bad row, create nothing if any fail
+            const errors = [];
+            const seen = new Set();
+            const newUsers = users.map((row, index) => {
+                const user = new User({
+                    email: typeof row.email === 'string' ? row.email.trim() : row.email,
+                    password: row.password,
+                    role: row.role || 'viewer',
+                    first_name: row.first_name || null,
+                    last_name: row.last_name || null
+                });
+                const rowErrors = user.validate();
+                if (seen.has(user.email)) {
+                    rowErrors.push('Duplicate email in this batch');
+                }
+                seen.add(user.email);
+                if (rowErrors.length > 0) {
+                    errors.push({ row: index + 1, email: user.email, errors: rowErrors });
+                }
+                return user;
+            });
+
+            const existing = new Set(await User.findExistingEmails(newUsers.map(user => user.email).filter(Boolean)));
+            newUsers.forEach((user, index) => {
+                if (existing.has(user.email)) {
+                    errors.push({ row: index + 1, email: user.email, errors: ['User with this email already exists'] });
+                }
+            });
+
+            if (errors.length > 0) {
+                errors.sort((a, b) => a.row - b.row);
+                return res.status(400).json({
+                    success: false,
+                    message: `${errors.length} row(s) are invalid; no users were created`,
+                    data: { errors }
+                });
+            }
+
+            const ids = await User.bulkCreate(newUsers);
+            const created = await User.findByIds(ids);
+
+            logger.info(`Bulk created ${ids.length} users by ${req.user.email}`);
+
+            res.status(201).json({
+                success: true,
+                message: `${ids.length} users created successfully`,
+                data: {
+                    users: created.map(user => user.toJSON())
+                }
+            });
+
+        } catch (error) {
+            logger.error('Bulk create users error:', error.message);
+            res.status(500).json({
+                success: false,
+                message: 'Failed to create users'
+            });
+        }
+    }
+
+    async bulkSetUserStatus(req, res) {
+        try {
+            const ids = userController.parseIdList(req.body.ids);
+            const { is_active } = req.body;
+
+            if (!ids || typeof is_active !== 'boolean') {
+                return res.status(400).json({
+                    success: false,
+                    message: `ids (1-${BULK_LIMIT} user IDs) and a boolean is_active are required`
+                });
+            }
+
+            if (!is_active && ids.includes(req.user.id)) {
+                return res.status(400).json({
+                    success: false,
+                    message: 'Cannot deactivate your own account'
+                });
+            }
+
+            const changes = await User.setActive(ids, is_active);
+            const users = await User.findByIds(ids);
+
+            logger.info(`Bulk ${is_active ? 'activated' : 'deactivated'} ${changes} users by ${req.user.email}`);
+
+            res.json({
+                success: true,
+                message: `${changes} users ${is_active ? 'activated' : 'deactivated'} successfully`,
+                data: {
+                    users: users.map(user => user.toJSON())
+                }
+            });
+
+        } catch (error) {
+            logger.error('Bulk set user status error:', error.message);
+            res.status(500).json({
+                success: false,
+                message: 'Failed to update users'
+            });
+        }
+    }
+
+    async bulkResetPasswords(req, res) {
+        try {
+            const ids = userController.parseIdList(req.body.ids);
+            const { newPassword } = req.body;
+
+            if (!ids) {
+                return res.status(400).json({
+                    success: false,
+                    message: `ids must be a list of 1-${BULK_LIMIT} user IDs`
+                });
+            }
+
+            if (newPassword !== undefined && newPassword !== null && newPassword !== '' &&
+                (typeof newPassword !== 'string' || newPassword.length < 6)) {
+                return res.status(400).json({
+                    success: false,
+                    message: 'New password must be at least 6 characters long'
+                });
+            }
+
+            // Without newPassword every user gets their own random password,
+            // returned once in the response
+            const users = await User.findByIds(ids);
+            const entries = users.map(user => ({
+                id: user.id,
+                email: user.email,
+                password: newPassword || crypto.randomBytes(9).toString('base64url')
+            }));
+            if (entries.length > 0) {
+                await User.setPasswords(entries);
+            }
+
+            logger.info(`Bulk password reset for ${entries.length} users by ${req.user.email}`);
+
+            res.json({
+                success: true,
+                message: `Password reset for ${entries.length} users`,
+                data: {
+                    users: entries.map(entry => newPassword ? { id: entry.id, email: entry.email } : entry),
+                    notFound: ids.filter(id => !users.some(user => user.id === id))
+                }
+            });
+
+        } catch (error) {
+            logger.error('Bulk reset passwords error:', error.message);
+            res.status(500).json({
+                success: false,
+                message: 'Failed to reset passwords'
+            });
+        }
+    }
+
     async getUserStats(req, res) {
         try {
             const totalUsers = await User.count();
@@ -407,6 +604,8 @@ class UserController {
     }
 }
 
-module.exports = new UserController();
+const userController = new UserController();
+
+module.exports = userController;
 
 
@@ -1,14 +1,49 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import os
-import pandas as pd
-from datetime import datetime
+import mmap
+from datetime import datetime, timezone
 import subprocess
+import signal
 import sys
-import requests
 import json
-from threading import Thread
+import argparse
+import tempfile
+import shutil
+import csv
+import io
+from threading import Thread, Lock, Event
+from concurrent.futures import ThreadPoolExecutor
+import queue
 import time
+import math
+import re
+import struct
+import importlib
+import socket
+import functools
+import posixpath
+from contextlib import contextmanager
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+class LazyModule:
+    # Imports the wrapped module on first attribute access. pandas/numpy and
+    # requests are a large share of startup time and the first window paint
+    # does not need any of them.
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+requests = LazyModule('requests')
 
 # API Configuration
 API_BASE_URL = 'http://localhost:3000/api'
@@ -19,28 +54,1871 @@ BOT_CONFIG = {
     'Yodobashi': {
         'excel': 'yodobashi.xlsx',
         'bat': 'start-yodobashi.bat',
+        'script': 'yodobashiBot.js',
     },
     'BicCamera': {
         'excel': 'biccamera.xlsx',
         'bat': 'start-biccamera.bat',
+        'script': 'bicCameraBot.js',
     },
     'PopMart': {
         'excel': 'popMart.xlsx',
         'bat': 'start-popmart.bat',
+        'script': 'popMartBot.js',
     },
     'Rakuten': {
         'excel': 'rakuten.xlsx',
         'bat': 'start-rakuten.bat',
+        'script': 'rakutenBot.js',
     },
 }
 
-ORDER_LOG_PATH = os.path.join('data', 'order_log.xlsx')
+ORDER_LOG_PATH = os.path.join('data', 'order_log.jsonl')
+ORDER_COLUMNS = ('Timestamp', 'Platform', 'Product', 'Price', 'Status')
+SHARD_DIR = os.path.join('data', 'shards')
+RUN_STATE_DIR = os.path.join('data', 'run_state')
+# An open run idle for longer than this is not resumed (utils/runState.js)
+RUN_STATE_MAX_AGE = float(os.environ.get('RUN_STATE_MAX_AGE_HOURS') or 24) * 3600
+# utils/browserPool.js status files; bots rewrite theirs at least every 5 s
+BROWSER_POOL_DIR = os.path.join('data', 'browser_pool')
+BROWSER_POOL_STALE_SECONDS = 15
+SELECTOR_CACHE_DIR = os.path.join('data', 'selector_cache')
+PROXY_SCORES_PATH = os.path.join('data', 'proxy_scores.json')
+PROXY_PROBE_COMMAND = ['node', os.path.join('config', 'proxyManager.js'), '--probe']
+# Rough resident size of one bot process with its headless Chromium
+BOT_MEMORY_ESTIMATE = 600 * 1024 * 1024
+COMBINED_LOG_PATH = os.path.join('logs', 'combined.log')
+ERROR_LOG_PATH = os.path.join('logs', 'error.log')
+LOG_BUFFER_SIZE = 2000
+LOG_LEVELS = ['error', 'warn', 'info', 'debug']
+PROFILE_DIR = 'logs'
+
+class Profiler:
+    # Wall time and call counts per named operation, kept as LatencySketch
+    # histograms so recording is a couple of dict updates. Wrap code with
+    # @profiler.timed(name) or `with profiler.section(name)`. cProfile is
+    # separate and opt-in: it only covers the thread that started it.
+    def __init__(self):
+        self.lock = Lock()
+        self.stats = {}
+        self.cprofile = None
+
+    def record(self, name, seconds):
+        with self.lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = {'calls': 0, 'total': 0.0, 'max': 0.0, 'sketch': LatencySketch()}
+                self.stats[name] = stat
+            stat['calls'] += 1
+            stat['total'] += seconds
+            stat['max'] = max(stat['max'], seconds)
+            stat['sketch'].add(seconds)
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name=None):
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summaries(self, limit=None):
+        # Slowest first by p95, in milliseconds
+        with self.lock:
+            rows = [{
+                'name': name,
+                'calls': stat['calls'],
+                'total_ms': stat['total'] * 1000,
+                'mean_ms': stat['total'] * 1000 / stat['calls'],
+                # The sketch rounds to its bucket, so cap it at the exact max
+                'p95_ms': min(stat['sketch'].quantile(0.95), stat['max']) * 1000,
+                'max_ms': stat['max'] * 1000,
+            } for name, stat in self.stats.items()]
+        rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+
+    @property
+    def cprofile_running(self):
+        return self.cprofile is not None
+
+    def start_cprofile(self):
+        import cProfile
+        if self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def dump_cprofile(self, path=None):
+        # Writes a pstats snapshot and keeps profiling; returns the file path.
+        # Open it with `python -m pstats <file>` or snakeviz.
+        if self.cprofile is None:
+            return None
+        path = path or os.path.join(PROFILE_DIR, f'dashboard-{datetime.now().strftime("%Y%m%d-%H%M%S")}.pstats')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.cprofile.disable()
+        try:
+            self.cprofile.dump_stats(path)
+        finally:
+            self.cprofile.enable()
+        return path
+
+    def stop_cprofile(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile = None
+
+profiler = Profiler()
+
+def api_operation(method, url):
+    # 'API GET /users/:id' - ids are folded so each endpoint is one histogram
+    path = posixpath.normpath(urlparse(url).path or '/')
+    if path.startswith('/api/'):
+        path = path[4:]
+    return f'API {method.upper()} {re.sub(r"/[0-9]+(?=/|$)", "/:id", path)}'
+
+@profiler.timed()
+def build_order_rows(rows):
+    # Turns raw order-log records into display tuples in one vectorized pass:
+    # timestamps are parsed with errors='coerce' and formatted column-wise, and
+    # values that do not parse are shown as they were logged.
+    if not rows:
+        return []
+    df = pd.DataFrame(rows, columns=list(ORDER_COLUMNS), dtype=object)
+    raw_ts = df['Timestamp']
+    parsed = pd.to_datetime(raw_ts, errors='coerce', format='ISO8601', utc=True)
+    # datetime_as_string is several times faster than Series.dt.strftime
+    seconds = parsed.dt.tz_localize(None).to_numpy(dtype='datetime64[s]')
+    formatted = np.char.replace(np.datetime_as_string(seconds, unit='s'), 'T', ' ')
+    fallback = raw_ts.where(raw_ts.notna(), '').astype(str).to_numpy()
+    df['Timestamp'] = np.where(parsed.isna().to_numpy(), fallback, formatted).tolist()
+    df['Platform'] = df['Platform'].fillna('Unknown')
+    df = df.where(df.notna(), '')
+    return list(df.itertuples(index=False, name=None))
+
+class WorkbookCache:
+    # Parsed bot workbooks keyed by path, valid while (mtime, size) on disk is
+    # unchanged. Returned frames are shared: treat them as read-only.
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def signature(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self, path):
+        key = os.path.abspath(path)
+        signature = self.signature(path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        with profiler.section('read_excel'):
+            df = pd.read_excel(path)
+        with self.lock:
+            self.entries[key] = (signature, df)
+        return df
+
+    def write(self, path, df):
+        df.to_excel(path, index=False)
+        # What we just wrote is what is on disk, so the next read is a hit
+        with self.lock:
+            self.entries[os.path.abspath(path)] = (self.signature(path), df)
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.abspath(path), None)
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+workbook_cache = WorkbookCache()
+
+ORDER_ENTRY_FIELDS = ('Email', 'Password', 'URL')
+
+def available_memory_bytes():
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                            ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                            ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                            ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                            ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullAvailPhys
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def max_shard_count():
+    # One shard per core, but never more Chromium instances than free RAM allows
+    cpu_limit = os.cpu_count() or 1
+    memory = available_memory_bytes()
+    memory_limit = memory // BOT_MEMORY_ESTIMATE if memory else cpu_limit
+    return max(1, min(cpu_limit, memory_limit))
+
+def new_shard_dir(bot):
+    # Each sharded launch writes into its own directory, so a later launch never
+    # overwrites workbooks that running shards are still reading. Directories
+    # of earlier launches of the bot are removed; callers make sure none of
+    # them is still running.
+    prefix = f'{bot.lower()}-'
+    if os.path.isdir(SHARD_DIR):
+        for name in os.listdir(SHARD_DIR):
+            path = os.path.join(SHARD_DIR, name)
+            if name.startswith(prefix) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    path = os.path.join(SHARD_DIR, f'{prefix}{stamp}')
+    os.makedirs(path)
+    return path
+
+def partition_workbook(bot, shard_count, run_dir):
+    # Splits the bot workbook into contiguous shard workbooks under run_dir.
+    # Returns [(path, account_count), ...]; never more shards than accounts.
+    df = workbook_cache.read(BOT_CONFIG[bot]['excel'])
+    shard_count = max(1, min(shard_count, len(df)))
+    base, extra = divmod(len(df), shard_count)
+    shards = []
+    start = 0
+    for index in range(shard_count):
+        size = base + (1 if index < extra else 0)
+        path = os.path.join(run_dir, f'{bot.lower()}-{index + 1}-of-{shard_count}.xlsx')
+        df.iloc[start:start + size].to_excel(path, index=False)
+        shards.append((path, size))
+        start += size
+    return shards
+
+def read_browser_pools(now=None):
+    # Live pool status of every bot process, skipping files left by dead ones
+    now = now if now is not None else time.time()
+    pools = []
+    try:
+        names = sorted(os.listdir(BROWSER_POOL_DIR))
+    except OSError:
+        return pools
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(BROWSER_POOL_DIR, name), encoding='utf-8') as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            continue
+        updated = parse_iso_timestamp(status.get('updatedAt'))
+        if updated is None or now - updated > BROWSER_POOL_STALE_SECONDS:
+            continue
+        pools.append(status)
+    return pools
+
+def read_selector_stats():
+    # [(platform, field, entry)] from the utils/selectorCache.js files
+    rows = []
+    try:
+        names = sorted(os.listdir(SELECTOR_CACHE_DIR))
+    except OSError:
+        return rows
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(SELECTOR_CACHE_DIR, name), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        platform = data.get('platform') or name[:-5]
+        for field, entry in sorted(data.get('fields', {}).items()):
+            rows.append((platform, field, entry))
+    return rows
+
+def read_proxy_scores():
+    # Health scores saved by config/proxyManager.js, best pick chance first
+    try:
+        with open(PROXY_SCORES_PATH, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, []
+    entries = sorted(data.get('proxies', {}).values(), key=lambda entry: entry.get('share') or 0, reverse=True)
+    return parse_iso_timestamp(data.get('updatedAt')), entries
+
+def run_proxy_probe():
+    result = subprocess.run(PROXY_PROBE_COMMAND, capture_output=True, text=True, timeout=180)
+    if result.returncode != 0:
+        lines = (result.stderr or result.stdout).strip().splitlines() or ['no output']
+        raise RuntimeError(f'proxy probe failed (exit code {result.returncode}): {lines[-1]}')
+
+def format_browser_pool(status):
+    text = (f"{status.get('platform')} (PID {status.get('pid')}): {status.get('leased', 0)}/{status.get('size', 0)} leased, "
+            f"{status.get('idle', 0)} warm, {status.get('warming', 0)} warming")
+    if status.get('failed'):
+        text += f", {status['failed']} failed"
+    return text
+
+class ShardedRun:
+    # Aggregated view of one sharded launch: per-shard progress is counted from
+    # the bot's own log lines as the supervisor streams them.
+    ACCOUNT_MARKER = 'Processing account:'
+    SKIP_MARKER = 'Skipping completed account:'
+    ORDER_MARKER = 'Order logged successfully'
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.shards = {}
+
+    def add_shard(self, instance, path, accounts):
+        self.shards[instance.id] = {
+            'instance': instance, 'path': path, 'accounts': accounts,
+            'processed': 0, 'orders': 0
+        }
+
+    def record_output(self, instance, line):
+        shard = self.shards.get(instance.id)
+        if shard is None:
+            return False
+        if self.ACCOUNT_MARKER in line or self.SKIP_MARKER in line:
+            shard['processed'] += 1
+        elif self.ORDER_MARKER in line:
+            shard['orders'] += 1
+        return True
+
+    def totals(self):
+        shards = self.shards.values()
+        return {
+            'accounts': sum(s['accounts'] for s in shards),
+            'processed': sum(s['processed'] for s in shards),
+            'orders': sum(s['orders'] for s in shards),
+            'running': sum(1 for s in shards if s['instance'].running),
+        }
+
+    @property
+    def active(self):
+        # A crashed shard waiting for its automatic restart still needs its workbook
+        return any(s['instance'].running or s['instance'].restart_at is not None
+                   for s in self.shards.values())
+
+def order_key(email, url):
+    return (str(email).strip().lower(), str(url).strip())
+
+def parse_order_batch(text, default_bot):
+    # Parses pasted/imported CSV into {bot: [row, ...]} in one pass. A header
+    # row is optional; without one the columns are Email,Password,URL[,Bot].
+    # Extra named columns (Card, Address, ...) are carried through.
+    bots_by_lower = {bot.lower(): bot for bot in BOT_CONFIG}
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return {}, []
+    first = [cell.strip() for cell in next(csv.reader([lines[0]]))]
+    if {'email', 'url'} <= {cell.lower() for cell in first}:
+        canonical = {name.lower(): name for name in ORDER_ENTRY_FIELDS + ('Bot',)}
+        header = [canonical.get(cell.lower(), cell) for cell in first]
+        body = lines[1:]
+        first_line_no = 2
+    else:
+        header = list(ORDER_ENTRY_FIELDS) + ['Bot']
+        body = lines
+        first_line_no = 1
+
+    rows_by_bot = {}
+    errors = []
+    for line_no, cells in enumerate(csv.reader(body), start=first_line_no):
+        record = {name: cell.strip() for name, cell in zip(header, cells) if name}
+        bot = record.pop('Bot', '') or default_bot
+        bot = bots_by_lower.get(bot.lower())
+        if bot is None:
+            errors.append(f'Line {line_no}: unknown bot')
+            continue
+        missing = [name for name in ORDER_ENTRY_FIELDS if not record.get(name)]
+        if missing:
+            errors.append(f'Line {line_no}: missing {", ".join(missing)}')
+            continue
+        if '@' not in record['Email']:
+            errors.append(f'Line {line_no}: invalid email {record["Email"]}')
+            continue
+        if not record['URL'].startswith(('http://', 'https://')):
+            errors.append(f'Line {line_no}: invalid URL {record["URL"]}')
+            continue
+        rows_by_bot.setdefault(bot, []).append(record)
+    return rows_by_bot, errors
+
+def write_order_batch(rows_by_bot):
+    # Appends every row for a workbook with a single read and a single write.
+    # Rows whose (Email, URL) already exist in the workbook or earlier in the
+    # batch are skipped via a set index. Returns {bot: (added, duplicates)}.
+    results = {}
+    for bot, rows in rows_by_bot.items():
+        excel_path = BOT_CONFIG[bot]['excel']
+        if os.path.exists(excel_path):
+            existing = workbook_cache.read(excel_path)
+        else:
+            existing = pd.DataFrame(columns=list(ORDER_ENTRY_FIELDS))
+        if {'Email', 'URL'} <= set(existing.columns):
+            index = set(map(order_key, existing['Email'], existing['URL']))
+        else:
+            index = set()
+
+        new_rows = []
+        duplicates = 0
+        for row in rows:
+            key = order_key(row['Email'], row['URL'])
+            if key in index:
+                duplicates += 1
+                continue
+            index.add(key)
+            new_rows.append(row)
+
+        if new_rows:
+            df = pd.concat([existing, pd.DataFrame(new_rows)], ignore_index=True)
+            workbook_cache.write(excel_path, df)
+        results[bot] = (len(new_rows), duplicates)
+    return results
+
+class RunState:
+    # Dashboard side of utils/runState.js. A bot's completed (account, URL)
+    # entries are its purchases in the order log plus the "done" lines in
+    # data/run_state/<bot>.jsonl, replayed in time order against the reset
+    # markers. Resets are appended too, so running bots are never rewritten under.
+    # Only the current run counts: entries are what the next bot start would
+    # skip, so none are listed once the last run has ended or gone stale.
+    def __init__(self, bot):
+        self.bot = bot
+        self.path = os.path.join(RUN_STATE_DIR, f'{bot}.jsonl')
+
+    @staticmethod
+    def read_lines(path):
+        records = []
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        pass
+        except OSError:
+            pass
+        return records
+
+    def entries(self):
+        events = []
+        for row in self.read_lines(ORDER_LOG_PATH):
+            if (row.get('Platform') == self.bot and row.get('Account') and row.get('URL')
+                    and 'purchased' in str(row.get('Status', '')).lower()):
+                at = parse_iso_timestamp(row.get('Timestamp')) or 0
+                events.append((at, 'done', row['Account'], row['URL'], 'Order log'))
+        for line in self.read_lines(self.path):
+            at = parse_iso_timestamp(line.get('at')) or 0
+            if line.get('run') in ('start', 'end'):
+                events.append((at, line['run'], None, None, line.get('pid')))
+            elif line.get('reset') == 'all':
+                events.append((at, 'all', None, None, None))
+            elif line.get('reset'):
+                events.append((at, 'reset', line.get('account'), line.get('url'), None))
+            elif line.get('status') == 'done':
+                events.append((at, 'done', line.get('account'), line.get('url'), 'Checkpoint'))
+        events.sort(key=lambda event: event[0])
+
+        completed = {}
+        open_pids = set()
+        last_at = None
+        for at, kind, account, url, source in events:
+            if kind == 'start':
+                # source carries the pid for run markers
+                if not open_pids or at - last_at > RUN_STATE_MAX_AGE:
+                    open_pids.clear()
+                    completed.clear()
+                open_pids.add(source)
+            elif kind == 'end':
+                open_pids.discard(source)
+            elif kind == 'all':
+                completed.clear()
+            elif kind == 'done':
+                completed[order_key(account, url)] = {
+                    'account': str(account).strip(), 'url': str(url).strip(), 'at': at, 'source': source
+                }
+            else:
+                completed.pop(order_key(account, url), None)
+            last_at = at
+        if not open_pids or time.time() - last_at > RUN_STATE_MAX_AGE:
+            return []
+        return sorted(completed.values(), key=lambda entry: entry['at'])
+
+    def append(self, records):
+        os.makedirs(RUN_STATE_DIR, exist_ok=True)
+        at = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        lines = ''.join(json.dumps({'at': at, **record}) + '\n' for record in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+    def reset(self, entries):
+        self.append([{'reset': True, 'account': e['account'], 'url': e['url']} for e in entries])
+
+    def reset_all(self):
+        self.append([{'reset': 'all'}])
+
+class OrderLogReader:
+    # Reader for the append-only data/order_log.jsonl written by ExcelManager.
+    # `offsets` is an in-memory index of where each complete line starts, built
+    # incrementally, so only bytes appended since the last call get scanned.
+    def __init__(self, path):
+        self.path = path
+        self.reset()
+
+    def reset(self):
+        self.offsets = []
+        self.end = 0
+        self.file_id = None
+
+    def open_map(self):
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def update_index(self):
+        # Returns (reset, first_new_line)
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            was_loaded = bool(self.offsets)
+            self.reset()
+            return was_loaded, 0
+
+        file_id = (stat.st_dev, stat.st_ino)
+        reset = False
+        if self.file_id is not None and (file_id != self.file_id or stat.st_size < self.end):
+            # Replaced or truncated (e.g. Clear Orders Log) -> rebuild
+            self.reset()
+            reset = True
+        self.file_id = file_id
+
+        first_new_line = len(self.offsets)
+        if stat.st_size == self.end:
+            return reset, first_new_line
+
+        mm = self.open_map()
+        if mm is None:
+            return reset, first_new_line
+        with mm:
+            pos = self.end
+            while True:
+                newline = mm.find(b'\n', pos)
+                if newline == -1:
+                    break
+                self.offsets.append(pos)
+                pos = newline + 1
+            self.end = pos
+        return reset, first_new_line
+
+    def line_span(self, index):
+        start = self.offsets[index]
+        stop = self.offsets[index + 1] if index + 1 < len(self.offsets) else self.end
+        return start, stop
+
+    @staticmethod
+    def parse_line(raw):
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            return None
+        return row if isinstance(row, dict) else None
+
+    def read_rows(self, mm, start_index, stop_index):
+        rows = []
+        for index in range(start_index, stop_index):
+            start, stop = self.line_span(index)
+            row = self.parse_line(mm[start:stop])
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def read_new_rows(self):
+        # Returns (reset, rows); reset=True means the caller must clear its view first
+        reset, first_new_line = self.update_index()
+        if first_new_line >= len(self.offsets):
+            return reset, []
+        mm = self.open_map()
+        if mm is None:
+            return reset, []
+        with mm:
+            return reset, self.read_rows(mm, first_new_line, len(self.offsets))
+
+    def last(self, n):
+        self.update_index()
+        count = len(self.offsets)
+        if not count or n <= 0:
+            return []
+        mm = self.open_map()
+        if mm is None:
+            return []
+        with mm:
+            return self.read_rows(mm, max(0, count - n), count)
+
+    @staticmethod
+    def to_epoch(timestamp):
+        # datetime (naive means local time), epoch seconds or an ISO string
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, (int, float)):
+            return float(timestamp)
+        epoch = parse_iso_timestamp(timestamp)
+        if epoch is None:
+            raise ValueError(f'Unrecognised timestamp: {timestamp!r}')
+        return epoch
+
+    def row_epoch(self, mm, index):
+        start, stop = self.line_span(index)
+        row = self.parse_line(mm[start:stop]) or {}
+        return parse_iso_timestamp(row.get('Timestamp'))
+
+    def since(self, timestamp):
+        # Rows at or after `timestamp`, compared as UTC epochs. The binary search
+        # assumes lines are appended in roughly time order; rows past the split
+        # point that are older are filtered out, but a row appended before the
+        # split point with a newer timestamp (e.g. a late write from another
+        # shard) is not found.
+        target = self.to_epoch(timestamp)
+        self.update_index()
+        mm = self.open_map()
+        if mm is None:
+            return []
+        with mm:
+            lo, hi = 0, len(self.offsets)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                epoch = self.row_epoch(mm, mid)
+                if epoch is None or epoch < target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            rows = self.read_rows(mm, lo, len(self.offsets))
+        return [row for row in rows
+                if (parse_iso_timestamp(row.get('Timestamp')) or float('-inf')) >= target]
+
+    def all_rows(self):
+        self.update_index()
+        mm = self.open_map()
+        if mm is None:
+            return []
+        with mm:
+            return self.read_rows(mm, 0, len(self.offsets))
+
+    def export_xlsx(self, xlsx_path):
+        df = pd.DataFrame(self.all_rows(), columns=list(ORDER_COLUMNS))
+        with pd.ExcelWriter(xlsx_path) as writer:
+            df.to_excel(writer, sheet_name='Orders', index=False)
+        return len(df)
+
+PRICE_NUMBER = r'\d[\d,]*(?:\.\d+)?'
+# A number next to a yen sign wins; otherwise the first number that is not a percentage
+CURRENCY_PRICE_PATTERN = re.compile(r'[¥￥]\s*(%s)|(%s)\s*円' % (PRICE_NUMBER, PRICE_NUMBER))
+PLAIN_PRICE_PATTERN = re.compile(r'(%s)(?!\s*[\d%%％])' % PRICE_NUMBER)
+
+def parse_price(value):
+    # "¥12,800", "12,800円", 12800 -> 12800.0; None when there is no number.
+    # "¥12,800（ポイント10%）" and "税込 10% ¥1,280" parse as the yen amount
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    text = str(value)
+    match = CURRENCY_PRICE_PATTERN.search(text) or PLAIN_PRICE_PATTERN.search(text)
+    if match is None:
+        return None
+    number = next(group for group in match.groups() if group)
+    return float(number.replace(',', ''))
+
+def price_sort_key(value):
+    price = parse_price(value)
+    return -1.0 if price is None else price
+
+class OrderStore:
+    # Column-oriented backing store for the order table. `view` holds the row
+    # indices in display order after sorting/searching; None means all rows in
+    # insertion order, so plain appends never rebuild anything.
+    def __init__(self, columns=ORDER_COLUMNS):
+        self.column_names = columns
+        self.sort_column = None
+        self.sort_desc = False
+        self.search = ''
+        self.clear()
+
+    def clear(self):
+        # Drops the rows but keeps the current sort and search
+        self.columns = {name: [] for name in self.column_names}
+        self.search_keys = None
+        self.view = [] if (self.sort_column or self.search) else None
+
+    def __len__(self):
+        return len(self.columns[self.column_names[0]])
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        for idx, name in enumerate(self.column_names):
+            self.columns[name].extend(row[idx] for row in rows)
+        if self.search_keys is not None:
+            self.search_keys.extend(self.make_search_key(row) for row in rows)
+        if self.sort_column or self.search:
+            self.apply()
+
+    @staticmethod
+    def make_search_key(row):
+        return '\x1f'.join(str(v) for v in row).lower()
+
+    def visible_count(self):
+        return len(self) if self.view is None else len(self.view)
+
+    def row(self, position):
+        index = position if self.view is None else self.view[position]
+        return tuple(self.columns[name][index] for name in self.column_names)
+
+    def set_sort(self, column):
+        if self.sort_column == column:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_column = column
+            self.sort_desc = False
+        self.apply()
+
+    def set_search(self, text):
+        self.search = text.strip().lower()
+        self.apply()
+
+    def apply(self):
+        indices = range(len(self))
+        if self.search:
+            if self.search_keys is None:
+                self.search_keys = [self.make_search_key(self.row_at(i)) for i in indices]
+            keys = self.search_keys
+            indices = [i for i in indices if self.search in keys[i]]
+        if self.sort_column:
+            values = self.columns[self.sort_column]
+            key = price_sort_key if self.sort_column == 'Price' else str
+            indices = sorted(indices, key=lambda i: key(values[i]), reverse=self.sort_desc)
+        self.view = list(indices) if (self.search or self.sort_column) else None
+
+    def row_at(self, index):
+        return tuple(self.columns[name][index] for name in self.column_names)
+
+class VirtualOrderTable:
+    # Treeview that only materializes the rows currently on screen. Scrolling
+    # moves a window over OrderStore and rewrites the values of the same
+    # handful of items instead of holding one item per order.
+    def __init__(self, parent, store):
+        self.store = store
+        self.offset = 0
+        self.visible_rows = 8
+        self.tree = ttk.Treeview(parent, columns=store.column_names, show='headings', height=8)
+        for col in store.column_names:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=120)
+        self.scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.on_scroll)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(3))
+
+    def pack(self):
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+    def on_resize(self, event):
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or 20
+        try:
+            row_height = int(row_height)
+        except (TypeError, ValueError):
+            row_height = 20
+        # Leave room for the heading row so Tk never scrolls the items itself
+        rows = max(1, (event.height - 28) // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+
+    def on_wheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_scroll(self, *args):
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * self.store.visible_count())
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_rows
+            self.offset += step
+        self.refresh()
+
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.refresh()
+
+    def scroll_to_end(self):
+        self.offset = self.store.visible_count()
+        self.refresh()
+
+    def is_at_end(self):
+        return self.offset + self.visible_rows >= self.store.visible_count()
+
+    def sort_by(self, column):
+        self.store.set_sort(column)
+        self.offset = 0
+        self.refresh()
+
+    def search(self, text):
+        self.store.set_search(text)
+        self.offset = 0
+        self.refresh()
+
+    @profiler.timed()
+    def refresh(self):
+        total = self.store.visible_count()
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        needed = min(self.visible_rows, total - self.offset)
+        children = self.tree.get_children()
+        for i in range(needed):
+            values = self.store.row(self.offset + i)
+            if i < len(children):
+                self.tree.item(children[i], values=values)
+            else:
+                self.tree.insert('', tk.END, values=values)
+        if len(children) > needed:
+            self.tree.delete(*children[needed:])
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + needed) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        for col in self.store.column_names:
+            arrow = ''
+            if col == self.store.sort_column:
+                arrow = ' \u25bc' if self.store.sort_desc else ' \u25b2'
+            self.tree.heading(col, text=col + arrow)
+
+class LogEntry:
+    # Raw JSON line from winston; parsed only the first time a field is needed
+    __slots__ = ('raw', '_parsed')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._parsed = None
+
+    @property
+    def data(self):
+        if self._parsed is None:
+            try:
+                parsed = json.loads(self.raw)
+                self._parsed = parsed if isinstance(parsed, dict) else {'message': self.raw}
+            except ValueError:
+                self._parsed = {'message': self.raw}
+        return self._parsed
+
+    @property
+    def level(self):
+        return str(self.data.get('level', 'info'))
+
+    @property
+    def message(self):
+        return str(self.data.get('message', ''))
+
+    @property
+    def timestamp(self):
+        return str(self.data.get('timestamp', ''))
+
+    def matches_bot(self, bot):
+        # Bots tag their lines with `bot`; only older lines without it fall
+        # back to a substring match on the raw line
+        tagged = self.data.get('bot')
+        if tagged:
+            return str(tagged).lower() == bot.lower()
+        return bot.lower() in self.raw.lower()
+
+    def format(self):
+        return f'{self.timestamp} [{self.level}] {self.message}'
+
+class LogTailer:
+    # Follows a log file by byte offset, like tail -F: only appended bytes are
+    # read, rotation (new inode) and truncation restart from the beginning.
+    # Entries live in a fixed-size ring buffer so memory stays flat.
+    INITIAL_BACKFILL = 64 * 1024
+    MAX_READ = 1024 * 1024
+
+    def __init__(self, path, maxlen=LOG_BUFFER_SIZE):
+        self.path = path
+        self.buffer = deque(maxlen=maxlen)
+        self.offset = None
+        self.file_id = None
+        self.partial = b''
+
+    def poll(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+
+        file_id = (stat.st_dev, stat.st_ino)
+        if self.offset is None:
+            self.offset = max(0, stat.st_size - self.INITIAL_BACKFILL)
+            self.file_id = file_id
+            skip_first = self.offset > 0
+        elif file_id != self.file_id or stat.st_size < self.offset:
+            self.offset = 0
+            self.file_id = file_id
+            self.partial = b''
+            skip_first = False
+        else:
+            skip_first = False
+
+        if stat.st_size == self.offset:
+            return []
+
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(self.MAX_READ)
+        except OSError:
+            return []
+        self.offset += len(chunk)
+
+        data = self.partial + chunk
+        lines = data.split(b'\n')
+        self.partial = lines.pop()
+        if skip_first and lines:
+            lines.pop(0)
+
+        entries = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                entries.append(LogEntry(line.decode('utf-8', errors='replace')))
+        self.buffer.extend(entries)
+        return entries
+
+    def filter(self, level=None, bot=None):
+        return [entry for entry in self.buffer if self.entry_matches(entry, level, bot)]
+
+    @staticmethod
+    def entry_matches(entry, level=None, bot=None):
+        if level and entry.level != level:
+            return False
+        if bot and not entry.matches_bot(bot):
+            return False
+        return True
+
+class BotInstance:
+    OUTPUT_LINES = 500
+
+    def __init__(self, instance_id, bot, command, cwd=None, env=None):
+        self.id = instance_id
+        self.bot = bot
+        self.command = command
+        self.cwd = cwd
+        self.env = env or {}
+        self.proc = None
+        self.status = 'Starting'
+        self.output = deque(maxlen=self.OUTPUT_LINES)
+        self.restarts = 0
+        self.restart_delay = BotSupervisor.MIN_RESTART_DELAY
+        self.restart_at = None
+        self.started_at = None
+        self.exit_code = None
+        self.stopping = False
+
+    @property
+    def pid(self):
+        return self.proc.pid if self.proc is not None else None
+
+    @property
+    def running(self):
+        return self.proc is not None and self.exit_code is None
+
+    @property
+    def last_line(self):
+        return self.output[-1] if self.output else ''
+
+class BotSupervisor:
+    # Owns the bot processes started in local mode. One reader thread per child
+    # drains its merged stdout/stderr and reports output lines and the exit code
+    # through `events`; process_events() runs on the Tk thread and applies them.
+    MIN_RESTART_DELAY = 2
+    MAX_RESTART_DELAY = 120
+    STABLE_RUN_SECONDS = 60
+    STOP_TIMEOUT = 10
+
+    def __init__(self):
+        self.instances = {}
+        self.events = queue.Queue()
+        self.next_id = 1
+        self.restart_on_crash = True
+
+    @staticmethod
+    def default_command(bot):
+        bat_file = BOT_CONFIG[bot]['bat']
+        if sys.platform == 'win32':
+            return ['cmd', '/c', bat_file]
+        return ['sh', bat_file]
+
+    def start(self, bot, command=None, cwd=None, env=None):
+        # env: extra variables for the bot, kept for crash restarts
+        instance = BotInstance(self.next_id, bot, command or self.default_command(bot), cwd, env)
+        self.next_id += 1
+        self.instances[instance.id] = instance
+        self.spawn(instance)
+        return instance
+
+    def spawn(self, instance):
+        kwargs = {}
+        if sys.platform == 'win32':
+            # Own process group so CTRL_BREAK reaches node and not just cmd.exe
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True
+        proc = subprocess.Popen(instance.command, cwd=instance.cwd,
+                                env={**os.environ, **instance.env} if instance.env else None,
+                                stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT,
+                                **kwargs)
+        instance.proc = proc
+        instance.exit_code = None
+        instance.stopping = False
+        instance.restart_at = None
+        instance.started_at = time.monotonic()
+        instance.status = 'Running'
+        Thread(target=self.read_output, args=(instance.id, proc), daemon=True).start()
+
+    def read_output(self, instance_id, proc):
+        for raw in iter(proc.stdout.readline, b''):
+            line = raw.decode('utf-8', errors='replace').rstrip()
+            if line:
+                self.events.put(('output', instance_id, proc, line))
+        proc.stdout.close()
+        self.events.put(('exit', instance_id, proc, proc.wait()))
+
+    def stop(self, instance_id, timeout=None):
+        # Graceful signal first, forced kill of the whole tree after timeout
+        instance = self.instances.get(instance_id)
+        if instance is None:
+            return
+        instance.restart_at = None
+        if not instance.running:
+            instance.status = 'Stopped'
+            return
+        instance.stopping = True
+        instance.status = 'Stopping'
+        proc = instance.proc
+        try:
+            if sys.platform == 'win32':
+                proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(proc.pid, signal.SIGTERM)
+        except (OSError, ValueError):
+            pass
+        Thread(target=self.force_kill_after, args=(proc, timeout or self.STOP_TIMEOUT), daemon=True).start()
+
+    @staticmethod
+    def force_kill_after(proc, timeout):
+        try:
+            proc.wait(timeout=timeout)
+            return
+        except subprocess.TimeoutExpired:
+            pass
+        try:
+            if sys.platform == 'win32':
+                subprocess.run(['taskkill', '/T', '/F', '/PID', str(proc.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               creationflags=subprocess.CREATE_NO_WINDOW)
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    def stop_all(self, timeout=None):
+        for instance_id in list(self.instances):
+            self.stop(instance_id, timeout)
+
+    def restart(self, instance_id):
+        instance = self.instances.get(instance_id)
+        if instance is None or instance.running:
+            return
+        instance.restarts += 1
+        self.spawn(instance)
+
+    def remove(self, instance_id):
+        instance = self.instances.get(instance_id)
+        if instance is not None and not instance.running:
+            del self.instances[instance_id]
+
+    def running(self, bot=None):
+        return [i for i in self.instances.values() if i.running and (bot is None or i.bot == bot)]
+
+    def process_events(self, on_output=None, on_exit=None):
+        changed = set()
+        while True:
+            try:
+                kind, instance_id, proc, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            instance = self.instances.get(instance_id)
+            # Ignore stragglers from a previous process of a restarted instance
+            if instance is None or instance.proc is not proc:
+                continue
+            changed.add(instance_id)
+            if kind == 'output':
+                instance.output.append(value)
+                if on_output:
+                    on_output(instance, value)
+            else:
+                self.handle_exit(instance, value)
+                if on_exit:
+                    on_exit(instance)
+
+        now = time.monotonic()
+        for instance in self.instances.values():
+            if instance.restart_at is not None and not instance.running and now >= instance.restart_at:
+                instance.restart_at = None
+                instance.restarts += 1
+                try:
+                    self.spawn(instance)
+                except OSError as e:
+                    instance.status = f'Restart failed: {e}'
+                changed.add(instance.id)
+        return changed
+
+    def handle_exit(self, instance, code):
+        instance.exit_code = code
+        ran_for = time.monotonic() - (instance.started_at or 0)
+        if instance.stopping or code == 0:
+            instance.status = 'Stopped' if instance.stopping else 'Finished'
+            return
+        if ran_for >= self.STABLE_RUN_SECONDS:
+            instance.restart_delay = self.MIN_RESTART_DELAY
+        if self.restart_on_crash:
+            instance.status = f'Crashed ({code}), restart in {instance.restart_delay}s'
+            instance.restart_at = time.monotonic() + instance.restart_delay
+            instance.restart_delay = min(instance.restart_delay * 2, self.MAX_RESTART_DELAY)
+        else:
+            instance.status = f'Crashed ({code})'
+
+def parse_iso_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+class LatencySketch:
+    # DDSketch-style quantile sketch: samples fall into logarithmic buckets, so
+    # quantiles carry a bounded relative error and sketches merge by adding
+    # bucket counts. Memory depends on the value range, not the sample count.
+    def __init__(self, relative_accuracy=0.02):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class RollingMetrics:
+    # Per-platform counters in one-minute buckets; a window is the merge of the
+    # buckets it covers, so 1 m / 5 m / 1 h views share the same data.
+    BUCKET_SECONDS = 60
+    WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+    RETENTION = 3600
+
+    def __init__(self):
+        self.buckets = {}
+
+    def bucket(self, platform, timestamp):
+        slot = int(timestamp // self.BUCKET_SECONDS)
+        platform_buckets = self.buckets.setdefault(platform, {})
+        bucket = platform_buckets.get(slot)
+        if bucket is None:
+            bucket = {'orders': 0, 'attempts': 0, 'failures': 0, 'latency': LatencySketch()}
+            platform_buckets[slot] = bucket
+        return bucket
+
+    def record(self, platform, timestamp, kind, now=None):
+        now = now if now is not None else time.time()
+        if timestamp is None or timestamp < now - self.RETENTION:
+            return
+        self.bucket(platform, timestamp)[kind] += 1
+
+    def record_latency(self, platform, timestamp, latency, now=None):
+        now = now if now is not None else time.time()
+        if timestamp is None or timestamp < now - self.RETENTION:
+            return
+        self.bucket(platform, timestamp)['latency'].add(latency)
+
+    def prune(self, now=None):
+        now = now if now is not None else time.time()
+        oldest = int((now - self.RETENTION) // self.BUCKET_SECONDS)
+        for platform_buckets in self.buckets.values():
+            for slot in [slot for slot in platform_buckets if slot < oldest]:
+                del platform_buckets[slot]
+
+    def clear_orders(self):
+        for platform_buckets in self.buckets.values():
+            for bucket in platform_buckets.values():
+                bucket['orders'] = 0
+
+    def summary(self, platform, window, now=None):
+        now = now if now is not None else time.time()
+        seconds = self.WINDOWS[window]
+        first = int((now - seconds) // self.BUCKET_SECONDS) + 1
+        totals = {'orders': 0, 'attempts': 0, 'failures': 0}
+        latency = LatencySketch()
+        for slot, bucket in self.buckets.get(platform, {}).items():
+            if slot >= first:
+                for key in totals:
+                    totals[key] += bucket[key]
+                latency.merge(bucket['latency'])
+        totals['orders_per_min'] = totals['orders'] / (seconds / 60)
+        totals['failure_rate'] = totals['failures'] / totals['attempts'] if totals['attempts'] else None
+        for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            totals[name] = latency.quantile(q)
+        return totals
+
+class MetricsEngine:
+    # Feeds RollingMetrics incrementally from the order rows DashboardCore reads
+    # (orders per platform) and from tailed winston lines (attempts, errors, and
+    # the time from "Processing account" to "Order logged successfully" per bot
+    # process).
+    ACCOUNT_MARKER = 'Processing account:'
+    ORDER_MARKER = 'Order logged successfully'
+
+    def __init__(self):
+        self.metrics = RollingMetrics()
+        self.account_started = {}
+
+    def add_orders(self, reset, rows, now=None):
+        if reset:
+            self.metrics.clear_orders()
+        now = now if now is not None else time.time()
+        # Bots write UTC "...Z" timestamps, which order as strings; rows older
+        # than the retention window are skipped without parsing them
+        cutoff = datetime.fromtimestamp(now - RollingMetrics.RETENTION, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        for row in rows:
+            timestamp = str(row.get('Timestamp') or '')
+            if timestamp.endswith('Z') and timestamp < cutoff:
+                continue
+            self.metrics.record(row.get('Platform') or 'Unknown', parse_iso_timestamp(timestamp), 'orders', now=now)
+
+    def consume_log_entries(self, entries):
+        now = time.time()
+        for entry in entries:
+            data = entry.data
+            bot = data.get('bot')
+            if not bot:
+                continue
+            timestamp = parse_iso_timestamp(data.get('timestamp'))
+            if timestamp is None:
+                continue
+            process_key = (bot, data.get('pid'))
+            message = str(data.get('message', ''))
+            if self.ACCOUNT_MARKER in message:
+                self.account_started[process_key] = timestamp
+                self.metrics.record(bot, timestamp, 'attempts', now=now)
+            elif self.ORDER_MARKER in message:
+                started = self.account_started.get(process_key)
+                if started is not None:
+                    self.metrics.record_latency(bot, timestamp, max(0.0, timestamp - started), now=now)
+            elif data.get('level') == 'error':
+                self.metrics.record(bot, timestamp, 'failures', now=now)
+
+    def platforms(self):
+        return sorted(set(BOT_CONFIG) | set(self.metrics.buckets))
+
+    def summaries(self, window):
+        self.metrics.prune()
+        return {platform: self.metrics.summary(platform, window) for platform in self.platforms()}
+
+class OrderRollups:
+    # Running aggregates over the order log, updated once per appended row so
+    # analytics never rescan the log. Prices are parsed on the way in. Buckets
+    # are kept per platform, per (platform, product) and per (platform, local
+    # hour); day and 24 h totals are sums of at most 24 hour buckets.
+    PERIODS = ('Today', 'Last 24h', 'All time')
+    GROUPS = ('Platform', 'Product', 'Hour')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.platforms = {}
+        self.products = {}
+        self.hours = {}
+        self.row_count = 0
+
+    @staticmethod
+    def new_bucket():
+        return {'orders': 0, 'purchased': 0, 'spend': 0.0, 'priced': 0}
+
+    @staticmethod
+    def hour_key(timestamp):
+        return time.strftime('%Y-%m-%d %H:00', time.localtime(timestamp)) if timestamp is not None else 'Unknown'
+
+    def add_rows(self, rows):
+        for row in rows:
+            platform = row.get('Platform') or 'Unknown'
+            product = str(row.get('Product') or '')
+            price = parse_price(row.get('Price'))
+            purchased = 'purchased' in str(row.get('Status', '')).lower()
+            hour = self.hour_key(parse_iso_timestamp(row.get('Timestamp')))
+            for buckets, key in ((self.platforms, platform),
+                                 (self.products, (platform, product)),
+                                 (self.hours, (platform, hour))):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = self.new_bucket()
+                bucket['orders'] += 1
+                if purchased:
+                    bucket['purchased'] += 1
+                    if price is not None:
+                        bucket['spend'] += price
+                        bucket['priced'] += 1
+            self.row_count += 1
+
+    def period_start(self, period, now=None):
+        # Hour key of the first bucket in the period, None for all time
+        now = time.time() if now is None else now
+        if period == 'Today':
+            return time.strftime('%Y-%m-%d 00:00', time.localtime(now))
+        if period == 'Last 24h':
+            return self.hour_key(now - 23 * 3600)
+        return None
+
+    @staticmethod
+    def summarize(bucket):
+        return {
+            'orders': bucket['orders'],
+            'purchased': bucket['purchased'],
+            'success_rate': bucket['purchased'] / bucket['orders'] if bucket['orders'] else None,
+            'spend': bucket['spend'],
+            'avg_price': bucket['spend'] / bucket['priced'] if bucket['priced'] else None
+        }
+
+    @staticmethod
+    def merge(target, bucket):
+        for field in ('orders', 'purchased', 'spend', 'priced'):
+            target[field] += bucket[field]
+
+    def by_platform(self, period='All time', now=None):
+        start = self.period_start(period, now)
+        if start is None:
+            totals = self.platforms
+        else:
+            totals = {}
+            for (platform, hour), bucket in self.hours.items():
+                if hour != 'Unknown' and hour >= start:
+                    self.merge(totals.setdefault(platform, self.new_bucket()), bucket)
+        return [(platform, self.summarize(bucket)) for platform, bucket in sorted(totals.items())]
+
+    def by_hour(self, period='All time', platform=None, now=None):
+        start = self.period_start(period, now)
+        totals = {}
+        for (bucket_platform, hour), bucket in self.hours.items():
+            if platform is not None and bucket_platform != platform:
+                continue
+            if start is not None and (hour == 'Unknown' or hour < start):
+                continue
+            self.merge(totals.setdefault(hour, self.new_bucket()), bucket)
+        # Newest first, with rows whose timestamp did not parse at the end
+        ordered = sorted(totals.items(), key=lambda item: (item[0] != 'Unknown', item[0]), reverse=True)
+        return [(hour, self.summarize(bucket)) for hour, bucket in ordered]
+
+    def by_product(self, platform=None, limit=None):
+        # All-time only: products are not split by hour
+        items = [(key, bucket) for key, bucket in self.products.items()
+                 if platform is None or key[0] == platform]
+        items.sort(key=lambda item: (item[1]['spend'], item[1]['orders']), reverse=True)
+        if limit:
+            items = items[:limit]
+        return [(f'{platform_name} / {product}', self.summarize(bucket)) for (platform_name, product), bucket in items]
+
+    def query(self, group='Platform', period='All time', platform=None, now=None):
+        if group == 'Product':
+            return self.by_product(platform)
+        if group == 'Hour':
+            return self.by_hour(period, platform, now)
+        rows = self.by_platform(period, now)
+        return [row for row in rows if platform is None or row[0] == platform]
+
+class LogIndex:
+    # On-disk index over a winston JSON-lines log. `<log>.idx` holds one
+    # fixed-size record per line (byte offset, length, epoch timestamp, running
+    # max timestamp, level, bot id, account email id); `<log>.idx.json` holds
+    # the id tables and how far the log has been indexed. Both grow
+    # incrementally, and queries binary-search the memory-mapped index instead
+    # of parsing the log. Several bot processes write the log, so timestamps
+    # are only roughly ordered: time ranges are bisected on the running max,
+    # which is monotonic, widened by the largest skew seen, then filtered.
+    RECORD = struct.Struct('<QIddBHI')
+    VERSION = 2
+    LEVELS = ('error', 'warn', 'info', 'http', 'verbose', 'debug', 'silly')
+    NO_LEVEL = 0xFF
+    NO_BOT = 0xFFFF
+    NO_EMAIL = 0xFFFFFFFF
+    ACCOUNT_MARKER = 'Processing account:'
+    EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+    MAX_READ = 16 * 1024 * 1024
+
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + '.idx'
+        self.meta_path = self.index_path + '.json'
+        self.lock = Lock()
+        self.load_meta()
+
+    def fresh_meta(self):
+        return {'version': self.VERSION, 'file_id': None, 'indexed_to': 0, 'count': 0,
+                'last_ts': 0.0, 'max_ts': 0.0, 'max_skew': 0.0,
+                'bots': [], 'emails': [], 'current_accounts': {}}
+
+    def load_meta(self):
+        try:
+            with open(self.meta_path, encoding='utf-8') as f:
+                self.meta = json.load(f)
+            if self.meta.get('version') != self.VERSION:
+                raise ValueError('old index format')
+            if os.path.getsize(self.index_path) != self.meta['count'] * self.RECORD.size:
+                raise ValueError('index size mismatch')
+        except (OSError, ValueError, KeyError):
+            self.reset()
+        self.bot_ids = {name: i for i, name in enumerate(self.meta['bots'])}
+        self.email_ids = {name: i for i, name in enumerate(self.meta['emails'])}
+
+    def reset(self):
+        self.meta = self.fresh_meta()
+        self.bot_ids = {}
+        self.email_ids = {}
+        # logs/ may not exist yet on a fresh checkout
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        with open(self.index_path, 'wb'):
+            pass
+        self.save_meta()
+
+    def save_meta(self):
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def intern(self, table, ids, value, limit):
+        if value in ids:
+            return ids[value]
+        if len(table) >= limit:
+            return None
+        ids[value] = len(table)
+        table.append(value)
+        return ids[value]
+
+    def update(self):
+        # Indexes complete lines appended since the last call; returns how many
+        with self.lock:
+            try:
+                stat = os.stat(self.log_path)
+            except OSError:
+                return 0
+            file_id = [stat.st_dev, stat.st_ino]
+            if self.meta['file_id'] != file_id or stat.st_size < self.meta['indexed_to']:
+                if self.meta['file_id'] is not None or self.meta['count']:
+                    self.reset()
+                self.meta['file_id'] = file_id
+            start = self.meta['indexed_to']
+            if stat.st_size <= start:
+                return 0
+
+            with open(self.log_path, 'rb') as f:
+                f.seek(start)
+                chunk = f.read(min(stat.st_size - start, self.MAX_READ))
+            end = chunk.rfind(b'\n')
+            if end == -1:
+                return 0
+            chunk = chunk[:end + 1]
+
+            records = []
+            last_ts = self.meta['last_ts']
+            max_ts = self.meta['max_ts']
+            max_skew = self.meta['max_skew']
+            accounts = self.meta['current_accounts']
+            pos = 0
+            while pos < len(chunk):
+                newline = chunk.index(b'\n', pos)
+                raw = chunk[pos:newline]
+                try:
+                    data = json.loads(raw)
+                    if not isinstance(data, dict):
+                        data = {}
+                except ValueError:
+                    data = {}
+                timestamp = parse_iso_timestamp(data.get('timestamp')) or last_ts
+                last_ts = timestamp
+                max_ts = max(max_ts, timestamp)
+                max_skew = max(max_skew, max_ts - timestamp)
+                level = data.get('level')
+                level_id = self.LEVELS.index(level) if level in self.LEVELS else self.NO_LEVEL
+                bot = data.get('bot')
+                bot_id = self.intern(self.meta['bots'], self.bot_ids, bot, self.NO_BOT) if bot else None
+                message = str(data.get('message', ''))
+                process_key = f"{bot}:{data.get('pid')}"
+                match = self.EMAIL_RE.search(message)
+                if match and self.ACCOUNT_MARKER in message:
+                    accounts[process_key] = match.group(0)
+                # Lines without an address inherit the account the process is working on
+                email = match.group(0) if match else accounts.get(process_key) if bot else None
+                email_id = self.intern(self.meta['emails'], self.email_ids, email.lower(), self.NO_EMAIL) if email else None
+                records.append(self.RECORD.pack(
+                    start + pos, newline - pos, timestamp, max_ts, level_id,
+                    self.NO_BOT if bot_id is None else bot_id,
+                    self.NO_EMAIL if email_id is None else email_id
+                ))
+                pos = newline + 1
+
+            with open(self.index_path, 'ab') as f:
+                f.write(b''.join(records))
+            self.meta['indexed_to'] = start + len(chunk)
+            self.meta['count'] += len(records)
+            self.meta['last_ts'] = last_ts
+            self.meta['max_ts'] = max_ts
+            self.meta['max_skew'] = max_skew
+            self.save_meta()
+            return len(records)
+
+    def update_all(self):
+        total = 0
+        while True:
+            added = self.update()
+            if not added:
+                return total
+            total += added
+
+    def record(self, index_map, i):
+        return self.RECORD.unpack_from(index_map, i * self.RECORD.size)
+
+    def lower_bound(self, index_map, count, field, value):
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(index_map, mid)[field] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(self, start=None, end=None, level=None, bot=None, email=None, text=None, limit=500):
+        # Newest matches first. start/end are epoch seconds; text is a
+        # case-sensitive substring found with mmap.rfind over the log bytes.
+        self.update_all()
+        count = self.meta['count']
+        if not count:
+            return []
+        level_id = self.LEVELS.index(level) if level in self.LEVELS else None
+        bot_id = self.bot_ids.get(bot) if bot else None
+        email_id = self.email_ids.get(email.lower()) if email else None
+        if (bot and bot_id is None) or (email and email_id is None):
+            return []
+
+        results = []
+        with open(self.index_path, 'rb') as f_index, open(self.log_path, 'rb') as f_log:
+            index_map = mmap.mmap(f_index.fileno(), 0, access=mmap.ACCESS_READ)
+            log_map = mmap.mmap(f_log.fileno(), 0, access=mmap.ACCESS_READ)
+            with index_map, log_map:
+                # A line with timestamp >= start has running max >= start; a line
+                # with timestamp <= end has running max <= end + max_skew
+                lo = self.lower_bound(index_map, count, 3, start) if start is not None else 0
+                hi = (self.lower_bound(index_map, count, 3, math.nextafter(end + self.meta['max_skew'], math.inf))
+                      if end is not None else count)
+                if lo >= hi:
+                    return []
+
+                def matches(rec):
+                    return ((start is None or rec[2] >= start) and
+                            (end is None or rec[2] <= end) and
+                            (level_id is None or rec[4] == level_id) and
+                            (bot_id is None or rec[5] == bot_id) and
+                            (email_id is None or rec[6] == email_id))
+
+                def emit(rec):
+                    line = log_map[rec[0]:rec[0] + rec[1]].decode('utf-8', errors='replace')
+                    results.append({
+                        'offset': rec[0],
+                        'timestamp': rec[2],
+                        'level': self.LEVELS[rec[4]] if rec[4] != self.NO_LEVEL else '',
+                        'bot': self.meta['bots'][rec[5]] if rec[5] != self.NO_BOT else '',
+                        'email': self.meta['emails'][rec[6]] if rec[6] != self.NO_EMAIL else '',
+                        'entry': LogEntry(line),
+                    })
+
+                if text:
+                    needle = text.encode('utf-8')
+                    range_start = self.record(index_map, lo)[0]
+                    last = self.record(index_map, hi - 1)
+                    search_end = last[0] + last[1]
+                    while len(results) < limit:
+                        found = log_map.rfind(needle, range_start, search_end)
+                        if found == -1:
+                            break
+                        i = self.lower_bound(index_map, count, 0, found + 1) - 1
+                        rec = self.record(index_map, i)
+                        if matches(rec):
+                            emit(rec)
+                        search_end = rec[0]
+                else:
+                    for i in range(hi - 1, lo - 1, -1):
+                        rec = self.record(index_map, i)
+                        if matches(rec):
+                            emit(rec)
+                            if len(results) >= limit:
+                                break
+        return results
+
+class ApiRequest:
+    def __init__(self, key=None):
+        self.key = key
+        self.future = None
+        self.cancelled = False
+        self.callbacks = []
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+class ApiClient:
+    # Runs blocking HTTP calls on a worker pool. Results are queued and handed
+    # back to the Tk thread by process_results(), which the UI drains via after().
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='api')
+        self.results = queue.Queue()
+        self.inflight = {}
+        self.lock = Lock()
+
+    def submit(self, func, on_success=None, on_error=None, key=None):
+        # Requests sharing a key while one is still in flight are coalesced:
+        # the caller gets the running request and its callbacks are added to it.
+        with self.lock:
+            if key is not None and key in self.inflight:
+                request = self.inflight[key]
+                request.callbacks.append((on_success, on_error))
+                return request
+            request = ApiRequest(key)
+            request.callbacks.append((on_success, on_error))
+            if key is not None:
+                self.inflight[key] = request
+            request.future = self.executor.submit(self._run, request, func)
+        return request
+
+    def _run(self, request, func):
+        try:
+            result, error = func(), None
+        except Exception as e:
+            result, error = None, e
+        with self.lock:
+            if request.key is not None and self.inflight.get(request.key) is request:
+                del self.inflight[request.key]
+        self.results.put((request, result, error))
+
+    def cancel(self, request):
+        if request is None:
+            return
+        request.cancel()
+        with self.lock:
+            if request.key is not None and self.inflight.get(request.key) is request:
+                del self.inflight[request.key]
+
+    def process_results(self):
+        while True:
+            try:
+                request, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if request.cancelled:
+                continue
+            for on_success, on_error in request.callbacks:
+                try:
+                    if error is None:
+                        if on_success:
+                            on_success(result)
+                    elif on_error:
+                        on_error(error)
+                except Exception:
+                    pass
+
+    def shutdown(self):
+        with self.lock:
+            for request in self.inflight.values():
+                request.cancelled = True
+            self.inflight.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class BotStatusStream:
+    # Keeps one long-lived connection to /bots/status/stream (server-sent events)
+    # and queues (event, data) pairs for the Tk thread. Reconnects with backoff.
+    MIN_RECONNECT_DELAY = 1
+    MAX_RECONNECT_DELAY = 30
+
+    def __init__(self, auth_manager):
+        self.auth_manager = auth_manager
+        self.events = queue.Queue()
+        self.connected = False
+        self.stop_event = Event()
+        self.response = None
+        self.thread = None
+
+    def start(self):
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        response = self.response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def run(self):
+        delay = self.MIN_RECONNECT_DELAY
+        while not self.stop_event.is_set():
+            try:
+                # Read timeout well above the server's 15 s heartbeat
+                response = self.auth_manager.get('/bots/status/stream', stream=True, timeout=(5, 45))
+                self.response = response
+                if response.status_code == 200:
+                    self.connected = True
+                    delay = self.MIN_RECONNECT_DELAY
+                    self.events.put(('connected', None))
+                    for event, data in self.iter_events(response):
+                        self.events.put((event, data))
+                response.close()
+            except Exception:
+                pass
+            finally:
+                self.response = None
+                if self.connected:
+                    self.connected = False
+                    self.events.put(('disconnected', None))
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    def iter_events(self, response):
+        event, data_lines = 'message', []
+        for line in response.iter_lines(decode_unicode=True):
+            if self.stop_event.is_set():
+                return
+            if not line:
+                if data_lines:
+                    try:
+                        yield event, json.loads('\n'.join(data_lines))
+                    except ValueError:
+                        pass
+                event, data_lines = 'message', []
+            elif line.startswith(':'):
+                continue
+            elif line.startswith('event:'):
+                event = line[6:].strip()
+            elif line.startswith('data:'):
+                data_lines.append(line[5:].lstrip())
 
 class AuthManager:
     def __init__(self):
         self.token = None
         self.user = None
         self.refresh_token = None
+        self.refresh_lock = Lock()
+        self.session_lock = Lock()
+        self._session = None
+    
+    @property
+    def session(self):
+        # Created on first use, normally from a worker thread, so importing
+        # requests stays off the startup path
+        if self._session is None:
+            with self.session_lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+    
+    def create_session(self):
+        # One keep-alive connection pool for every call the dashboard makes.
+        # POST is not retried automatically since starting a bot is not idempotent.
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        session = requests.Session()
+        retry = Retry(total=3, connect=3, read=2, backoff_factor=0.5,
+                      status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET', 'PUT', 'DELETE']))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # session.get/post go through session.request, so this times every API call
+        send = session.request
+
+        def timed_request(method, url, *args, **kwargs):
+            with profiler.section(api_operation(method, url)):
+                return send(method, url, *args, **kwargs)
+        session.request = timed_request
+        return session
     
     def set_credentials(self, token, refresh_token, user):
         self.token = token
@@ -57,10 +1935,399 @@ class AuthManager:
         self.token = None
         self.refresh_token = None
         self.user = None
+    
+    def request(self, method, path, **kwargs):
+        # On a 401 the access token is refreshed once and the request replayed
+        url = f'{API_BASE_URL}{path}'
+        extra_headers = kwargs.pop('headers', None) or {}
+        token = self.token
+        response = self.session.request(method, url, headers={**self.get_headers(), **extra_headers}, **kwargs)
+        if response.status_code == 401 and self.refresh_token and token:
+            if self.refresh_access_token(token):
+                response = self.session.request(method, url, headers={**self.get_headers(), **extra_headers}, **kwargs)
+        return response
+    
+    def refresh_access_token(self, stale_token):
+        with self.refresh_lock:
+            if self.token != stale_token:
+                # Another thread already refreshed while we were waiting
+                return self.token is not None
+            refresh_token = self.refresh_token
+            if not refresh_token:
+                return False
+            try:
+                response = self.session.post(f'{API_BASE_URL}/auth/refresh',
+                                             json={'refreshToken': refresh_token},
+                                             headers=HEADERS,
+                                             timeout=10)
+                data = response.json() if response.status_code == 200 else {}
+            except (requests.exceptions.RequestException, ValueError):
+                return False
+            if not data.get('success'):
+                return False
+            self.token = data['data']['accessToken']
+            self.refresh_token = data['data'].get('refreshToken', refresh_token)
+            return True
+    
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+    
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+    
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+    
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+    
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+class DashboardCore:
+    # Everything the dashboard tracks that does not need a window: order log,
+    # bot status, supervised processes, log tail and metrics. The Tk Dashboard
+    # drives it from after() callbacks and run_headless() from a plain loop.
+    # `lock` guards the state read by DashboardService's request threads.
+    MIN_STATUS_POLL_DELAY = 2
+    MAX_STATUS_POLL_DELAY = 60
+
+    def __init__(self):
+        self.auth_manager = AuthManager()
+        self.order_log_reader = OrderLogReader(ORDER_LOG_PATH)
+        # Separate reader for /orders: sharing order_log_reader would advance its
+        # index and make the next refresh skip the rows in between
+        self.recent_orders_reader = OrderLogReader(ORDER_LOG_PATH)
+        self.recent_orders_lock = Lock()
+        self.order_store = OrderStore()
+        self.supervisor = BotSupervisor()
+        self.sharded_runs = []
+        self.api_client = ApiClient()
+        self.log_tailer = LogTailer(COMBINED_LOG_PATH)
+        self.metrics_engine = MetricsEngine()
+        self.log_indexes = {}
+        self.order_rollups = OrderRollups()
+        self.lock = Lock()
+        self.api_mode = False
+        self.status_stream = None
+        self.bot_status = {}
+        self.status_updated_at = None
+        self.last_order_at = {}
+        self.order_counts = {}
+        self.last_log_mtime = None
+        self.status_poll_delay = self.MIN_STATUS_POLL_DELAY
+        self.next_status_poll = time.monotonic() + self.status_poll_delay
+        self.started_at = time.time()
+
+    def check_api_server(self):
+        try:
+            response = self.auth_manager.session.get(f'{API_BASE_URL}/../health', timeout=5)
+            self.api_mode = response.status_code == 200
+        except:
+            self.api_mode = False
+        return self.api_mode
+
+    def login(self, email, password):
+        # Non-interactive login for headless mode; LoginDialog does the same in the GUI
+        try:
+            response = self.auth_manager.session.post(f'{API_BASE_URL}/auth/login',
+                                                      json={'email': email, 'password': password},
+                                                      headers=HEADERS,
+                                                      timeout=10)
+            data = response.json() if response.status_code == 200 else {}
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+        if not data.get('success'):
+            return False
+        self.auth_manager.set_credentials(data['data']['accessToken'],
+                                          data['data']['refreshToken'],
+                                          data['data']['user'])
+        return True
+
+    def start_status_stream(self):
+        if self.api_mode and self.status_stream is None:
+            self.status_stream = BotStatusStream(self.auth_manager)
+            self.status_stream.start()
+
+    def order_log_changed(self):
+        try:
+            mtime = os.path.getmtime(ORDER_LOG_PATH) if os.path.exists(ORDER_LOG_PATH) else None
+        except OSError:
+            return False
+        if mtime is None or mtime == self.last_log_mtime:
+            return False
+        self.last_log_mtime = mtime
+        return True
+
+    def poll_orders(self):
+        # Returns (reset, changed) after moving new log lines into order_store
+        try:
+            reset, rows, display_rows = self.read_orders()
+        except Exception:
+            return False, False
+        return reset, self.apply_orders(reset, rows, display_rows)
+
+    @profiler.timed()
+    def read_orders(self):
+        # The slow half of poll_orders (file scan, JSON, pandas formatting).
+        # Safe on a worker thread as long as only one read runs at a time.
+        reset, rows = self.order_log_reader.read_new_rows()
+        return reset, rows, build_order_rows(rows)
+
+    @profiler.timed()
+    def apply_orders(self, reset, rows, display_rows):
+        if not (reset or rows):
+            return False
+        with self.lock:
+            if reset:
+                self.order_store.clear()
+                self.order_rollups.clear()
+                self.order_counts = {}
+            self.order_rollups.add_rows(rows)
+            self.metrics_engine.add_orders(reset, rows)
+            for row in rows:
+                platform = row.get('Platform') or 'Unknown'
+                self.order_counts[platform] = self.order_counts.get(platform, 0) + 1
+            self.order_store.append_rows(display_rows)
+        return True
+
+    def clear_orders(self):
+        with self.lock:
+            self.order_log_reader.reset()
+            self.order_store.clear()
+            self.order_rollups.clear()
+            self.metrics_engine.metrics.clear_orders()
+            self.order_counts = {}
+
+    def poll_logs(self):
+        entries = self.log_tailer.poll()
+        if entries:
+            with self.lock:
+                self.metrics_engine.consume_log_entries(entries)
+        return entries
+
+    def metric_summaries(self, window):
+        with self.lock:
+            return self.metrics_engine.summaries(window)
+
+    def poll_supervisor(self, on_exit=None):
+        if self.api_mode:
+            return set()
+        return self.supervisor.process_events(on_output=self.record_shard_output, on_exit=on_exit)
+
+    def record_shard_output(self, instance, line):
+        for run in self.sharded_runs:
+            if run.record_output(instance, line):
+                break
+
+    def poll_status_events(self):
+        # Drains the status stream; returns the events so a UI can react to them
+        if self.status_stream is None:
+            return []
+        events = []
+        while True:
+            try:
+                event, data = self.status_stream.events.get_nowait()
+            except queue.Empty:
+                break
+            self.handle_status_event(event, data)
+            events.append((event, data))
+        return events
+
+    def handle_status_event(self, event, data):
+        if event == 'connected':
+            self.status_poll_delay = self.MIN_STATUS_POLL_DELAY
+        elif event == 'disconnected':
+            # Fall back to polling until the stream comes back
+            self.next_status_poll = time.monotonic()
+        elif event == 'snapshot':
+            self.apply_bot_status(data.get('status', {}))
+        elif data and data.get('botType'):
+            bot_type = data['botType']
+            if event == 'order':
+                self.last_order_at[bot_type] = datetime.now().strftime('%H:%M:%S')
+            self.apply_bot_status({bot_type: data.get('status', {})})
+
+    def status_poll_due(self):
+        # Stream is down: poll, backing off so we stay inside the API rate limit.
+        # In local mode process exits arrive through the supervisor's event queue.
+        if not self.api_mode or self.status_stream is None or self.status_stream.connected:
+            return False
+        if time.monotonic() < self.next_status_poll:
+            return False
+        self.next_status_poll = time.monotonic() + self.status_poll_delay
+        self.status_poll_delay = min(self.status_poll_delay * 2, self.MAX_STATUS_POLL_DELAY)
+        return True
+
+    def request_bot_status(self, on_status=None, on_error=None):
+        def on_success(response):
+            status = self.read_bot_status(response)
+            if status is None:
+                if on_error:
+                    on_error(None)
+                return
+            self.apply_bot_status(status)
+            if on_status:
+                on_status(status)
+
+        # key= coalesces a poll with any identical poll still in flight
+        return self.api_client.submit(
+            lambda: self.auth_manager.get('/bots/status', timeout=10),
+            on_success=on_success,
+            on_error=on_error,
+            key='bots/status'
+        )
+
+    @staticmethod
+    def read_bot_status(response):
+        if response.status_code != 200:
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        return data['data']['status'] if data.get('success') else None
+
+    def apply_bot_status(self, status_data):
+        with self.lock:
+            for bot_type, status in status_data.items():
+                self.bot_status[bot_type] = dict(status)
+            self.status_updated_at = time.time()
+
+    def local_bot_status(self):
+        status = {}
+        for bot in BOT_CONFIG:
+            instances = self.supervisor.running(bot)
+            status[bot.lower()] = {
+                'running': bool(instances),
+                'instances': len(instances),
+                'pids': [instance.pid for instance in instances]
+            }
+        return status
+
+    def snapshot(self, window='5m'):
+        if window not in RollingMetrics.WINDOWS:
+            window = '5m'
+        bots = self.local_bot_status() if not self.api_mode else None
+        summaries = self.metric_summaries(window)
+        browser_pools = read_browser_pools()
+        with self.lock:
+            if bots is None:
+                bots = {bot: dict(status) for bot, status in self.bot_status.items()}
+            for bot, status in bots.items():
+                if bot in self.last_order_at:
+                    status['last_order_at'] = self.last_order_at[bot]
+            return {
+                'host': socket.gethostname(),
+                'mode': 'api' if self.api_mode else 'local',
+                'stream_connected': bool(self.status_stream and self.status_stream.connected),
+                'uptime': round(time.time() - self.started_at, 1),
+                'status_updated_at': self.status_updated_at,
+                'bots': bots,
+                'orders': {'total': len(self.order_store), 'by_platform': dict(self.order_counts)},
+                'window': window,
+                'metrics': summaries,
+                'browser_pools': browser_pools
+            }
+
+    def order_analytics(self, group='Platform', period='All time', platform=None):
+        with self.lock:
+            return self.order_rollups.query(group, period, platform)
+
+    def recent_orders(self, limit):
+        # last() only indexes bytes appended since the previous request, and the
+        # reader has its own lock so /status is never queued behind it
+        with self.recent_orders_lock:
+            return self.recent_orders_reader.last(limit)
+
+    def shutdown(self):
+        self.supervisor.stop_all()
+        if self.status_stream is not None:
+            self.status_stream.stop()
+        self.api_client.shutdown()
+        self.auth_manager.close()
+
+class DashboardService:
+    # Small read-only JSON endpoint over a DashboardCore, for servers with no
+    # display. GET /health, /status?window=5m, /metrics?window=1h, /orders?limit=50,
+    # /analytics?group=platform|product|hour&period=today|24h|all, /profile.
+    DEFAULT_PORT = 8765
+    MAX_ORDER_LIMIT = 1000
+
+    def __init__(self, core, host='127.0.0.1', port=DEFAULT_PORT):
+        self.core = core
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                try:
+                    status, body = service.handle(url.path.rstrip('/') or '/', params)
+                except Exception as e:
+                    status, body = 500, {'success': False, 'message': str(e)}
+                payload = json.dumps(body, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def handle(self, path, params):
+        window = params.get('window', ['5m'])[0]
+        if path == '/health':
+            return 200, {'success': True, 'mode': 'api' if self.core.api_mode else 'local'}
+        if path == '/status':
+            return 200, {'success': True, 'data': self.core.snapshot(window)}
+        if path == '/metrics':
+            if window not in RollingMetrics.WINDOWS:
+                return 400, {'success': False, 'message': f'window must be one of {", ".join(RollingMetrics.WINDOWS)}'}
+            return 200, {'success': True, 'data': {'window': window, 'metrics': self.core.metric_summaries(window)}}
+        if path == '/analytics':
+            group = params.get('group', ['Platform'])[0].title()
+            period = {'today': 'Today', '24h': 'Last 24h', 'all': 'All time'}.get(params.get('period', ['all'])[0])
+            if group not in OrderRollups.GROUPS or period is None:
+                return 400, {'success': False, 'message': 'group must be platform|product|hour and period today|24h|all'}
+            platform = params.get('platform', [None])[0]
+            rows = self.core.order_analytics(group, period, platform)
+            return 200, {'success': True, 'data': [dict(summary, key=key) for key, summary in rows]}
+        if path == '/profile':
+            return 200, {'success': True, 'data': profiler.summaries()}
+        if path == '/orders':
+            try:
+                limit = int(params.get('limit', ['50'])[0])
+            except ValueError:
+                return 400, {'success': False, 'message': 'limit must be a number'}
+            limit = max(0, min(limit, self.MAX_ORDER_LIMIT))
+            return 200, {'success': True, 'data': self.core.recent_orders(limit)}
+        return 404, {'success': False, 'message': 'Not found'}
+
+    def start(self):
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
 
 class LoginDialog:
-    def __init__(self, parent):
+    def __init__(self, parent, auth_manager):
         self.parent = parent
+        self.auth_manager = auth_manager
         self.result = None
         self.create_dialog()
     
@@ -121,10 +2388,10 @@ class LoginDialog:
             return
         
         try:
-            response = requests.post(f'{API_BASE_URL}/auth/login', 
-                                   json={'email': email, 'password': password},
-                                   headers=HEADERS,
-                                   timeout=10)
+            response = self.auth_manager.session.post(f'{API_BASE_URL}/auth/login', 
+                                                      json={'email': email, 'password': password},
+                                                      headers=HEADERS,
+                                                      timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -151,11 +2418,92 @@ class LoginDialog:
     def cancel(self):
         self.dialog.destroy()
 
+USER_CSV_FIELDS = ('email', 'password', 'role', 'first_name', 'last_name')
+
+def parse_user_csv(text):
+    # Returns (users, errors). Headers are matched loosely ("First Name" ->
+    # first_name); email and password columns are required, the rest optional.
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if not header:
+        return [], ['The file is empty']
+    columns = [h.strip().lower().replace(' ', '_') for h in header]
+    missing = [field for field in ('email', 'password') if field not in columns]
+    if missing:
+        return [], [f'Missing column(s): {", ".join(missing)}']
+    users, errors = [], []
+    for line_no, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        row = {col: value.strip() for col, value in zip(columns, values) if col in USER_CSV_FIELDS}
+        if not row.get('email') or not row.get('password'):
+            errors.append(f'Line {line_no}: email and password are required')
+            continue
+        users.append({field: row[field] for field in USER_CSV_FIELDS if row.get(field)})
+    return users, errors
+
+class UserPageCache:
+    # Pages of /users already fetched, keyed by query, with the ETag the server
+    # sent. Revisiting a page shows the cached copy at once and revalidates it
+    # with If-None-Match; a 304 costs the server no query and us no re-render.
+    MAX_PAGES = 50
+
+    def __init__(self):
+        self.pages = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def key(params):
+        return tuple(sorted(params.items()))
+
+    def peek(self, params):
+        with self.lock:
+            cached = self.pages.get(self.key(params))
+        return cached[1] if cached else None
+
+    def fetch(self, auth_manager, params):
+        # Returns (data, not_modified); runs on an ApiClient worker
+        key = self.key(params)
+        with self.lock:
+            cached = self.pages.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        response = auth_manager.get('/users', params=params, headers=headers, timeout=10)
+        if response.status_code == 304 and cached:
+            return cached[1], True
+        if response.status_code != 200:
+            data = response.json() if response.headers.get('content-type', '').startswith('application/json') else {}
+            raise RuntimeError(data.get('message', f'HTTP {response.status_code}'))
+        body = response.json()
+        if not body.get('success'):
+            raise RuntimeError(body.get('message', 'Failed to load users'))
+        data = body['data']
+        etag = response.headers.get('ETag')
+        if etag:
+            with self.lock:
+                self.pages.pop(key, None)
+                self.pages[key] = (etag, data)
+                while len(self.pages) > self.MAX_PAGES:
+                    del self.pages[next(iter(self.pages))]
+        return data, False
+
 class UserManagementDialog:
-    def __init__(self, parent, auth_manager):
+    PAGE_SIZES = (25, 50, 100)
+    SORT_FIELDS = {'ID': 'id', 'Email': 'email', 'Role': 'role', 'First Name': 'first_name',
+                   'Last Name': 'last_name', 'Created At': 'created_at'}
+
+    def __init__(self, parent, auth_manager, api_client):
         self.parent = parent
         self.auth_manager = auth_manager
+        self.api_client = api_client
+        self.page_cache = UserPageCache()
         self.users = []
+        self.page = 1
+        self.total_pages = 1
+        self.total_users = 0
+        self.sort_by = 'created_at'
+        self.sort_order = 'desc'
+        self.search_job = None
+        self.load_request = None
         self.create_dialog()
         self.load_users()
     
@@ -176,21 +2524,55 @@ class UserManagementDialog:
         toolbar_frame.pack(fill='x', pady=(0, 10))
         
         ttk.Button(toolbar_frame, text='Add User', command=self.add_user).pack(side='left', padx=(0, 5))
+        ttk.Button(toolbar_frame, text='Import CSV...', command=self.import_csv).pack(side='left', padx=(0, 5))
         ttk.Button(toolbar_frame, text='Edit User', command=self.edit_user).pack(side='left', padx=(0, 5))
         ttk.Button(toolbar_frame, text='Delete User', command=self.delete_user).pack(side='left', padx=(0, 5))
-        ttk.Button(toolbar_frame, text='Reset Password', command=self.reset_password).pack(side='left', padx=(0, 5))
         ttk.Button(toolbar_frame, text='Refresh', command=self.load_users).pack(side='left', padx=(10, 0))
+
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+        ttk.Entry(toolbar_frame, textvariable=self.search_var, width=25).pack(side='right')
+        ttk.Label(toolbar_frame, text='Search:').pack(side='right', padx=(0, 5))
+
+        # Actions below apply to every selected row (Ctrl/Shift-click to select several)
+        selection_frame = ttk.Frame(main_frame)
+        selection_frame.pack(fill='x', pady=(0, 10))
+        ttk.Label(selection_frame, text='Selected:').pack(side='left', padx=(0, 5))
+        ttk.Button(selection_frame, text='Activate', command=lambda: self.set_selected_active(True)).pack(side='left', padx=(0, 5))
+        ttk.Button(selection_frame, text='Deactivate', command=lambda: self.set_selected_active(False)).pack(side='left', padx=(0, 5))
+        ttk.Button(selection_frame, text='Reset Password', command=self.reset_password).pack(side='left', padx=(0, 5))
+
+        self.status_filter_var = tk.StringVar(value='Active')
+        status_combo = ttk.Combobox(selection_frame, textvariable=self.status_filter_var,
+                                    values=['Active', 'Inactive', 'All'], state='readonly', width=8)
+        status_combo.pack(side='right')
+        status_combo.bind('<<ComboboxSelected>>', lambda e: self.go_to_page(1))
+        ttk.Label(selection_frame, text='Show:').pack(side='right', padx=(0, 5))
+
+        page_frame = ttk.Frame(main_frame)
+        page_frame.pack(side='bottom', fill='x', pady=(10, 0))
+        ttk.Button(page_frame, text='Close', command=self.close).pack(side='right')
+        self.prev_btn = ttk.Button(page_frame, text='< Prev', command=lambda: self.go_to_page(self.page - 1))
+        self.prev_btn.pack(side='left')
+        self.page_label = ttk.Label(page_frame, text='Loading...')
+        self.page_label.pack(side='left', padx=10)
+        self.next_btn = ttk.Button(page_frame, text='Next >', command=lambda: self.go_to_page(self.page + 1))
+        self.next_btn.pack(side='left')
+        ttk.Label(page_frame, text='Per page:').pack(side='left', padx=(20, 5))
+        self.page_size_var = tk.IntVar(value=self.PAGE_SIZES[1])
+        page_size_combo = ttk.Combobox(page_frame, textvariable=self.page_size_var,
+                                       values=self.PAGE_SIZES, state='readonly', width=5)
+        page_size_combo.pack(side='left')
+        page_size_combo.bind('<<ComboboxSelected>>', lambda e: self.go_to_page(1))
         
         columns = ('ID', 'Email', 'Role', 'First Name', 'Last Name', 'Status', 'Created At')
         self.user_tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=15)
         
-        self.user_tree.heading('ID', text='ID')
-        self.user_tree.heading('Email', text='Email')
-        self.user_tree.heading('Role', text='Role')
-        self.user_tree.heading('First Name', text='First Name')
-        self.user_tree.heading('Last Name', text='Last Name')
-        self.user_tree.heading('Status', text='Status')
-        self.user_tree.heading('Created At', text='Created At')
+        for col in columns:
+            if col in self.SORT_FIELDS:
+                self.user_tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
+            else:
+                self.user_tree.heading(col, text=col)
         
         self.user_tree.column('ID', width=50)
         self.user_tree.column('Email', width=200)
@@ -206,49 +2588,137 @@ class UserManagementDialog:
         self.user_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
-        ttk.Button(main_frame, text='Close', command=self.dialog.destroy).pack(pady=(10, 0))
+        self.dialog.protocol('WM_DELETE_WINDOW', self.close)
+    
+    def close(self):
+        self.api_client.cancel(self.load_request)
+        if self.search_job is not None:
+            self.dialog.after_cancel(self.search_job)
+        self.dialog.destroy()
+
+    def query_params(self):
+        params = {'page': self.page, 'limit': self.page_size_var.get(),
+                  'status': self.status_filter_var.get().lower(),
+                  'sortBy': self.sort_by, 'sortOrder': self.sort_order}
+        search = self.search_var.get().strip()
+        if search:
+            params['search'] = search
+        return params
+
+    def schedule_search(self):
+        # Wait for a pause in typing before asking the server
+        if self.search_job is not None:
+            self.dialog.after_cancel(self.search_job)
+        self.search_job = self.dialog.after(300, lambda: self.go_to_page(1))
+
+    def go_to_page(self, page):
+        self.search_job = None
+        self.page = max(1, min(page, self.total_pages)) if page > 1 else 1
+        self.load_users()
+
+    def sort_by_column(self, column):
+        field = self.SORT_FIELDS[column]
+        if self.sort_by == field:
+            self.sort_order = 'asc' if self.sort_order == 'desc' else 'desc'
+        else:
+            self.sort_by, self.sort_order = field, 'asc'
+        self.go_to_page(1)
     
     def load_users(self):
-        try:
-            response = requests.get(f'{API_BASE_URL}/users', 
-                                  headers=self.auth_manager.get_headers(),
-                                  timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    self.users = data['data']['users']
-                    self.refresh_table()
-                else:
-                    messagebox.showerror('Error', data.get('message', 'Failed to load users'))
-            else:
-                messagebox.showerror('Error', f'HTTP {response.status_code}')
-                
-        except Exception as e:
-            messagebox.showerror('Error', f'Failed to load users: {str(e)}')
+        self.api_client.cancel(self.load_request)
+        params = self.query_params()
+        cached = self.page_cache.peek(params)
+        if cached is not None:
+            self.show_page(cached)
+        self.load_request = self.api_client.submit(
+            lambda: self.page_cache.fetch(self.auth_manager, params),
+            on_success=self.on_users_loaded,
+            on_error=lambda e: messagebox.showerror('Error', f'Failed to load users: {str(e)}', parent=self.dialog)
+        )
     
-    def refresh_table(self):
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
+    def on_users_loaded(self, result):
+        self.load_request = None
+        data, not_modified = result
+        if not not_modified:
+            self.show_page(data)
+
+    def show_page(self, data):
+        pagination = data.get('pagination', {})
+        self.users = data['users']
+        self.page = pagination.get('currentPage', self.page)
+        self.total_pages = max(1, pagination.get('totalPages', 1))
+        self.total_users = pagination.get('totalUsers', len(self.users))
+        self.refresh_table()
     
+    def refresh_table(self):
+        selection = set(self.user_tree.selection())
+        self.user_tree.delete(*self.user_tree.get_children())
         for user in self.users:
-            status = 'Active' if user.get('is_active', True) else 'Inactive'
-            created_at = user.get('created_at', '')
-            if created_at:
-                try:
-                    created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
-                except:
-                    pass
-            
-            self.user_tree.insert('', 'end', values=(
-                user.get('id', ''),
-                user.get('email', ''),
-                user.get('role', ''),
-                user.get('first_name', ''),
-                user.get('last_name', ''),
-                status,
-                created_at
-            ))
+            iid = str(user['id'])
+            self.user_tree.insert('', 'end', iid=iid, values=self.row_values(user))
+            if iid in selection:
+                self.user_tree.selection_add(iid)
+        self.update_page_label()
+
+    def update_page_label(self):
+        self.page_label.config(text=f'Page {self.page} of {self.total_pages} ({self.total_users} users)')
+        self.prev_btn.state(['!disabled'] if self.page > 1 else ['disabled'])
+        self.next_btn.state(['!disabled'] if self.page < self.total_pages else ['disabled'])
+
+    @staticmethod
+    def row_values(user):
+        status = 'Active' if user.get('is_active', True) else 'Inactive'
+        created_at = user.get('created_at', '')
+        if created_at:
+            try:
+                created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+            except:
+                pass
+        return (
+            user.get('id', ''),
+            user.get('email', ''),
+            user.get('role', ''),
+            user.get('first_name', ''),
+            user.get('last_name', ''),
+            status,
+            created_at
+        )
+
+    # Mutations patch the rows on screen instead of refetching the page
+
+    def matches_status_filter(self, user):
+        status = self.status_filter_var.get()
+        return status == 'All' or bool(user.get('is_active', True)) == (status == 'Active')
+
+    def upsert_row(self, user):
+        iid = str(user['id'])
+        if not self.matches_status_filter(user):
+            if self.user_tree.exists(iid):
+                self.remove_row(user['id'])
+            return
+        for idx, existing in enumerate(self.users):
+            if existing['id'] == user['id']:
+                self.users[idx] = user
+                self.user_tree.item(iid, values=self.row_values(user))
+                return
+        self.total_users += 1
+        # New users sort first only in the default view; elsewhere just count them
+        if self.page == 1 and (self.sort_by, self.sort_order) == ('created_at', 'desc') and not self.search_var.get().strip():
+            self.users.insert(0, user)
+            self.user_tree.insert('', 0, iid=iid, values=self.row_values(user))
+            if len(self.users) > self.page_size_var.get():
+                dropped = self.users.pop()
+                self.user_tree.delete(str(dropped['id']))
+        self.total_pages = max(1, math.ceil(self.total_users / self.page_size_var.get()))
+        self.update_page_label()
+
+    def remove_row(self, user_id):
+        if self.user_tree.exists(str(user_id)):
+            self.user_tree.delete(str(user_id))
+        self.users = [user for user in self.users if user['id'] != user_id]
+        self.total_users = max(0, self.total_users - 1)
+        self.total_pages = max(1, math.ceil(self.total_users / self.page_size_var.get()))
+        self.update_page_label()
     
     def get_selected_user(self):
         selection = self.user_tree.selection()
@@ -256,21 +2726,104 @@ class UserManagementDialog:
             messagebox.showwarning('Warning', 'Please select a user')
             return None
         
-        item = self.user_tree.item(selection[0])
-        user_id = item['values'][0]
+        user_id = int(selection[0])
         return next((user for user in self.users if user['id'] == user_id), None)
+
+    def get_selected_users(self):
+        selected = {int(iid) for iid in self.user_tree.selection()}
+        if not selected:
+            messagebox.showwarning('Warning', 'Please select one or more users', parent=self.dialog)
+        return [user for user in self.users if user['id'] in selected]
+
+    @staticmethod
+    def response_data(response):
+        try:
+            data = response.json()
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def submit_bulk(self, path, payload, on_done, action):
+        # One request for the whole selection; bcrypt on the server makes large
+        # batches take a few seconds, so it runs off the Tk thread
+        self.dialog.config(cursor='watch')
+
+        def on_success(response):
+            self.dialog.config(cursor='')
+            data = self.response_data(response)
+            if response.status_code in (200, 201) and data.get('success'):
+                on_done(data.get('data', {}), data.get('message', ''))
+                return
+            errors = data.get('data', {}).get('errors') or []
+            details = '\n'.join(f"Row {e['row']} ({e.get('email') or '?'}): {'; '.join(e['errors'])}" for e in errors[:15])
+            if len(errors) > 15:
+                details += f'\n... and {len(errors) - 15} more'
+            message = data.get('message', f'HTTP {response.status_code}')
+            messagebox.showerror('Error', f'{message}\n\n{details}' if details else message, parent=self.dialog)
+
+        def on_error(e):
+            self.dialog.config(cursor='')
+            messagebox.showerror('Error', f'Failed to {action}: {str(e)}', parent=self.dialog)
+
+        self.api_client.submit(lambda: self.auth_manager.post(path, json=payload, timeout=120),
+                               on_success=on_success, on_error=on_error)
+
+    def import_csv(self):
+        path = filedialog.askopenfilename(parent=self.dialog, title='Import users from CSV',
+                                          filetypes=[('CSV files', '*.csv'), ('All files', '*.*')])
+        if not path:
+            return
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                users, errors = parse_user_csv(f.read())
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            messagebox.showerror('Error', f'Failed to read {path}: {e}', parent=self.dialog)
+            return
+        if errors:
+            messagebox.showerror('Invalid CSV', '\n'.join(errors[:15]), parent=self.dialog)
+            return
+        if not users:
+            messagebox.showinfo('Info', 'No users found in the file.', parent=self.dialog)
+            return
+        if not messagebox.askyesno('Confirm', f'Create {len(users)} users from {os.path.basename(path)}?', parent=self.dialog):
+            return
+
+        def on_done(data, message):
+            for user in data.get('users', []):
+                self.upsert_row(user)
+            messagebox.showinfo('Success', message, parent=self.dialog)
+
+        self.submit_bulk('/users/bulk', {'users': users}, on_done, 'create users')
+
+    def set_selected_active(self, is_active):
+        users = self.get_selected_users()
+        if not users:
+            return
+        action = 'activate' if is_active else 'deactivate'
+        if not messagebox.askyesno('Confirm', f'{action.title()} {len(users)} user(s)?', parent=self.dialog):
+            return
+
+        def on_done(data, message):
+            for user in data.get('users', []):
+                self.upsert_row(user)
+
+        self.submit_bulk('/users/bulk/status', {'ids': [user['id'] for user in users], 'is_active': is_active},
+                         on_done, f'{action} users')
+
+    def apply_dialog_result(self, dialog):
+        self.dialog.wait_window(dialog.dialog)
+        if isinstance(dialog.result, dict) and dialog.result.get('id') is not None:
+            self.upsert_row(dialog.result)
+        elif dialog.result:
+            self.load_users()
     
     def add_user(self):
-        dialog = UserDialog(self.dialog, self.auth_manager, None)
-        if dialog.result:
-            self.load_users()
+        self.apply_dialog_result(UserDialog(self.dialog, self.auth_manager, None))
     
     def edit_user(self):
         user = self.get_selected_user()
         if user:
-            dialog = UserDialog(self.dialog, self.auth_manager, user)
-            if dialog.result:
-                self.load_users()
+            self.apply_dialog_result(UserDialog(self.dialog, self.auth_manager, user))
     
     def delete_user(self):
         user = self.get_selected_user()
@@ -279,13 +2832,11 @@ class UserManagementDialog:
         
         if messagebox.askyesno('Confirm Delete', f'Are you sure you want to delete user "{user["email"]}"?'):
             try:
-                response = requests.delete(f'{API_BASE_URL}/users/{user["id"]}',
-                                         headers=self.auth_manager.get_headers(),
-                                         timeout=10)
+                response = self.auth_manager.delete(f'/users/{user["id"]}', timeout=10)
                 
                 if response.status_code == 200:
                     messagebox.showinfo('Success', 'User deleted successfully')
-                    self.load_users()
+                    self.remove_row(user['id'])
                 else:
                     data = response.json() if response.headers.get('content-type') == 'application/json' else {}
                     messagebox.showerror('Error', data.get('message', f'HTTP {response.status_code}'))
@@ -294,28 +2845,39 @@ class UserManagementDialog:
                 messagebox.showerror('Error', f'Failed to delete user: {str(e)}')
     
     def reset_password(self):
-        user = self.get_selected_user()
-        if not user:
+        users = self.get_selected_users()
+        if not users:
             return
         
+        target = users[0]['email'] if len(users) == 1 else f'{len(users)} users'
         new_password = simpledialog.askstring('Reset Password', 
-                                             f'Enter new password for {user["email"]}:',
-                                             show='*')
+                                             f'Enter new password for {target}\n'
+                                             '(leave blank to generate a random password for each user):',
+                                             show='*', parent=self.dialog)
+        if new_password is None:
+            return
+        payload = {'ids': [user['id'] for user in users]}
         if new_password:
-            try:
-                response = requests.post(f'{API_BASE_URL}/users/{user["id"]}/reset-password',
-                                       json={'newPassword': new_password},
-                                       headers=self.auth_manager.get_headers(),
-                                       timeout=10)
-                
-                if response.status_code == 200:
-                    messagebox.showinfo('Success', 'Password reset successfully')
-                else:
-                    data = response.json() if response.headers.get('content-type') == 'application/json' else {}
-                    messagebox.showerror('Error', data.get('message', f'HTTP {response.status_code}'))
-                    
-            except Exception as e:
-                messagebox.showerror('Error', f'Failed to reset password: {str(e)}')
+            payload['newPassword'] = new_password
+
+        def on_done(data, message):
+            generated = [user for user in data.get('users', []) if user.get('password')]
+            if generated:
+                self.show_generated_passwords(generated)
+            else:
+                messagebox.showinfo('Success', message, parent=self.dialog)
+
+        self.submit_bulk('/users/bulk/reset-password', payload, on_done, 'reset passwords')
+
+    def show_generated_passwords(self, users):
+        # The server returns generated passwords once; show them for copying
+        window = tk.Toplevel(self.dialog)
+        window.title('Generated Passwords')
+        window.geometry('500x400')
+        ttk.Label(window, text='Copy these now, they will not be shown again.', padding="10").pack(anchor='w')
+        text = tk.Text(window, wrap='none')
+        text.insert('1.0', 'email,password\n' + ''.join(f"{user['email']},{user['password']}\n" for user in users))
+        text.pack(fill='both', expand=True, padx=10, pady=(0, 10))
 
 class UserDialog:
     def __init__(self, parent, auth_manager, user=None):
@@ -410,14 +2972,11 @@ class UserDialog:
             data['password'] = password
             
             try:
-                response = requests.post(f'{API_BASE_URL}/users',
-                                       json=data,
-                                       headers=self.auth_manager.get_headers(),
-                                       timeout=10)
+                response = self.auth_manager.post('/users', json=data, timeout=10)
                 
                 if response.status_code == 201:
                     messagebox.showinfo('Success', 'User created successfully')
-                    self.result = True
+                    self.result = self.response_user(response)
                     self.dialog.destroy()
                 else:
                     response_data = response.json() if response.headers.get('content-type') == 'application/json' else {}
@@ -429,14 +2988,11 @@ class UserDialog:
             data['is_active'] = self.is_active_var.get()
             
             try:
-                response = requests.put(f'{API_BASE_URL}/users/{self.user["id"]}',
-                                      json=data,
-                                      headers=self.auth_manager.get_headers(),
-                                      timeout=10)
+                response = self.auth_manager.put(f'/users/{self.user["id"]}', json=data, timeout=10)
                 
                 if response.status_code == 200:
                     messagebox.showinfo('Success', 'User updated successfully')
-                    self.result = True
+                    self.result = self.response_user(response)
                     self.dialog.destroy()
                 else:
                     response_data = response.json() if response.headers.get('content-type') == 'application/json' else {}
@@ -445,45 +3001,569 @@ class UserDialog:
             except Exception as e:
                 messagebox.showerror('Error', f'Failed to update user: {str(e)}')
     
-    def center_window(self):
-        self.dialog.update_idletasks()
-        x = (self.dialog.winfo_screenwidth() // 2) - (self.dialog.winfo_width() // 2)
-        y = (self.dialog.winfo_screenheight() // 2) - (self.dialog.winfo_height() // 2)
-        self.dialog.geometry(f'+{x}+{y}')
+    @staticmethod
+    def response_user(response):
+        # The saved user as the server returned it, so the list can patch its row
+        try:
+            return response.json()['data']['user']
+        except (ValueError, KeyError, TypeError):
+            return True
+    
+    def center_window(self):
+        self.dialog.update_idletasks()
+        x = (self.dialog.winfo_screenwidth() // 2) - (self.dialog.winfo_width() // 2)
+        y = (self.dialog.winfo_screenheight() // 2) - (self.dialog.winfo_height() // 2)
+        self.dialog.geometry(f'+{x}+{y}')
+    
+    def cancel(self):
+        self.dialog.destroy()
+
+class BulkOrderDialog:
+    def __init__(self, parent, default_bot):
+        self.parent = parent
+        self.default_bot = default_bot
+        self.create_dialog()
+    
+    def create_dialog(self):
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title('Bulk Add Orders')
+        self.dialog.geometry('700x450')
+        self.dialog.resizable(True, True)
+        self.dialog.transient(self.parent)
+        self.dialog.grab_set()
+        
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.pack(fill='both', expand=True)
+        
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill='x', pady=(0, 5))
+        ttk.Label(top_frame, text='Default bot:').pack(side='left')
+        self.bot_var = tk.StringVar(value=self.default_bot)
+        ttk.Combobox(top_frame, textvariable=self.bot_var, values=list(BOT_CONFIG.keys()),
+                     state='readonly', width=12).pack(side='left', padx=5)
+        ttk.Button(top_frame, text='Import CSV...', command=self.import_csv).pack(side='right')
+        
+        ttk.Label(main_frame, text='Paste CSV rows: Email,Password,URL[,Bot] (a header row with extra columns such as Card, Address is also accepted)').pack(anchor='w')
+        self.text = tk.Text(main_frame, height=15, wrap='none')
+        self.text.pack(fill='both', expand=True, pady=5)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill='x')
+        ttk.Button(button_frame, text='Cancel', command=self.dialog.destroy).pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text='Add Orders', command=self.save).pack(side='right')
+    
+    def import_csv(self):
+        path = filedialog.askopenfilename(parent=self.dialog, title='Import orders CSV',
+                                          filetypes=[('CSV files', '*.csv'), ('All files', '*.*')])
+        if not path:
+            return
+        try:
+            with open(path, encoding='utf-8-sig') as f:
+                content = f.read()
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to read {path}: {e}', parent=self.dialog)
+            return
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', content)
+    
+    def save(self):
+        rows_by_bot, errors = parse_order_batch(self.text.get('1.0', tk.END), self.bot_var.get())
+        if errors:
+            shown = '\n'.join(errors[:15])
+            more = f'\n... and {len(errors) - 15} more' if len(errors) > 15 else ''
+            messagebox.showerror('Validation Error', f'Fix these rows first:\n{shown}{more}', parent=self.dialog)
+            return
+        if not rows_by_bot:
+            messagebox.showwarning('Input Error', 'No rows to add.', parent=self.dialog)
+            return
+        try:
+            results = write_order_batch(rows_by_bot)
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to write orders: {e}', parent=self.dialog)
+            return
+        summary = '\n'.join(
+            f'{BOT_CONFIG[bot]["excel"]}: {added} added, {duplicates} duplicates skipped'
+            for bot, (added, duplicates) in results.items()
+        )
+        messagebox.showinfo('Success', summary, parent=self.dialog)
+        self.dialog.destroy()
+
+class RunStateDialog:
+    def __init__(self, parent, default_bot):
+        self.parent = parent
+        self.entries = {}
+        self.bot_var = tk.StringVar(value=default_bot)
+        self.create_dialog()
+        self.refresh()
+    
+    def create_dialog(self):
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title('Run State')
+        self.dialog.geometry('850x450')
+        self.dialog.resizable(True, True)
+        self.dialog.transient(self.parent)
+        
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.pack(fill='both', expand=True)
+        
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill='x', pady=(0, 5))
+        ttk.Label(top_frame, text='Bot:').pack(side='left')
+        bot_combo = ttk.Combobox(top_frame, textvariable=self.bot_var, values=list(BOT_CONFIG.keys()),
+                                 state='readonly', width=12)
+        bot_combo.pack(side='left', padx=5)
+        bot_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh())
+        ttk.Button(top_frame, text='Refresh', command=self.refresh).pack(side='left', padx=5)
+        self.summary_label = ttk.Label(top_frame, text='', foreground='gray')
+        self.summary_label.pack(side='left', padx=10)
+        
+        ttk.Label(main_frame, text='Completed entries are skipped when the bot is restarted. Reset an entry to buy it again.').pack(anchor='w')
+        
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill='both', expand=True, pady=5)
+        columns = ('Account', 'URL', 'Completed', 'Source')
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
+        for col, width in zip(columns, (200, 380, 140, 90)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width)
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill='x')
+        ttk.Button(button_frame, text='Reset Selected', command=self.reset_selected).pack(side='left', padx=(0, 5))
+        ttk.Button(button_frame, text='Reset All', command=self.reset_all).pack(side='left')
+        ttk.Button(button_frame, text='Close', command=self.dialog.destroy).pack(side='right')
+    
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        self.entries = {}
+        bot = self.bot_var.get()
+        try:
+            entries = RunState(bot).entries()
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to read run state: {e}', parent=self.dialog)
+            return
+        for entry in entries:
+            completed = datetime.fromtimestamp(entry['at']).strftime('%Y-%m-%d %H:%M') if entry['at'] else ''
+            item = self.tree.insert('', 'end', values=(entry['account'], entry['url'], completed, entry['source']))
+            self.entries[item] = entry
+        accounts = len({entry['account'].lower() for entry in entries})
+        self.summary_label.config(text=f'{len(entries)} completed URLs across {accounts} accounts')
+    
+    def reset_selected(self):
+        entries = [self.entries[item] for item in self.tree.selection()]
+        if not entries:
+            messagebox.showwarning('Selection', 'Select entries to reset.', parent=self.dialog)
+            return
+        if not messagebox.askyesno('Confirm', f'Reset {len(entries)} entries? They will be purchased again on the next run.', parent=self.dialog):
+            return
+        try:
+            RunState(self.bot_var.get()).reset(entries)
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to reset run state: {e}', parent=self.dialog)
+        self.refresh()
+    
+    def reset_all(self):
+        bot = self.bot_var.get()
+        if not messagebox.askyesno('Confirm', f'Reset the whole {bot} run state? Every URL will be purchased again on the next run.', parent=self.dialog):
+            return
+        try:
+            RunState(bot).reset_all()
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to reset run state: {e}', parent=self.dialog)
+        self.refresh()
+
+class LogSearchDialog:
+    SOURCES = {'combined.log': COMBINED_LOG_PATH, 'error.log': ERROR_LOG_PATH}
+    TIME_FORMAT = '%Y-%m-%d %H:%M'
+
+    def __init__(self, parent, api_client, log_indexes):
+        self.parent = parent
+        self.api_client = api_client
+        self.log_indexes = log_indexes
+        self.request = None
+        self.create_dialog()
+    
+    def create_dialog(self):
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title('Search Logs')
+        self.dialog.geometry('1000x550')
+        self.dialog.resizable(True, True)
+        self.dialog.protocol('WM_DELETE_WINDOW', self.close)
+        
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.pack(fill='both', expand=True)
+        
+        form = ttk.Frame(main_frame)
+        form.pack(fill='x', pady=(0, 10))
+        
+        self.source_var = tk.StringVar(value='combined.log')
+        self.from_var = tk.StringVar()
+        self.to_var = tk.StringVar()
+        self.level_var = tk.StringVar(value='All')
+        self.bot_var = tk.StringVar(value='All')
+        self.email_var = tk.StringVar()
+        self.text_var = tk.StringVar()
+        
+        ttk.Label(form, text='Log:').grid(row=0, column=0, sticky='w', padx=5, pady=2)
+        ttk.Combobox(form, textvariable=self.source_var, values=list(self.SOURCES), state='readonly', width=14).grid(row=0, column=1, sticky='w', padx=5)
+        ttk.Label(form, text='From (YYYY-MM-DD HH:MM):').grid(row=0, column=2, sticky='w', padx=5)
+        ttk.Entry(form, textvariable=self.from_var, width=18).grid(row=0, column=3, sticky='w', padx=5)
+        ttk.Label(form, text='To:').grid(row=0, column=4, sticky='w', padx=5)
+        ttk.Entry(form, textvariable=self.to_var, width=18).grid(row=0, column=5, sticky='w', padx=5)
+        
+        ttk.Label(form, text='Level:').grid(row=1, column=0, sticky='w', padx=5, pady=2)
+        ttk.Combobox(form, textvariable=self.level_var, values=['All'] + list(LogIndex.LEVELS), state='readonly', width=14).grid(row=1, column=1, sticky='w', padx=5)
+        ttk.Label(form, text='Bot:').grid(row=1, column=2, sticky='w', padx=5)
+        ttk.Combobox(form, textvariable=self.bot_var, values=['All'] + list(BOT_CONFIG), state='readonly', width=15).grid(row=1, column=3, sticky='w', padx=5)
+        ttk.Label(form, text='Account email:').grid(row=1, column=4, sticky='w', padx=5)
+        ttk.Entry(form, textvariable=self.email_var, width=25).grid(row=1, column=5, sticky='w', padx=5)
+        
+        ttk.Label(form, text='Text:').grid(row=2, column=0, sticky='w', padx=5, pady=2)
+        text_entry = ttk.Entry(form, textvariable=self.text_var, width=50)
+        text_entry.grid(row=2, column=1, columnspan=3, sticky='we', padx=5)
+        ttk.Button(form, text='Search', command=self.search).grid(row=2, column=5, sticky='w', padx=5)
+        text_entry.bind('<Return>', lambda e: self.search())
+        
+        self.status_label = ttk.Label(main_frame, text='', foreground='gray')
+        self.status_label.pack(anchor='w')
+        
+        columns = ('Time', 'Level', 'Bot', 'Email', 'Message')
+        self.result_tree = ttk.Treeview(main_frame, columns=columns, show='headings')
+        for col in columns:
+            self.result_tree.heading(col, text=col)
+            self.result_tree.column(col, width=120)
+        self.result_tree.column('Time', width=150)
+        self.result_tree.column('Level', width=60)
+        self.result_tree.column('Message', width=500)
+        scrollbar = ttk.Scrollbar(main_frame, orient='vertical', command=self.result_tree.yview)
+        self.result_tree.configure(yscrollcommand=scrollbar.set)
+        self.result_tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+    
+    def parse_time(self, value):
+        value = value.strip()
+        if not value:
+            return None
+        return datetime.strptime(value, self.TIME_FORMAT).timestamp()
+    
+    def search(self):
+        try:
+            start = self.parse_time(self.from_var.get())
+            end = self.parse_time(self.to_var.get())
+        except ValueError:
+            messagebox.showerror('Error', f'Times must look like {datetime.now().strftime(self.TIME_FORMAT)}', parent=self.dialog)
+            return
+        if end is not None:
+            end += 59.999
+        path = self.SOURCES[self.source_var.get()]
+        if path not in self.log_indexes:
+            self.log_indexes[path] = LogIndex(path)
+        index = self.log_indexes[path]
+        level = self.level_var.get()
+        bot = self.bot_var.get()
+        filters = {
+            'start': start, 'end': end,
+            'level': None if level == 'All' else level,
+            'bot': None if bot == 'All' else bot,
+            'email': self.email_var.get().strip() or None,
+            'text': self.text_var.get() or None,
+        }
+        self.status_label.config(text='Searching...')
+        self.api_client.cancel(self.request)
+        started = time.perf_counter()
+        self.request = self.api_client.submit(
+            lambda: index.query(**filters),
+            on_success=lambda results: self.show_results(results, time.perf_counter() - started),
+            on_error=lambda e: self.status_label.config(text=f'Search failed: {e}')
+        )
+    
+    def show_results(self, results, elapsed):
+        self.request = None
+        self.result_tree.delete(*self.result_tree.get_children())
+        for result in results:
+            self.result_tree.insert('', tk.END, values=(
+                datetime.fromtimestamp(result['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+                result['level'], result['bot'], result['email'],
+                result['entry'].message.replace('\n', ' ')[:500]
+            ))
+        self.status_label.config(text=f'{len(results)} results (newest first) in {elapsed * 1000:.0f} ms')
+    
+    def close(self):
+        self.api_client.cancel(self.request)
+        self.dialog.destroy()
+
+class ProfilerOverlay:
+    # Always-on-top table of the slowest instrumented operations (F12)
+    COLUMNS = ('Operation', 'Calls', 'Mean ms', 'p95 ms', 'Max ms', 'Total ms')
+    REFRESH_MS = 1000
+    ROWS = 20
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.after_id = None
+        self.create_window()
+        self.refresh()
+
+    def create_window(self):
+        self.window = tk.Toplevel(self.parent)
+        self.window.title('Profiler')
+        self.window.geometry('720x360')
+        self.window.attributes('-topmost', True)
+        self.window.protocol('WM_DELETE_WINDOW', self.close)
+
+        main_frame = ttk.Frame(self.window, padding="5")
+        main_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(main_frame, columns=self.COLUMNS, show='headings', height=self.ROWS)
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=300 if col == 'Operation' else 80, anchor='w' if col == 'Operation' else 'e')
+        self.tree.pack(fill='both', expand=True)
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill='x', pady=(5, 0))
+        ttk.Button(button_frame, text='Reset', command=self.reset).pack(side='left')
+        self.cprofile_btn = ttk.Button(button_frame, command=self.toggle_cprofile)
+        self.cprofile_btn.pack(side='left', padx=5)
+        self.dump_btn = ttk.Button(button_frame, text='Dump cProfile', command=self.dump)
+        self.dump_btn.pack(side='left')
+        self.status_label = ttk.Label(button_frame, text='', foreground='gray')
+        self.status_label.pack(side='left', padx=10)
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in profiler.summaries(self.ROWS):
+            self.tree.insert('', 'end', values=(
+                row['name'], row['calls'], f'{row["mean_ms"]:.1f}', f'{row["p95_ms"]:.1f}',
+                f'{row["max_ms"]:.1f}', f'{row["total_ms"]:.0f}'
+            ))
+        running = profiler.cprofile_running
+        self.cprofile_btn.config(text='Stop cProfile' if running else 'Start cProfile')
+        self.dump_btn.config(state='normal' if running else 'disabled')
+        self.after_id = self.window.after(self.REFRESH_MS, self.refresh)
+
+    def reset(self):
+        profiler.reset()
+
+    def toggle_cprofile(self):
+        if profiler.cprofile_running:
+            profiler.stop_cprofile()
+            self.status_label.config(text='cProfile stopped')
+        else:
+            profiler.start_cprofile()
+            self.status_label.config(text='cProfile running on the UI thread')
+
+    def dump(self):
+        try:
+            path = profiler.dump_cprofile()
+        except OSError as e:
+            messagebox.showerror('Error', f'Failed to write profile: {e}', parent=self.window)
+            return
+        self.status_label.config(text=f'Saved {path}')
+
+    def close(self):
+        if self.after_id:
+            self.window.after_cancel(self.after_id)
+        self.window.destroy()
+        self.parent.profiler_overlay = None
+
+class Dashboard(tk.Tk):
+    def __init__(self, startup_hook=None):
+        super().__init__()
+        # The widgets only render what DashboardCore holds; the attributes
+        # below are shortcuts into it.
+        self.core = DashboardCore()
+        self.auth_manager = self.core.auth_manager
+        self.order_log_reader = self.core.order_log_reader
+        self.order_store = self.core.order_store
+        self.supervisor = self.core.supervisor
+        self.sharded_runs = self.core.sharded_runs
+        self.api_client = self.core.api_client
+        self.log_tailer = self.core.log_tailer
+        self.metrics_engine = self.core.metrics_engine
+        self.log_indexes = self.core.log_indexes
+        self.last_order_at = self.core.last_order_at
+        self.title('Auto Buy Bot Dashboard')
+        self.geometry('1000x700')
+        self.resizable(True, True)
+
+        # Paint a skeleton straight away; the API health check and the first
+        # order-log load run on the worker pool and the real widgets replace
+        # the skeleton once the mode is known. startup_hook(step) is told about
+        # 'paint' and 'ready' (used by --benchmark-startup).
+        self.api_mode = False
+        self.startup_hook = startup_hook
+        self.startup_pending = {'widgets', 'orders'}
+        self.orders_loading = True
+        self.order_table = None
+        # Set before destroy() so self-rescheduling after() loops stop
+        self.closing = False
+        self.create_skeleton()
+        self.bind('<Map>', self.on_first_map)
+        self.profiler_overlay = None
+        self.bind('<F12>', lambda e: self.toggle_profiler_overlay())
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        self.poll_api_results()
+        self.api_client.submit(self.core.check_api_server, on_success=self.on_api_checked,
+                               on_error=lambda e: self.on_api_checked(False))
+        self.api_client.submit(self.core.read_orders, on_success=self.on_orders_loaded,
+                               on_error=lambda e: self.on_orders_loaded(None))
+
+    def create_skeleton(self):
+        self.skeleton = ttk.Frame(self, padding="10")
+        self.skeleton.pack(fill='both', expand=True)
+        for title in ('Bot Control', 'Bot Status', 'Purchased Orders'):
+            frame = ttk.LabelFrame(self.skeleton, text=title, padding="10")
+            frame.pack(fill='both', expand=(title == 'Purchased Orders'), pady=(0, 10))
+            ttk.Label(frame, text='Loading...', foreground='gray').pack(anchor='w')
+        ttk.Label(self.skeleton, text='Checking API server...', foreground='gray').pack(anchor='w')
+        progress = ttk.Progressbar(self.skeleton, mode='indeterminate')
+        progress.pack(fill='x', pady=(5, 0))
+        progress.start(10)
+
+    def toggle_profiler_overlay(self):
+        if self.profiler_overlay is None:
+            self.profiler_overlay = ProfilerOverlay(self)
+        else:
+            self.profiler_overlay.close()
+
+    def on_first_map(self, event):
+        if event.widget is self:
+            self.unbind('<Map>')
+            self.report_startup('paint')
+
+    def report_startup(self, step):
+        if self.startup_hook:
+            self.startup_hook(step)
+
+    def startup_step_done(self, step):
+        self.startup_pending.discard(step)
+        if not self.startup_pending:
+            self.report_startup('ready')
+
+    def on_api_checked(self, api_mode):
+        self.api_mode = api_mode
+        # A benchmark run has nobody to type credentials, so it skips the login.
+        # The modal login waits outside the result drain in poll_api_results.
+        if self.api_mode and not self.startup_hook:
+            self.after_idle(self.login_then_show)
+            return
+        self.show_dashboard()
+
+    def login_then_show(self):
+        if self.closing:
+            return
+        logged_in = self.login()
+        if self.closing:
+            # The main window was closed while the login dialog was up
+            return
+        if not logged_in:
+            self.shutdown_window()
+            return
+        self.show_dashboard()
+
+    def show_dashboard(self):
+        self.skeleton.destroy()
+        self.create_widgets()
+        self.refresh_bot_status()
+        if self.order_store.visible_count():
+            self.order_table.refresh()
+        self.core.start_status_stream()
+        self.poll_logs()
+        self.auto_refresh()
+        self.startup_step_done('widgets')
+
+    def on_orders_loaded(self, result):
+        if result is not None:
+            self.core.apply_orders(*result)
+        self.orders_loading = False
+        if self.order_table is not None:
+            self.order_table.refresh()
+            self.refresh_analytics(only_if_visible=True)
+            # Pick up anything appended while the first load was running
+            self.refresh_order_table()
+        self.startup_step_done('orders')
+    
+    def poll_api_results(self):
+        if self.closing:
+            return
+        self.api_client.process_results()
+        if self.closing:
+            # A result callback closed the window
+            return
+        if self.core.poll_supervisor():
+            self.refresh_process_table()
+            self.refresh_shard_table()
+        for event, data in self.core.poll_status_events():
+            self.handle_status_event(event, data)
+        self.after(50, self.poll_api_results)
+    
+    def handle_status_event(self, event, data):
+        # DashboardCore has already recorded the event; this only redraws
+        if event == 'snapshot':
+            self.apply_bot_status(data.get('status', {}))
+        elif data and data.get('botType'):
+            if event == 'order':
+                self.refresh_order_table()
+            self.apply_bot_status({data['botType']: data.get('status', {})})
     
-    def cancel(self):
-        self.dialog.destroy()
+    def open_log_search(self):
+        LogSearchDialog(self, self.api_client, self.log_indexes)
 
-class Dashboard(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.auth_manager = AuthManager()
-        self.title('Auto Buy Bot Dashboard')
-        self.geometry('1000x700')
-        self.resizable(True, True)
+    def log_filters(self):
+        level = self.log_level_var.get()
+        bot = self.log_bot_var.get()
+        return (None if level == 'All' else level), (None if bot == 'All' else bot)
 
-        self.api_mode = self.check_api_server()
-        
-        if self.api_mode:
-            if not self.login():
-                self.destroy()
+    @profiler.timed()
+    def poll_logs(self):
+        entries = self.core.poll_logs()
+        if entries:
+            level, bot = self.log_filters()
+            self.append_log_entries([e for e in entries if LogTailer.entry_matches(e, level, bot)])
+        self.after(1000, self.poll_logs)
+
+    def render_logs(self):
+        level, bot = self.log_filters()
+        self.log_text.configure(state='normal')
+        self.log_text.delete('1.0', tk.END)
+        self.log_text.configure(state='disabled')
+        self.append_log_entries(self.log_tailer.filter(level, bot))
+
+    def append_log_entries(self, entries):
+        if not entries:
+            return
+        at_bottom = self.log_text.yview()[1] >= 0.999
+        self.log_text.configure(state='normal')
+        for entry in entries:
+            self.log_text.insert(tk.END, entry.format() + '\n', entry.level)
+        # Keep the widget no larger than the ring buffer
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > LOG_BUFFER_SIZE:
+            self.log_text.delete('1.0', f'{line_count - LOG_BUFFER_SIZE + 1}.0')
+        self.log_text.configure(state='disabled')
+        if at_bottom:
+            self.log_text.see(tk.END)
+
+    def on_close(self):
+        if self.supervisor.running():
+            if not messagebox.askyesno('Confirm', 'Bots started from this dashboard are still running. Stop them and exit?'):
                 return
-        
-        self.create_widgets()
-        self.refresh_data()
-        self.last_log_mtime = None
-        self.bot_processes = {bot: None for bot in BOT_CONFIG}
-        self.auto_refresh()
-    
-    def check_api_server(self):
-        try:
-            response = requests.get(f'{API_BASE_URL}/../health', timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        if profiler.cprofile_running:
+            print(f'cProfile snapshot written to {profiler.dump_cprofile()}')
+        self.shutdown_window()
+
+    def shutdown_window(self):
+        self.closing = True
+        self.core.shutdown()
+        self.destroy()
     
     def login(self):
-        login_dialog = LoginDialog(self)
+        login_dialog = LoginDialog(self, self.auth_manager)
         self.wait_window(login_dialog.dialog)
         
         if login_dialog.result:
@@ -504,7 +3584,7 @@ class Dashboard(tk.Tk):
         if self.api_mode:
             file_menu.add_command(label='Logout', command=self.logout)
             file_menu.add_separator()
-        file_menu.add_command(label='Exit', command=self.quit)
+        file_menu.add_command(label='Exit', command=self.on_close)
         
         if self.api_mode and self.auth_manager.user and self.auth_manager.user.get('role') == 'admin':
             admin_menu = tk.Menu(menubar, tearoff=0)
@@ -551,6 +3631,41 @@ class Dashboard(tk.Tk):
 
             self.run_btn = ttk.Button(top_frame, text='Run', command=self.run_bot)
             self.run_btn.grid(row=1, column=5, padx=5, pady=5)
+
+            self.bulk_btn = ttk.Button(top_frame, text='Bulk Add...', command=self.open_bulk_orders)
+            self.bulk_btn.grid(row=0, column=6, padx=5, pady=5)
+
+            self.run_state_btn = ttk.Button(top_frame, text='Run State...', command=self.open_run_state)
+            self.run_state_btn.grid(row=0, column=7, padx=5, pady=5)
+
+            self.cache_label = ttk.Label(top_frame, text='', foreground='gray')
+            self.cache_label.grid(row=1, column=6, padx=5, pady=5, sticky='w')
+
+            # Start options, passed to the bot as environment variables
+            launch_frame = ttk.Frame(bot_frame)
+            launch_frame.pack(fill='x', padx=10, pady=(0, 5))
+            ttk.Label(launch_frame, text='Browser pool:').pack(side='left', padx=(5, 5))
+            self.pool_size_var = tk.IntVar(value=1)
+            ttk.Spinbox(launch_frame, from_=1, to=8, textvariable=self.pool_size_var, width=4).pack(side='left')
+            ttk.Label(launch_frame, text='Recycle after:').pack(side='left', padx=(10, 5))
+            self.pool_max_uses_var = tk.IntVar(value=10)
+            ttk.Spinbox(launch_frame, from_=1, to=1000, textvariable=self.pool_max_uses_var, width=5).pack(side='left')
+            ttk.Label(launch_frame, text='accounts').pack(side='left', padx=(5, 10))
+            self.lean_mode_var = tk.BooleanVar(value=False)
+            ttk.Checkbutton(launch_frame, text='Lean mode (block images, fonts, trackers)',
+                            variable=self.lean_mode_var).pack(side='left', padx=(10, 0))
+            self.pool_label = ttk.Label(launch_frame, text='', foreground='gray')
+            self.pool_label.pack(side='left', padx=(10, 0))
+
+            if not self.api_mode:
+                shard_frame = ttk.Frame(bot_frame)
+                shard_frame.pack(fill='x', padx=10)
+                ttk.Label(shard_frame, text='Shards:').pack(side='left', padx=(5, 5))
+                limit = max_shard_count()
+                self.shard_count_var = tk.IntVar(value=min(2, limit))
+                ttk.Spinbox(shard_frame, from_=1, to=limit, textvariable=self.shard_count_var, width=5).pack(side='left')
+                ttk.Label(shard_frame, text=f'(max {limit} for this machine)', foreground='gray').pack(side='left', padx=(5, 10))
+                ttk.Button(shard_frame, text='Run Sharded', command=self.run_sharded).pack(side='left')
             
             if self.api_mode:
                 api_controls = ttk.Frame(bot_frame)
@@ -562,8 +3677,13 @@ class Dashboard(tk.Tk):
                 if self.auth_manager.user and self.auth_manager.user.get('role') in ['admin']:
                     ttk.Button(api_controls, text='Stop All Bots', command=self.stop_all_bots).pack(side='left', padx=(10, 0))
         
-        status_frame = ttk.LabelFrame(main_frame, text='Bot Status', padding="10")
-        status_frame.pack(fill='x', pady=(0, 10))
+        status_row = ttk.Frame(main_frame)
+        status_row.pack(fill='x', pady=(0, 10))
+
+        status_frame = ttk.LabelFrame(status_row, text='Bot Status', padding="10")
+        status_frame.pack(side='left', fill='both', expand=True)
+
+        self.create_metrics_panel(status_row)
         
         self.status_labels = {}
         if self.api_mode:
@@ -580,26 +3700,295 @@ class Dashboard(tk.Tk):
         mid_frame = ttk.LabelFrame(main_frame, text='Purchased Orders')
         mid_frame.pack(padx=10, pady=10, fill='both', expand=True)
         
-        columns = ('Timestamp', 'Platform', 'Product', 'Price', 'Status')
-        self.order_table = ttk.Treeview(mid_frame, columns=columns, show='headings', height=8)
-        for col in columns:
-            self.order_table.heading(col, text=col)
-            self.order_table.column(col, width=120)
-        
-        order_scrollbar = ttk.Scrollbar(mid_frame, orient='vertical', command=self.order_table.yview)
-        self.order_table.configure(yscrollcommand=order_scrollbar.set)
-        
-        self.order_table.pack(side='left', fill='both', expand=True)
-        order_scrollbar.pack(side='right', fill='y')
-
         button_frame = ttk.Frame(mid_frame)
-        button_frame.pack(pady=5, fill='x')
+        button_frame.pack(side='bottom', pady=5, fill='x')
+
+        self.order_table = VirtualOrderTable(mid_frame, self.order_store)
+        self.order_table.pack()
         
         self.clear_log_btn = ttk.Button(button_frame, text='Clear Orders Log', command=self.clear_orders_log)
         self.clear_log_btn.pack(side='left', padx=(0, 5))
         
+        ttk.Button(button_frame, text='Export to Excel', command=self.export_orders_log).pack(side='left', padx=(0, 5))
+        
         ttk.Button(button_frame, text='Refresh', command=self.refresh_data).pack(side='left')
 
+        self.order_search_var = tk.StringVar()
+        self.order_search_var.trace_add('write', lambda *args: self.order_table.search(self.order_search_var.get()))
+        ttk.Entry(button_frame, textvariable=self.order_search_var, width=25).pack(side='right')
+        ttk.Label(button_frame, text='Search:').pack(side='right', padx=(0, 5))
+
+        self.bottom_tabs = ttk.Notebook(main_frame)
+        self.bottom_tabs.pack(padx=10, pady=(0, 10), fill='both', expand=True)
+
+        log_frame = ttk.Frame(self.bottom_tabs)
+        self.bottom_tabs.add(log_frame, text='Logs')
+
+        log_toolbar = ttk.Frame(log_frame)
+        log_toolbar.pack(fill='x', pady=(5, 0))
+
+        ttk.Label(log_toolbar, text='Level:').pack(side='left', padx=(5, 2))
+        self.log_level_var = tk.StringVar(value='All')
+        log_level_combo = ttk.Combobox(log_toolbar, textvariable=self.log_level_var,
+                                       values=['All'] + LOG_LEVELS, state='readonly', width=8)
+        log_level_combo.pack(side='left')
+        log_level_combo.bind('<<ComboboxSelected>>', lambda e: self.render_logs())
+
+        ttk.Label(log_toolbar, text='Bot:').pack(side='left', padx=(10, 2))
+        self.log_bot_var = tk.StringVar(value='All')
+        log_bot_combo = ttk.Combobox(log_toolbar, textvariable=self.log_bot_var,
+                                     values=['All'] + list(BOT_CONFIG.keys()), state='readonly', width=12)
+        log_bot_combo.pack(side='left')
+        log_bot_combo.bind('<<ComboboxSelected>>', lambda e: self.render_logs())
+
+        ttk.Button(log_toolbar, text='Search History...', command=self.open_log_search).pack(side='right', padx=5)
+
+        self.log_text = tk.Text(log_frame, height=8, wrap='none', state='disabled')
+        log_scrollbar = ttk.Scrollbar(log_frame, orient='vertical', command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=log_scrollbar.set)
+        self.log_text.tag_configure('error', foreground='red')
+        self.log_text.tag_configure('warn', foreground='orange')
+        self.log_text.pack(side='left', fill='both', expand=True)
+        log_scrollbar.pack(side='right', fill='y')
+
+        self.create_analytics_panel()
+        self.create_selector_panel()
+        self.create_proxy_panel()
+        self.bottom_tabs.bind('<<NotebookTabChanged>>', lambda e: self.on_bottom_tab_changed())
+        if not self.api_mode:
+            self.create_process_panel()
+            self.create_shard_panel()
+
+    def on_bottom_tab_changed(self):
+        self.refresh_analytics(only_if_visible=True)
+        self.refresh_selector_stats(only_if_visible=True)
+        self.refresh_proxy_scores(only_if_visible=True)
+
+    def create_analytics_panel(self):
+        self.analytics_frame = ttk.Frame(self.bottom_tabs)
+        self.bottom_tabs.add(self.analytics_frame, text='Analytics')
+
+        toolbar = ttk.Frame(self.analytics_frame)
+        toolbar.pack(fill='x', pady=(5, 0))
+        self.analytics_group_var = tk.StringVar(value='Platform')
+        self.analytics_period_var = tk.StringVar(value='Today')
+        self.analytics_platform_var = tk.StringVar(value='All')
+        for label, var, values, width in (('Group by:', self.analytics_group_var, OrderRollups.GROUPS, 9),
+                                          ('Period:', self.analytics_period_var, OrderRollups.PERIODS, 9),
+                                          ('Platform:', self.analytics_platform_var, ['All'] + list(BOT_CONFIG.keys()), 12)):
+            ttk.Label(toolbar, text=label).pack(side='left', padx=(5, 2))
+            combo = ttk.Combobox(toolbar, textvariable=var, values=list(values), state='readonly', width=width)
+            combo.pack(side='left', padx=(0, 5))
+            combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_analytics())
+        self.analytics_note = ttk.Label(toolbar, text='', foreground='gray')
+        self.analytics_note.pack(side='right', padx=5)
+
+        columns = ('Key', 'Orders', 'Purchased', 'Success %', 'Spend', 'Avg Price')
+        self.analytics_table = ttk.Treeview(self.analytics_frame, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.analytics_table.heading(col, text=col)
+            self.analytics_table.column(col, width=90, anchor='e' if col != 'Key' else 'w')
+        self.analytics_table.column('Key', width=320)
+        self.analytics_table.pack(side='left', fill='both', expand=True)
+        scrollbar = ttk.Scrollbar(self.analytics_frame, orient='vertical', command=self.analytics_table.yview)
+        self.analytics_table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+
+    def refresh_analytics(self, only_if_visible=False):
+        if not hasattr(self, 'analytics_table'):
+            return
+        if only_if_visible and self.bottom_tabs.select() != str(self.analytics_frame):
+            return
+        group = self.analytics_group_var.get()
+        platform = self.analytics_platform_var.get()
+        rows = self.core.order_analytics(group, self.analytics_period_var.get(),
+                                         None if platform == 'All' else platform)
+        # Products can run into the thousands; the rollups are sorted by spend
+        shown = rows[:500]
+        self.analytics_note.config(text='Product totals are all time' if group == 'Product' else '')
+
+        def money(value):
+            return '' if value is None else f'¥{value:,.0f}'
+
+        self.analytics_table.delete(*self.analytics_table.get_children())
+        for key, summary in shown:
+            rate = summary['success_rate']
+            self.analytics_table.insert('', tk.END, values=(
+                key, summary['orders'], summary['purchased'],
+                '' if rate is None else f'{rate * 100:.1f}',
+                money(summary['spend']), money(summary['avg_price'])
+            ))
+
+    def create_selector_panel(self):
+        self.selector_frame = ttk.Frame(self.bottom_tabs)
+        self.bottom_tabs.add(self.selector_frame, text='Selectors')
+
+        columns = ('Platform', 'Field', 'Learned Selector', 'Hits', 'Misses', 'Failures', 'Hit %')
+        self.selector_table = ttk.Treeview(self.selector_frame, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.selector_table.heading(col, text=col)
+            self.selector_table.column(col, width=80, anchor='e' if col in ('Hits', 'Misses', 'Failures', 'Hit %') else 'w')
+        self.selector_table.column('Learned Selector', width=320)
+        self.selector_table.pack(side='left', fill='both', expand=True)
+        scrollbar = ttk.Scrollbar(self.selector_frame, orient='vertical', command=self.selector_table.yview)
+        self.selector_table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+
+    def refresh_selector_stats(self, only_if_visible=False):
+        if not hasattr(self, 'selector_table'):
+            return
+        if only_if_visible and self.bottom_tabs.select() != str(self.selector_frame):
+            return
+        self.selector_table.delete(*self.selector_table.get_children())
+        for platform, field, entry in read_selector_stats():
+            hits, misses, failures = (entry.get(key, 0) for key in ('hits', 'misses', 'failures'))
+            lookups = hits + misses + failures
+            self.selector_table.insert('', tk.END, values=(
+                platform, field, entry.get('selector') or '', hits, misses, failures,
+                f'{hits * 100 / lookups:.1f}' if lookups else ''
+            ))
+
+    def create_proxy_panel(self):
+        self.proxy_frame = ttk.Frame(self.bottom_tabs)
+        self.bottom_tabs.add(self.proxy_frame, text='Proxies')
+
+        toolbar = ttk.Frame(self.proxy_frame)
+        toolbar.pack(fill='x', pady=(5, 0))
+        self.proxy_probe_btn = ttk.Button(toolbar, text='Probe Now', command=self.probe_proxies)
+        self.proxy_probe_btn.pack(side='left', padx=5)
+        self.proxy_note = ttk.Label(toolbar, text='', foreground='gray')
+        self.proxy_note.pack(side='left', padx=5)
+
+        table_frame = ttk.Frame(self.proxy_frame)
+        table_frame.pack(fill='both', expand=True)
+        columns = ('Proxy', 'State', 'Latency ms', 'Error %', 'Pick %', 'OK', 'Failed', 'Last Probe', 'Last Error')
+        self.proxy_table = ttk.Treeview(table_frame, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.proxy_table.heading(col, text=col)
+            self.proxy_table.column(col, width=75, anchor='e' if col in ('Latency ms', 'Error %', 'Pick %', 'OK', 'Failed') else 'w')
+        self.proxy_table.column('Proxy', width=220)
+        self.proxy_table.column('State', width=130)
+        self.proxy_table.column('Last Error', width=200)
+        self.proxy_table.pack(side='left', fill='both', expand=True)
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.proxy_table.yview)
+        self.proxy_table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+
+    def refresh_proxy_scores(self, only_if_visible=False):
+        if not hasattr(self, 'proxy_table'):
+            return
+        if only_if_visible and self.bottom_tabs.select() != str(self.proxy_frame):
+            return
+        updated, entries = read_proxy_scores()
+        now = time.time()
+
+        def clock(value):
+            timestamp = parse_iso_timestamp(value)
+            return datetime.fromtimestamp(timestamp).strftime('%H:%M:%S') if timestamp else ''
+
+        self.proxy_table.delete(*self.proxy_table.get_children())
+        for entry in entries:
+            until = parse_iso_timestamp(entry.get('quarantinedUntil'))
+            if until and until > now:
+                state = f'Quarantined to {clock(entry["quarantinedUntil"])}'
+            elif entry.get('lastProbeAt'):
+                state = 'Healthy'
+            else:
+                state = 'Not probed'
+            name = entry.get('server', '')
+            if entry.get('username'):
+                name = f'{entry["username"]}@{name}'
+            latency = entry.get('latencyMs')
+            self.proxy_table.insert('', tk.END, values=(
+                name, state, '' if latency is None else f'{latency:.0f}',
+                f'{(entry.get("errorRate") or 0) * 100:.0f}', f'{(entry.get("share") or 0) * 100:.1f}',
+                entry.get('successes', 0), entry.get('failures', 0), clock(entry.get('lastProbeAt')),
+                entry.get('lastError') or ''
+            ))
+        self.proxy_note.config(text=f'Scores saved {datetime.fromtimestamp(updated).strftime("%H:%M:%S")}' if updated
+                               else 'No scores yet: bots probe their proxies on start, or use Probe Now')
+
+    def probe_proxies(self):
+        self.proxy_probe_btn.config(state='disabled')
+        self.proxy_note.config(text='Probing proxies...')
+
+        def done(error=None):
+            self.proxy_probe_btn.config(state='normal')
+            self.refresh_proxy_scores()
+            if error is not None:
+                messagebox.showerror('Error', f'Failed to probe proxies: {error}')
+
+        self.api_client.submit(run_proxy_probe, on_success=lambda _: done(), on_error=done, key='proxy-probe')
+
+    def create_metrics_panel(self, parent):
+        metrics_frame = ttk.LabelFrame(parent, text='Metrics', padding="5")
+        metrics_frame.pack(side='left', fill='both', expand=True, padx=(10, 0))
+
+        toolbar = ttk.Frame(metrics_frame)
+        toolbar.pack(fill='x')
+        ttk.Label(toolbar, text='Window:').pack(side='left')
+        self.metrics_window_var = tk.StringVar(value='5m')
+        window_combo = ttk.Combobox(toolbar, textvariable=self.metrics_window_var,
+                                    values=list(RollingMetrics.WINDOWS), state='readonly', width=5)
+        window_combo.pack(side='left', padx=5)
+        window_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_metrics())
+
+        columns = ('Platform', 'Orders', 'Orders/min', 'Attempts', 'Fail %', 'p50 (s)', 'p95 (s)', 'p99 (s)')
+        self.metrics_table = ttk.Treeview(metrics_frame, columns=columns, show='headings', height=4)
+        for col in columns:
+            self.metrics_table.heading(col, text=col)
+            self.metrics_table.column(col, width=70, anchor='e' if col != 'Platform' else 'w')
+        self.metrics_table.column('Platform', width=90)
+        self.metrics_table.pack(fill='both', expand=True)
+
+    def refresh_metrics(self):
+        def fmt(value, pattern='{:.1f}'):
+            return '' if value is None else pattern.format(value)
+
+        self.metrics_table.delete(*self.metrics_table.get_children())
+        for platform, summary in self.core.metric_summaries(self.metrics_window_var.get()).items():
+            self.metrics_table.insert('', tk.END, values=(
+                platform, summary['orders'], fmt(summary['orders_per_min'], '{:.2f}'), summary['attempts'],
+                fmt(summary['failure_rate'] * 100 if summary['failure_rate'] is not None else None),
+                fmt(summary['p50']), fmt(summary['p95']), fmt(summary['p99'])
+            ))
+
+    def create_shard_panel(self):
+        shard_frame = ttk.Frame(self.bottom_tabs)
+        self.bottom_tabs.add(shard_frame, text='Shards')
+        columns = ('Shard', 'Bot', 'PID', 'Accounts', 'Processed', 'Orders', 'Status')
+        self.shard_table = ttk.Treeview(shard_frame, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.shard_table.heading(col, text=col)
+            self.shard_table.column(col, width=90)
+        self.shard_table.column('Status', width=220)
+        self.shard_table.pack(fill='both', expand=True)
+
+    def create_process_panel(self):
+        process_frame = ttk.Frame(self.bottom_tabs)
+        self.bottom_tabs.add(process_frame, text='Processes')
+
+        process_toolbar = ttk.Frame(process_frame)
+        process_toolbar.pack(fill='x', pady=(5, 0))
+        ttk.Button(process_toolbar, text='Stop', command=self.stop_selected_instances).pack(side='left', padx=(5, 5))
+        ttk.Button(process_toolbar, text='Restart', command=self.restart_selected_instances).pack(side='left', padx=(0, 5))
+        ttk.Button(process_toolbar, text='Show Output', command=self.show_instance_output).pack(side='left', padx=(0, 5))
+        self.restart_on_crash_var = tk.BooleanVar(value=self.supervisor.restart_on_crash)
+        ttk.Checkbutton(process_toolbar, text='Restart on crash', variable=self.restart_on_crash_var,
+                        command=lambda: setattr(self.supervisor, 'restart_on_crash', self.restart_on_crash_var.get())
+                        ).pack(side='left', padx=(10, 0))
+
+        columns = ('ID', 'Bot', 'PID', 'Status', 'Restarts', 'Last Output')
+        self.process_table = ttk.Treeview(process_frame, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.process_table.heading(col, text=col)
+            self.process_table.column(col, width=70 if col in ('ID', 'PID', 'Restarts') else 110)
+        self.process_table.column('Last Output', width=400)
+        self.process_table.pack(side='left', fill='both', expand=True)
+        process_scrollbar = ttk.Scrollbar(process_frame, orient='vertical', command=self.process_table.yview)
+        self.process_table.configure(yscrollcommand=process_scrollbar.set)
+        process_scrollbar.pack(side='right', fill='y')
+
     def can_run_bots(self):
         if not self.api_mode:
             return True
@@ -607,40 +3996,50 @@ class Dashboard(tk.Tk):
         return role in ['admin', 'staff']
     
     def open_user_management(self):
-        UserManagementDialog(self, self.auth_manager)
+        UserManagementDialog(self, self.auth_manager, self.api_client)
     
     def logout(self):
-        try:
-            requests.post(f'{API_BASE_URL}/auth/logout', 
-                         headers=self.auth_manager.get_headers(), 
-                         timeout=5)
-        except:
-            pass
+        def finish(_=None):
+            self.auth_manager.clear_credentials()
+            messagebox.showinfo('Logout', 'Logged out successfully')
+            self.on_close()
         
-        self.auth_manager.clear_credentials()
-        messagebox.showinfo('Logout', 'Logged out successfully')
-        self.destroy()
+        self.api_client.submit(
+            lambda: self.auth_manager.post('/auth/logout', timeout=5),
+            on_success=finish,
+            on_error=finish
+        )
+    
+    def post_bot_action(self, path, success_message, error_prefix, payload=None):
+        def on_success(response):
+            if response.status_code == 200:
+                messagebox.showinfo('Success', success_message)
+                self.refresh_bot_status()
+            else:
+                data = response.json() if response.headers.get('content-type') == 'application/json' else {}
+                messagebox.showerror('Error', data.get('message', f'HTTP {response.status_code}'))
+        
+        self.api_client.submit(
+            lambda: self.auth_manager.post(path, json=payload, timeout=10),
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror('Error', f'{error_prefix}: {str(e)}')
+        )
     
     def start_bot(self):
         if not self.can_run_bots():
             messagebox.showerror('Permission Denied', 'You do not have permission to run bots')
             return
         
-        bot_type = self.bot_var.get().lower()
         try:
-            response = requests.post(f'{API_BASE_URL}/bots/{bot_type}/start',
-                                   headers=self.auth_manager.get_headers(),
-                                   timeout=10)
-            
-            if response.status_code == 200:
-                messagebox.showinfo('Success', f'{bot_type.title()} bot started successfully')
-                self.refresh_bot_status()
-            else:
-                data = response.json() if response.headers.get('content-type') == 'application/json' else {}
-                messagebox.showerror('Error', data.get('message', f'HTTP {response.status_code}'))
-                
-        except Exception as e:
-            messagebox.showerror('Error', f'Failed to start bot: {str(e)}')
+            options = self.launch_options()
+        except (tk.TclError, ValueError):
+            messagebox.showwarning('Input Error', 'Browser pool settings must be numbers.')
+            return
+        bot_type = self.bot_var.get().lower()
+        self.post_bot_action(f'/bots/{bot_type}/start',
+                             f'{bot_type.title()} bot started successfully',
+                             'Failed to start bot',
+                             payload=options)
     
     def stop_bot(self):
         if not self.can_run_bots():
@@ -648,20 +4047,9 @@ class Dashboard(tk.Tk):
             return
         
         bot_type = self.bot_var.get().lower()
-        try:
-            response = requests.post(f'{API_BASE_URL}/bots/{bot_type}/stop',
-                                   headers=self.auth_manager.get_headers(),
-                                   timeout=10)
-            
-            if response.status_code == 200:
-                messagebox.showinfo('Success', f'{bot_type.title()} bot stopped successfully')
-                self.refresh_bot_status()
-            else:
-                data = response.json() if response.headers.get('content-type') == 'application/json' else {}
-                messagebox.showerror('Error', data.get('message', f'HTTP {response.status_code}'))
-                
-        except Exception as e:
-            messagebox.showerror('Error', f'Failed to stop bot: {str(e)}')
+        self.post_bot_action(f'/bots/{bot_type}/stop',
+                             f'{bot_type.title()} bot stopped successfully',
+                             'Failed to stop bot')
     
     def stop_all_bots(self):
         if not self.auth_manager.user or self.auth_manager.user.get('role') != 'admin':
@@ -669,21 +4057,11 @@ class Dashboard(tk.Tk):
             return
         
         if messagebox.askyesno('Confirm', 'Are you sure you want to stop all bots?'):
-            try:
-                response = requests.post(f'{API_BASE_URL}/bots/stop-all',
-                                       headers=self.auth_manager.get_headers(),
-                                       timeout=10)
-                
-                if response.status_code == 200:
-                    messagebox.showinfo('Success', 'All bots stopped successfully')
-                    self.refresh_bot_status()
-                else:
-                    data = response.json() if response.headers.get('content-type') == 'application/json' else {}
-                    messagebox.showerror('Error', data.get('message', f'HTTP {response.status_code}'))
-                    
-            except Exception as e:
-                messagebox.showerror('Error', f'Failed to stop all bots: {str(e)}')
+            self.post_bot_action('/bots/stop-all',
+                                 'All bots stopped successfully',
+                                 'Failed to stop all bots')
 
+    @profiler.timed()
     def add_order(self):
         bot = self.bot_var.get()
         email = self.email_entry.get().strip()
@@ -693,80 +4071,88 @@ class Dashboard(tk.Tk):
         if not (email and password and url):
             messagebox.showwarning('Input Error', 'Please fill all fields.')
             return
-        # Write to Excel (append or create)
-        row = {'Email': email, 'Password': password, 'URL': url}
-        if os.path.exists(excel_path):
-            df = pd.read_excel(excel_path)
-            df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-        else:
-            df = pd.DataFrame([row])
-        df.to_excel(excel_path, index=False)
+        added, duplicates = write_order_batch({bot: [{'Email': email, 'Password': password, 'URL': url}]})[bot]
+        if duplicates:
+            messagebox.showwarning('Duplicate', f'{email} is already queued for this URL in {excel_path}')
+            return
         messagebox.showinfo('Success', f'Order added to {excel_path}')
         self.email_entry.delete(0, tk.END)
         self.password_entry.delete(0, tk.END)
         self.url_entry.delete(0, tk.END)
         self.refresh_order_table()
 
+    def open_bulk_orders(self):
+        BulkOrderDialog(self, self.bot_var.get())
+
+    def open_run_state(self):
+        RunStateDialog(self, self.bot_var.get())
+
+    @profiler.timed()
     def refresh_order_table(self):
-        # Clear table
-        for row in self.order_table.get_children():
-            self.order_table.delete(row)
-        # Load order log
-        if os.path.exists(ORDER_LOG_PATH):
-            try:
-                df = pd.read_excel(ORDER_LOG_PATH)
-                for _, row in df.iterrows():
-                    ts = row.get('Timestamp', '')
-                    # Format timestamp nếu có
-                    if pd.notnull(ts):
-                        try:
-                            ts = pd.to_datetime(ts)
-                            ts = ts.strftime('%Y-%m-%d %H:%M:%S')
-                        except Exception:
-                            ts = str(ts)
-                    self.order_table.insert('', tk.END, values=(
-                        ts, 
-                        row.get('Platform', 'Unknown'),
-                        row.get('Product', ''), 
-                        row.get('Price', ''), 
-                        row.get('Status', '')
-                    ))
-            except Exception as e:
-                pass
+        if self.orders_loading or self.order_table is None:
+            return
+        follow = self.order_table.is_at_end()
+        _, changed = self.core.poll_orders()
+        if not changed:
+            return
+        self.refresh_analytics(only_if_visible=True)
+        if follow and not self.order_store.sort_column:
+            self.order_table.scroll_to_end()
+        else:
+            self.order_table.refresh()
 
+    @profiler.timed()
     def refresh_bot_status(self):
         if self.api_mode:
-            try:
-                response = requests.get(f'{API_BASE_URL}/bots/status',
-                                      headers=self.auth_manager.get_headers(),
-                                      timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('success'):
-                        status_data = data['data']['status']
-                        for bot_type, status in status_data.items():
-                            if bot_type in self.status_labels:
-                                if status['running']:
-                                    self.status_labels[bot_type].config(
-                                        text=f'{bot_type.title()}: Running (PID: {status.get("pid", "N/A")})', 
-                                        foreground='green'
-                                    )
-                                else:
-                                    self.status_labels[bot_type].config(
-                                        text=f'{bot_type.title()}: Stopped', 
-                                        foreground='red'
-                                    )
-                                    
-            except Exception as e:
-                for bot_type in self.status_labels:
-                    self.status_labels[bot_type].config(
-                        text=f'{bot_type.title()}: Unknown', 
-                        foreground='orange'
-                    )
+            self.core.request_bot_status(on_status=self.apply_bot_status,
+                                         on_error=lambda e: self.set_bot_status_unknown())
         else:
-            for bot, lbl in self.status_labels.items():
-                lbl.config(text=f'{bot}: Waiting', foreground='blue')
+            # Local mode: the supervisor knows what is running
+            self.refresh_process_table()
+
+    @profiler.timed()
+    def apply_bot_status(self, status_data):
+        for bot_type, status in status_data.items():
+            if bot_type not in self.status_labels:
+                continue
+            order_note = f', last order {self.last_order_at[bot_type]}' if bot_type in self.last_order_at else ''
+            if status.get('running'):
+                self.status_labels[bot_type].config(
+                    text=f'{bot_type.title()}: Running (PID: {status.get("pid", "N/A")}{order_note})', 
+                    foreground='green'
+                )
+            else:
+                self.status_labels[bot_type].config(
+                    text=f'{bot_type.title()}: Stopped{order_note}', 
+                    foreground='red'
+                )
+
+    def set_bot_status_unknown(self):
+        for bot_type in self.status_labels:
+            self.status_labels[bot_type].config(
+                text=f'{bot_type.title()}: Unknown', 
+                foreground='orange'
+            )
+
+    def launch_options(self):
+        return {
+            'poolSize': max(1, min(int(self.pool_size_var.get()), 8)),
+            'poolMaxUses': max(1, min(int(self.pool_max_uses_var.get()), 1000)),
+            'leanMode': bool(self.lean_mode_var.get()),
+        }
+
+    def launch_env(self):
+        # Local-mode counterpart of the start options routes/bots.js accepts
+        options = self.launch_options()
+        return {'BROWSER_POOL_SIZE': str(options['poolSize']),
+                'BROWSER_POOL_MAX_USES': str(options['poolMaxUses']),
+                'LEAN_MODE': '1' if options['leanMode'] else '0'}
+
+    def refresh_browser_pools(self):
+        if not hasattr(self, 'pool_label'):
+            return
+        pools = read_browser_pools()
+        self.pool_label.config(text=' | '.join(map(format_browser_pool, pools)) if pools else 'No warm browser pools')
 
     def run_bot(self):
         bot = self.bot_var.get()
@@ -774,65 +4160,479 @@ class Dashboard(tk.Tk):
         if not os.path.exists(bat_file):
             messagebox.showerror('Error', f'Batch file not found: {bat_file}')
             return
-        confirm = messagebox.askyesno('Confirm', f'Run {bat_file}?')
+        running = len(self.supervisor.running(bot))
+        try:
+            env = self.launch_env()
+        except (tk.TclError, ValueError):
+            messagebox.showwarning('Input Error', 'Browser pool settings must be numbers.')
+            return
+        prompt = f'Run {bat_file}?' if not running else f'{running} {bot} instance(s) already running. Start another {bat_file}?'
+        confirm = messagebox.askyesno('Confirm', prompt)
         if confirm:
             try:
-                if sys.platform == "win32":
-                    proc = subprocess.Popen([bat_file], shell=True, creationflags=subprocess.CREATE_NO_WINDOW)
-                else:
-                    proc = subprocess.Popen(['sh', bat_file])
-                self.bot_processes[bot] = proc
-                if bot.lower() in self.status_labels:
-                    self.status_labels[bot.lower()].config(text=f'{bot}: Running', foreground='green')
-                elif bot in self.status_labels:
-                    self.status_labels[bot].config(text=f'{bot}: Running', foreground='green')
+                self.supervisor.start(bot, env=env)
+                self.refresh_process_table()
                 self.refresh_order_table()
             except Exception as e:
                 messagebox.showerror('Error', f'Failed to run {bat_file}: {e}')
 
-    def auto_refresh(self):
+    def run_sharded(self):
+        bot = self.bot_var.get()
+        excel_path = BOT_CONFIG[bot]['excel']
+        if not os.path.exists(excel_path):
+            messagebox.showerror('Error', f'Workbook not found: {excel_path}')
+            return
         try:
-            if os.path.exists(ORDER_LOG_PATH):
-                mtime = os.path.getmtime(ORDER_LOG_PATH)
-                if self.last_log_mtime != mtime:
-                    self.last_log_mtime = mtime
-                    self.refresh_order_table()
-        except Exception:
-            pass
-        
-        if not self.api_mode:
-            for bot, proc in self.bot_processes.items():
-                if proc is not None:
-                    if proc.poll() is not None:  # Process đã kết thúc
-                        if bot.lower() in self.status_labels:
-                            self.status_labels[bot.lower()].config(text=f'{bot}: Waiting', foreground='blue')
-                        elif bot in self.status_labels:
-                            self.status_labels[bot].config(text=f'{bot}: Waiting', foreground='blue')
-                        self.bot_processes[bot] = None
+            requested = int(self.shard_count_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showwarning('Input Error', 'Shard count must be a number.')
+            return
+        shard_count = max(1, min(requested, max_shard_count()))
+        if any(run.bot == bot and run.active for run in self.sharded_runs):
+            messagebox.showwarning('Warning', f'A sharded {bot} run is still active. '
+                                              'Stop its shards before starting another.')
+            return
+        try:
+            env = self.launch_env()
+        except (tk.TclError, ValueError):
+            messagebox.showwarning('Input Error', 'Browser pool settings must be numbers.')
+            return
+        try:
+            account_count = len(workbook_cache.read(excel_path))
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to read {excel_path}: {e}')
+            return
+        if not account_count:
+            messagebox.showinfo('Info', f'{excel_path} has no accounts.')
+            return
+        shard_count = min(shard_count, account_count)
+        if not messagebox.askyesno('Confirm', f'Run {bot} as {shard_count} parallel processes '
+                                              f'({account_count} accounts)?'):
+            return
+        # Only split once confirmed, into a directory of this launch's own
+        try:
+            shards = partition_workbook(bot, shard_count, new_shard_dir(bot))
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to split {excel_path}: {e}')
+            return
+        run = ShardedRun(bot)
+        script = BOT_CONFIG[bot]['script']
+        try:
+            for path, accounts in shards:
+                instance = self.supervisor.start(bot, command=['node', script, '--excel', path], env=env)
+                run.add_shard(instance, path, accounts)
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to start shard: {e}')
+        self.sharded_runs.append(run)
+        self.refresh_process_table()
+        self.refresh_shard_table()
+        self.bottom_tabs.select(self.shard_table.master)
+
+    def refresh_shard_table(self):
+        if not hasattr(self, 'shard_table'):
+            return
+        self.shard_table.delete(*self.shard_table.get_children())
+        for run_index, run in enumerate(self.sharded_runs, start=1):
+            for shard_index, shard in enumerate(run.shards.values(), start=1):
+                instance = shard['instance']
+                self.shard_table.insert('', tk.END, values=(
+                    f'{run_index}.{shard_index}', run.bot, instance.pid or '', shard['accounts'],
+                    shard['processed'], shard['orders'], instance.status
+                ))
+            totals = run.totals()
+            self.shard_table.insert('', tk.END, values=(
+                f'{run_index} total', run.bot, '', totals['accounts'], totals['processed'],
+                totals['orders'], f"{totals['running']}/{len(run.shards)} running"
+            ))
+
+    def set_local_status(self, bot, text, color):
+        if bot.lower() in self.status_labels:
+            self.status_labels[bot.lower()].config(text=text, foreground=color)
+        elif bot in self.status_labels:
+            self.status_labels[bot].config(text=text, foreground=color)
+
+    def refresh_process_table(self):
+        for bot in BOT_CONFIG:
+            count = len(self.supervisor.running(bot))
+            if count:
+                self.set_local_status(bot, f'{bot}: Running ({count})', 'green')
+            else:
+                self.set_local_status(bot, f'{bot}: Waiting', 'blue')
+        if not hasattr(self, 'process_table'):
+            return
+        selection = set(self.process_table.selection())
+        self.process_table.delete(*self.process_table.get_children())
+        for instance in self.supervisor.instances.values():
+            iid = str(instance.id)
+            self.process_table.insert('', tk.END, iid=iid, values=(
+                instance.id, instance.bot, instance.pid or '', instance.status,
+                instance.restarts, instance.last_line[:200]
+            ))
+            if iid in selection:
+                self.process_table.selection_add(iid)
+
+    def selected_instance_ids(self):
+        return [int(iid) for iid in self.process_table.selection()]
+
+    def stop_selected_instances(self):
+        for instance_id in self.selected_instance_ids():
+            self.supervisor.stop(instance_id)
+        self.refresh_process_table()
+
+    def restart_selected_instances(self):
+        for instance_id in self.selected_instance_ids():
+            instance = self.supervisor.instances.get(instance_id)
+            if instance is None:
+                continue
+            if instance.running:
+                # Relaunch once the graceful stop has gone through
+                self.supervisor.stop(instance_id)
+                instance.restart_at = time.monotonic() + 1
+                instance.stopping = True
+            else:
+                self.supervisor.restart(instance_id)
+        self.refresh_process_table()
+
+    def show_instance_output(self):
+        for instance_id in self.selected_instance_ids()[:1]:
+            instance = self.supervisor.instances.get(instance_id)
+            if instance is None:
+                continue
+            window = tk.Toplevel(self)
+            window.title(f'{instance.bot} #{instance.id} output')
+            window.geometry('800x400')
+            text = tk.Text(window, wrap='none')
+            text.insert('1.0', '\n'.join(instance.output))
+            text.configure(state='disabled')
+            text.pack(fill='both', expand=True)
+            text.see(tk.END)
+
+    def refresh_cache_stats(self):
+        if not hasattr(self, 'cache_label'):
+            return
+        stats = workbook_cache.stats()
+        self.cache_label.config(text=f"Workbook cache: {stats['hits']} hits / {stats['misses']} misses")
+
+    def auto_refresh(self):
+        self.refresh_cache_stats()
+        self.refresh_browser_pools()
+        self.refresh_metrics()
+        if self.core.order_log_changed():
+            self.refresh_order_table()
         else:
+            # "Today" and "Last 24h" move with the clock even without new orders
+            self.refresh_analytics(only_if_visible=True)
+        self.refresh_selector_stats(only_if_visible=True)
+        self.refresh_proxy_scores(only_if_visible=True)
+        if self.core.status_poll_due():
             self.refresh_bot_status()
-            
-        refresh_interval = 30000 if self.api_mode else 5000
-        self.after(refresh_interval, self.auto_refresh)
+        self.after(5000, self.auto_refresh)
 
     def clear_orders_log(self):
         if not os.path.exists(ORDER_LOG_PATH):
             messagebox.showinfo('Info', 'No orders log to clear.')
             return
-        confirm = messagebox.askyesno('Confirm', 'Are you sure you want to delete all purchased orders log?')
+        confirm = messagebox.askyesno(
+            'Confirm',
+            'Are you sure you want to delete all purchased orders log?\n\n'
+            'Run State also reads purchases from this log. Purchases that are only '
+            'recorded here will no longer be skipped when an unfinished run resumes, '
+            'and may be bought again.'
+        )
         if confirm:
             try:
                 os.remove(ORDER_LOG_PATH)
-                self.refresh_order_table()
+                self.core.clear_orders()
+                self.order_table.refresh()
+                self.refresh_analytics()
                 messagebox.showinfo('Success', 'Orders log cleared.')
             except Exception as e:
                 messagebox.showerror('Error', f'Failed to clear orders log: {e}')
     
+    def export_orders_log(self):
+        if not os.path.exists(ORDER_LOG_PATH):
+            messagebox.showinfo('Info', 'No orders log to export.')
+            return
+        xlsx_path = filedialog.asksaveasfilename(
+            title='Export orders log',
+            defaultextension='.xlsx',
+            initialfile='order_log.xlsx',
+            filetypes=[('Excel files', '*.xlsx')]
+        )
+        if not xlsx_path:
+            return
+        try:
+            count = OrderLogReader(ORDER_LOG_PATH).export_xlsx(xlsx_path)
+            messagebox.showinfo('Success', f'Exported {count} orders to {xlsx_path}')
+        except Exception as e:
+            messagebox.showerror('Error', f'Failed to export orders log: {e}')
+    
     def refresh_data(self):
         self.refresh_bot_status()
         self.refresh_order_table()
 
+class MonitorClient(tk.Tk):
+    # Thin viewer for one or more headless dashboards (--attach URL ...). It
+    # keeps no bot state of its own: every refresh is one GET /status per host.
+    REFRESH_MS = 5000
+
+    def __init__(self, urls):
+        super().__init__()
+        self.urls = [url.rstrip('/') for url in urls]
+        self.api_client = ApiClient()
+        self.session = requests.Session()
+        self.title('Auto Buy Bot Monitor')
+        self.geometry('900x400')
+        self.create_widgets()
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        self.poll_api_results()
+        self.auto_refresh()
+
+    def create_widgets(self):
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill='both', expand=True)
+
+        toolbar = ttk.Frame(main_frame)
+        toolbar.pack(fill='x', pady=(0, 5))
+        ttk.Label(toolbar, text='Window:').pack(side='left')
+        self.window_var = tk.StringVar(value='5m')
+        window_combo = ttk.Combobox(toolbar, textvariable=self.window_var,
+                                    values=list(RollingMetrics.WINDOWS), state='readonly', width=5)
+        window_combo.pack(side='left', padx=5)
+        window_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh())
+        ttk.Button(toolbar, text='Refresh', command=self.refresh).pack(side='left')
+
+        columns = ('Bot', 'State', 'Orders', 'Orders/min', 'p95 (s)', 'Updated')
+        self.table = ttk.Treeview(main_frame, columns=columns, show='tree headings')
+        self.table.heading('#0', text='Host')
+        self.table.column('#0', width=220)
+        for col in columns:
+            self.table.heading(col, text=col)
+            self.table.column(col, width=100)
+        self.table.pack(fill='both', expand=True)
+        for url in self.urls:
+            self.table.insert('', tk.END, iid=url, text=url, open=True,
+                              values=('', 'Connecting...', '', '', '', ''))
+
+    def poll_api_results(self):
+        self.api_client.process_results()
+        self.after(50, self.poll_api_results)
+
+    def auto_refresh(self):
+        self.refresh()
+        self.after(self.REFRESH_MS, self.auto_refresh)
+
+    def refresh(self):
+        window = self.window_var.get()
+        for url in self.urls:
+            self.api_client.submit(
+                lambda url=url: self.fetch_status(url, window),
+                on_success=lambda data, url=url: self.render_host(url, data),
+                on_error=lambda e, url=url: self.set_host_unreachable(url, e),
+                key=f'monitor/{url}'
+            )
+
+    def fetch_status(self, url, window):
+        response = self.session.get(f'{url}/status', params={'window': window}, timeout=5)
+        response.raise_for_status()
+        return response.json()['data']
+
+    @staticmethod
+    def lookup(mapping, name):
+        # API status keys are lowercase ('biccamera'), metrics use the bot name ('BicCamera')
+        for key, value in mapping.items():
+            if key.lower() == name.lower():
+                return value
+        return None
+
+    def render_host(self, url, snapshot):
+        updated = datetime.now().strftime('%H:%M:%S')
+        orders = snapshot.get('orders', {})
+        metrics = snapshot.get('metrics', {})
+        running = sum(1 for status in snapshot.get('bots', {}).values() if status.get('running'))
+        self.table.item(url, text=f"{snapshot.get('host', url)} ({url})", values=(
+            '', f"{snapshot.get('mode', '')}: {running} running", orders.get('total', 0), '', '', updated
+        ))
+        self.table.delete(*self.table.get_children(url))
+        for bot, status in sorted(snapshot.get('bots', {}).items()):
+            summary = self.lookup(metrics, bot) or {}
+            if status.get('running'):
+                state = f"Running ({status['instances']})" if status.get('instances', 1) > 1 else 'Running'
+            else:
+                state = 'Stopped'
+            if status.get('last_order_at'):
+                state += f", last order {status['last_order_at']}"
+            rate, p95 = summary.get('orders_per_min'), summary.get('p95')
+            self.table.insert(url, tk.END, values=(
+                bot.title(), state, self.lookup(orders.get('by_platform', {}), bot) or 0,
+                '' if rate is None else f'{rate:.2f}', '' if p95 is None else f'{p95:.1f}', updated
+            ))
+
+    def set_host_unreachable(self, url, error):
+        values = list(self.table.item(url, 'values'))
+        values[1] = f'Unreachable: {error.__class__.__name__}'
+        self.table.item(url, values=values)
+
+    def on_close(self):
+        self.api_client.shutdown()
+        self.session.close()
+        self.destroy()
+
+def run_headless(host, port):
+    # The Dashboard's polling without a window, for servers with no display.
+    # Status, order counts and metrics are served by DashboardService.
+    core = DashboardCore()
+    if core.check_api_server():
+        email = os.environ.get('DASHBOARD_EMAIL')
+        password = os.environ.get('DASHBOARD_PASSWORD')
+        if not (email and password and core.login(email, password)):
+            print('API server is running: set DASHBOARD_EMAIL and DASHBOARD_PASSWORD to a valid account', file=sys.stderr)
+            core.shutdown()
+            return 1
+    try:
+        service = DashboardService(core, host, port)
+    except OSError as e:
+        print(f'Cannot listen on {host}:{port}: {e}', file=sys.stderr)
+        core.shutdown()
+        return 1
+
+    stop = Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *args: stop.set())
+
+    service.start()
+    print(f"Dashboard service ({'api' if core.api_mode else 'local'} mode) listening on {service.address}")
+    core.start_status_stream()
+    if core.api_mode:
+        core.request_bot_status()
+    next_refresh = 0
+    try:
+        while not stop.is_set():
+            core.api_client.process_results()
+            core.poll_supervisor()
+            core.poll_status_events()
+            core.poll_logs()
+            if time.monotonic() >= next_refresh:
+                next_refresh = time.monotonic() + 5
+                if core.order_log_changed():
+                    core.poll_orders()
+                if core.status_poll_due():
+                    core.request_bot_status()
+            stop.wait(0.5)
+    finally:
+        service.stop()
+        core.shutdown()
+        if profiler.cprofile_running:
+            print(f'cProfile snapshot written to {profiler.dump_cprofile()}')
+    return 0
+
+def benchmark_order_refresh(row_counts=(1000, 10000, 100000)):
+    # Times the non-GUI half of refresh_order_table (index + parse + format +
+    # store append) on synthetic logs, for a full load and a 100-row append.
+    print(f'{"rows":>8} {"full load (s)":>14} {"rows/s":>12} {"append 100 (s)":>15}')
+    for count in row_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'order_log.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                for i in range(count):
+                    f.write(json.dumps({
+                        'Timestamp': f'2025-06-16T09:{(i // 60) % 60:02d}:{i % 60:02d}.000Z',
+                        'Platform': 'Rakuten',
+                        'Product': f'Product {i}',
+                        'Price': f'¥{1000 + i:,}',
+                        'Status': 'Purchased'
+                    }) + '\n')
+            reader = OrderLogReader(path)
+            store = OrderStore()
+            start = time.perf_counter()
+            _, rows = reader.read_new_rows()
+            store.append_rows(build_order_rows(rows))
+            full = time.perf_counter() - start
+
+            with open(path, 'a', encoding='utf-8') as f:
+                for i in range(100):
+                    f.write(json.dumps({'Timestamp': '2025-06-16T10:00:00.000Z', 'Platform': 'Rakuten',
+                                        'Product': f'New {i}', 'Price': '¥1', 'Status': 'Purchased'}) + '\n')
+            start = time.perf_counter()
+            _, rows = reader.read_new_rows()
+            store.append_rows(build_order_rows(rows))
+            append = time.perf_counter() - start
+            print(f'{count:>8} {full:>14.3f} {count / full:>12,.0f} {append:>15.4f}')
+
+def benchmark_startup(runs=5):
+    # Starts the dashboard in a fresh interpreter each run and times, from the
+    # spawn, the first paint of the window and the point where the API check
+    # and first order-log load are done. Needs a display.
+    print(f'{"run":>4} {"first paint (s)":>16} {"ready (s)":>10}')
+    results = {'paint': [], 'ready': []}
+    for run in range(1, runs + 1):
+        with tempfile.TemporaryFile(mode='w+') as errors:
+            start = time.perf_counter()
+            proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--startup-probe'],
+                                    stdout=subprocess.PIPE, stderr=errors, text=True)
+            times = {}
+            for line in proc.stdout:
+                times[line.strip()] = time.perf_counter() - start
+            proc.wait()
+            if 'paint' not in times or 'ready' not in times:
+                errors.seek(0)
+                lines = errors.read().strip().splitlines() or ['no output']
+                print(f'Startup probe failed (exit code {proc.returncode}): {lines[-1]}')
+                return
+        for step in results:
+            results[step].append(times[step])
+        print(f'{run:>4} {times["paint"]:>16.3f} {times["ready"]:>10.3f}')
+    paint, ready = (sorted(values)[len(values) // 2] for values in results.values())
+    print(f'{"median":>4} {paint:>16.3f} {ready:>10.3f}')
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Auto Buy Bot Dashboard')
+    parser.add_argument('--benchmark-orders', action='store_true',
+                        help='benchmark order table refresh time against row count and exit')
+    parser.add_argument('--benchmark-startup', action='store_true',
+                        help='benchmark time to first paint and to loaded data, then exit')
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--headless', action='store_true',
+                        help='run without a window and serve status/metrics as JSON over HTTP')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address for the --headless HTTP endpoint (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DashboardService.DEFAULT_PORT,
+                        help=f'port for the --headless HTTP endpoint (default: {DashboardService.DEFAULT_PORT})')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='run cProfile on the UI thread; dump snapshots from the F12 profiler overlay and on exit')
+    parser.add_argument('--attach', action='append', metavar='URL',
+                        help='open a monitor window for a headless dashboard; repeat for several hosts')
+    args = parser.parse_args()
+
+    if args.cprofile:
+        profiler.start_cprofile()
+
+    if args.benchmark_orders:
+        benchmark_order_refresh()
+        sys.exit(0)
+
+    if args.benchmark_startup:
+        benchmark_startup()
+        sys.exit(0)
+
+    if args.startup_probe:
+        # Child process of --benchmark-startup: report each step and quit when ready
+        def report(step):
+            print(step, flush=True)
+            if step == 'ready':
+                app.after(0, app.on_close)
+
+        app = Dashboard(startup_hook=report)
+        app.mainloop()
+        sys.exit(0)
+
+    if args.headless:
+        sys.exit(run_headless(args.host, args.port))
+
+    if args.attach:
+        MonitorClient(args.attach).mainloop()
+        sys.exit(0)
+
     app = Dashboard()
     if app.winfo_exists():
         app.mainloop()
\ No newline at end of file
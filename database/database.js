@@ -3,11 +3,17 @@ const path = require('path');
 const fs = require('fs');
 const logger = require('../config/logger');
 
+// How long a write waits for another connection's transaction to commit
+const BUSY_TIMEOUT_MS = 10000;
+
 class Database {
     constructor() {
         this.dbPath = path.join(__dirname, '..', 'data', 'app.db');
         this.ensureDirectoryExists();
         this.db = null;
+        // Bulk transactions run on their own connection, see transaction()
+        this.transactionDb = null;
+        this.transactionQueue = Promise.resolve();
         this.init();
     }
 
@@ -27,6 +33,15 @@ class Database {
             logger.info('Connected to SQLite database');
             this.createTables();
         });
+        this.db.configure('busyTimeout', BUSY_TIMEOUT_MS);
+    }
+
+    getTransactionDb() {
+        if (!this.transactionDb) {
+            this.transactionDb = new sqlite3.Database(this.dbPath);
+            this.transactionDb.configure('busyTimeout', BUSY_TIMEOUT_MS);
+        }
+        return this.transactionDb;
     }
 
     createTables() {
@@ -203,7 +218,63 @@ class Database {
         return this.db;
     }
 
+    run(sql, params = [], connection = this.db) {
+        return new Promise((resolve, reject) => {
+            connection.run(sql, params, function(err) {
+                if (err) {
+                    reject(err);
+                } else {
+                    resolve({ changes: this.changes, lastID: this.lastID });
+                }
+            });
+        });
+    }
+
+    all(sql, params = [], connection = this.db) {
+        return new Promise((resolve, reject) => {
+            connection.all(sql, params, (err, rows) => {
+                if (err) {
+                    reject(err);
+                } else {
+                    resolve(rows);
+                }
+            });
+        });
+    }
+
+    transaction(work) {
+        // Runs on a dedicated connection, so writes made through the shared one
+        // (logins, refresh tokens, User.save) can never land inside the batch
+        // and be rolled back with it: they wait on busyTimeout until COMMIT.
+        // Transactions are queued because they share that one connection.
+        // work() gets an object with run()/all() bound to the connection.
+        const result = this.transactionQueue.then(async () => {
+            const connection = this.getTransactionDb();
+            const tx = {
+                run: (sql, params) => this.run(sql, params, connection),
+                all: (sql, params) => this.all(sql, params, connection)
+            };
+            await tx.run('BEGIN IMMEDIATE');
+            try {
+                const value = await work(tx);
+                await tx.run('COMMIT');
+                return value;
+            } catch (error) {
+                await tx.run('ROLLBACK').catch(rollbackError => {
+                    logger.error('Error rolling back transaction:', rollbackError.message);
+                });
+                throw error;
+            }
+        });
+        this.transactionQueue = result.catch(() => {});
+        return result;
+    }
+
     close() {
+        if (this.transactionDb) {
+            this.transactionDb.close();
+            this.transactionDb = null;
+        }
         if (this.db) {
             this.db.close((err) => {
                 if (err) {
@@ -3,6 +3,14 @@ const bcrypt = require('bcrypt');
 const validator = require('validator');
 const logger = require('../config/logger');
 
+const SORTABLE_COLUMNS = ['id', 'email', 'role', 'first_name', 'last_name', 'created_at', 'updated_at', 'last_login'];
+
+// Bumped on every write to the users table, so list endpoints can answer a
+// conditional GET without querying. bootId keeps ETags from a previous server
+// process from matching after a restart.
+let revision = 0;
+const bootId = Date.now().toString(36);
+
 class User {
     constructor(data = {}) {
         this.id = data.id;
@@ -82,6 +90,7 @@ class User {
                         logger.error('Error updating user:', err.message);
                         reject(err);
                     } else {
+                        User.touch();
                         resolve(this.changes > 0);
                     }
                 });
@@ -107,6 +116,7 @@ class User {
                         logger.error('Error creating user:', err.message);
                         reject(err);
                     } else {
+                        User.touch();
                         resolve(this.lastID);
                     }
                 });
@@ -148,25 +158,117 @@ class User {
         });
     }
 
-    static async findAll(options = {}) {
-        const db = database.getDb();
-        const { role, isActive = true, limit = 100, offset = 0 } = options;
-        
-        let sql = 'SELECT * FROM users WHERE 1=1';
+    static touch() {
+        revision += 1;
+    }
+
+    static get revision() {
+        return `${bootId}-${revision}`;
+    }
+
+    static buildFilter(options = {}) {
+        const { role, isActive = true, search } = options;
+
+        let sql = ' WHERE 1=1';
         const params = [];
-        
+
         if (role) {
             sql += ' AND role = ?';
             params.push(role);
         }
-        
+
         if (isActive !== null) {
             sql += ' AND is_active = ?';
             params.push(isActive ? 1 : 0);
         }
+
+        if (search) {
+            const pattern = `%${search.replace(/[\\%_]/g, '\\$&')}%`;
+            sql += " AND (email LIKE ? ESCAPE '\\' OR first_name LIKE ? ESCAPE '\\' OR last_name LIKE ? ESCAPE '\\')";
+            params.push(pattern, pattern, pattern);
+        }
+
+        return { sql, params };
+    }
+
+    static async findByIds(ids) {
+        if (ids.length === 0) {
+            return [];
+        }
+        const placeholders = ids.map(() => '?').join(', ');
+        const rows = await database.all(`SELECT * FROM users WHERE id IN (${placeholders}) ORDER BY id`, ids);
+        return rows.map(row => new User(row));
+    }
+
+    static async findExistingEmails(emails) {
+        // Any status: the UNIQUE constraint also covers deactivated users
+        if (emails.length === 0) {
+            return [];
+        }
+        const placeholders = emails.map(() => '?').join(', ');
+        const rows = await database.all(`SELECT email FROM users WHERE email IN (${placeholders})`, emails);
+        return rows.map(row => row.email);
+    }
+
+    static async bulkCreate(users) {
+        // Callers validate first. Passwords are hashed in parallel outside the
+        // transaction, then every row is inserted in one transaction.
+        await Promise.all(users.map(user => user.hashPassword()));
+        const ids = await database.transaction(async (db) => {
+            const created = [];
+            for (const user of users) {
+                const result = await db.run(`
+                    INSERT INTO users (email, password, role, first_name, last_name, is_active)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                `, [user.email, user.password, user.role, user.first_name, user.last_name, user.is_active]);
+                created.push(result.lastID);
+            }
+            return created;
+        });
+        User.touch();
+        return ids;
+    }
+
+    static async setActive(ids, isActive) {
+        const placeholders = ids.map(() => '?').join(', ');
+        const changes = await database.transaction(async (db) => {
+            const result = await db.run(`
+                UPDATE users SET is_active = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id IN (${placeholders})
+            `, [isActive ? 1 : 0, ...ids]);
+            if (!isActive) {
+                await db.run(`DELETE FROM sessions WHERE user_id IN (${placeholders})`, ids);
+            }
+            return result.changes;
+        });
+        User.touch();
+        return changes;
+    }
+
+    static async setPasswords(entries) {
+        // entries: [{ id, password }]; also signs the users out everywhere
+        const hashes = await Promise.all(entries.map(entry => bcrypt.hash(entry.password, 12)));
+        const ids = entries.map(entry => entry.id);
+        const placeholders = ids.map(() => '?').join(', ');
+        await database.transaction(async (db) => {
+            for (let i = 0; i < entries.length; i++) {
+                await db.run('UPDATE users SET password = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                    [hashes[i], ids[i]]);
+            }
+            await db.run(`DELETE FROM sessions WHERE user_id IN (${placeholders})`, ids);
+        });
+        User.touch();
+    }
+
+    static async findAll(options = {}) {
+        const db = database.getDb();
+        const { limit = 100, offset = 0, sortBy = 'created_at', sortOrder = 'desc' } = options;
         
-        sql += ' ORDER BY created_at DESC LIMIT ? OFFSET ?';
-        params.push(limit, offset);
+        const filter = User.buildFilter(options);
+        const column = SORTABLE_COLUMNS.includes(sortBy) ? sortBy : 'created_at';
+        const direction = String(sortOrder).toLowerCase() === 'asc' ? 'ASC' : 'DESC';
+        const sql = `SELECT * FROM users${filter.sql} ORDER BY ${column} ${direction}, id ${direction} LIMIT ? OFFSET ?`;
+        const params = [...filter.params, limit, offset];
         
         return new Promise((resolve, reject) => {
             db.all(sql, params, (err, rows) => {
@@ -182,20 +284,9 @@ class User {
 
     static async count(options = {}) {
         const db = database.getDb();
-        const { role, isActive = true } = options;
-        
-        let sql = 'SELECT COUNT(*) as count FROM users WHERE 1=1';
-        const params = [];
-        
-        if (role) {
-            sql += ' AND role = ?';
-            params.push(role);
-        }
-        
-        if (isActive !== null) {
-            sql += ' AND is_active = ?';
-            params.push(isActive ? 1 : 0);
-        }
+        const filter = User.buildFilter(options);
+        const sql = `SELECT COUNT(*) as count FROM users${filter.sql}`;
+        const params = filter.params;
         
         return new Promise((resolve, reject) => {
             db.get(sql, params, (err, row) => {
@@ -220,6 +311,7 @@ class User {
                     logger.error('Error deleting user:', err.message);
                     reject(err);
                 } else {
+                    User.touch();
                     resolve(this.changes > 0);
                 }
             });
@@ -237,6 +329,7 @@ class User {
                     logger.error('Error updating last login:', err.message);
                     reject(err);
                 } else {
+                    User.touch();
                     resolve(this.changes > 0);
                 }
             });
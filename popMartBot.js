@@ -6,23 +6,33 @@ const ProductService = require('./services/popMart/productService');
 const CheckoutService = require('./services/popMart/checkoutService');
 const { chromium } = require('playwright');
 const ProxyManager = require('./config/proxyManager');
+const LeanMode = require('./utils/leanMode');
 
 class PopMartBot extends BaseBot {
     constructor(config) {
         super(config);
+        this.cdpBrowser = null;
     }
 
     async initialize() {
         // await super.initialize();
-        const browser = await chromium.connectOverCDP('http://localhost:9222');
+        // One CDP connection per process, shared by every account's context
+        if (!this.cdpBrowser || !this.cdpBrowser.isConnected()) {
+            this.cdpBrowser = await chromium.connectOverCDP('http://localhost:9222');
+        }
+        const browser = this.cdpBrowser;
 
-        const proxyManager = new ProxyManager();
+        const proxyManager = ProxyManager.shared();
         const proxyServer = proxyManager.getRandomProxy();
 
         // this.context = browser.contexts()[0] || await browser.newContext();
         this.context = await browser.newContext({
-            proxy: proxyServer || undefined
+            proxy: proxyServer || undefined,
+            serviceWorkers: this.leanMode ? 'block' : 'allow'
         });
+        if (this.leanMode) {
+            await this.leanMode.attach(this.context);
+        }
         this.page = await this.context.newPage();
         
         // Initialize Yodobashi-specific services
@@ -44,6 +54,15 @@ class PopMartBot extends BaseBot {
         }
         await this.checkoutService.checkout(account.Card, account.Address);
     }
+
+    async close() {
+        if (this.cdpBrowser) {
+            // Disconnects and drops the contexts we created; the attached Chrome keeps running
+            await this.cdpBrowser.close().catch(error => logger.warn('Failed to disconnect CDP browser:', error));
+            this.cdpBrowser = null;
+        }
+        await super.close();
+    }
 }
 
 // CLI setup
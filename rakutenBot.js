@@ -22,6 +22,7 @@ class RakutenBot extends BaseBot {
     async monitorProducts(account, productUrls) {
         // Split URLs by comma and trim whitespace
         const urls = productUrls.split(',').map(url => url.trim());
+        const carted = [];
         
         for (const url of urls) {
             const productInfo = await this.productService.checkProduct(url);
@@ -29,27 +30,36 @@ class RakutenBot extends BaseBot {
                 logger.info(`Product is available: ${productInfo.name}`);
                 const addedToCart = await this.checkoutService.addToCart();
                 if (addedToCart) {
-                    this.excelManager.logOrder(productInfo);
+                    carted.push({ url, productInfo });
                 }
             } else {
                 logger.info(`Product not available or check failed for URL: ${url}`);
             }
         }
 
-        await this.checkoutService.checkout(account.Card, account.Address, account.Password, account.YYYYMMDD);
+        if (carted.length === 0) {
+            return;
+        }
+        const checkedOut = await this.checkoutService.checkout(account.Card, account.Address, account.Password, account.YYYYMMDD);
+        if (!checkedOut) {
+            // Leave the URLs pending so the next run retries them
+            logger.warn(`Checkout failed for ${account.Email}; ${carted.length} carted items not recorded as purchased`);
+            return;
+        }
+        await this.recordPurchases(account, carted);
     }
 }
 
-// CLI setup
-program
-    .version('1.0.0')
-    .option('-e, --excel <path>', 'Path to Excel configuration file')
-    .parse(process.argv);
-
-const options = program.opts();
-
 // Main execution
 async function main() {
+    // CLI setup
+    program
+        .version('1.0.0')
+        .option('-e, --excel <path>', 'Path to Excel configuration file')
+        .parse(process.argv);
+
+    const options = program.opts();
+
     if (!options.excel) {
         logger.error('Error: Excel file path is required');
         console.log('Usage: node rakutenBot.js --excel <path>');
@@ -71,4 +81,8 @@ async function main() {
     }
 }
 
-main(); 
\ No newline at end of file
+if (require.main === module) {
+    main();
+}
+
+module.exports = RakutenBot; 
\ No newline at end of file
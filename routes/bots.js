@@ -4,19 +4,50 @@ const rateLimit = require('express-rate-limit');
 const logger = require('../config/logger');
 const { spawn } = require('child_process');
 const path = require('path');
+const EventEmitter = require('events');
 
 const router = express.Router();
 
+const STREAM_PATH = '/status/stream';
+const MAX_STREAMS_PER_USER = 5;
+
 const generalLimiter = rateLimit({
     windowMs: 15 * 60 * 1000,
     max: 50,
     standardHeaders: true,
     legacyHeaders: false,
+    // Reconnects after a network blip would burn the budget and push the
+    // dashboard back to polling; streams are capped by limitStreams instead
+    skip: (req) => req.path === STREAM_PATH,
 });
 
 router.use(authenticate);
 router.use(generalLimiter);
 
+// Open /status/stream connections per user
+const openStreams = new Map();
+
+const limitStreams = (req, res, next) => {
+    const key = req.user.id || req.user.email;
+    const open = openStreams.get(key) || 0;
+    if (open >= MAX_STREAMS_PER_USER) {
+        return res.status(429).json({
+            success: false,
+            message: 'Too many open status streams'
+        });
+    }
+    openStreams.set(key, open + 1);
+    req.on('close', () => {
+        const remaining = (openStreams.get(key) || 1) - 1;
+        if (remaining > 0) {
+            openStreams.set(key, remaining);
+        } else {
+            openStreams.delete(key);
+        }
+    });
+    next();
+};
+
 const BOT_CONFIG = {
     'yodobashi': {
         script: 'yodobashiBot.js',
@@ -42,19 +73,73 @@ const BOT_CONFIG = {
 
 let runningBots = {};
 
+// Bot lifecycle events pushed to /status/stream subscribers
+const botEvents = new EventEmitter();
+botEvents.setMaxListeners(0);
+
+const ORDER_SUCCESS_MARKER = 'Order logged successfully';
+const STREAM_HEARTBEAT_MS = 15000;
+
+// Optional start options, handed to the bot process as environment variables
+const LAUNCH_OPTIONS = {
+    poolSize: { env: 'BROWSER_POOL_SIZE', min: 1, max: 8 },
+    poolMaxUses: { env: 'BROWSER_POOL_MAX_USES', min: 1, max: 1000 },
+    leanMode: { env: 'LEAN_MODE', boolean: true }
+};
+
+const getLaunchEnv = (body = {}) => {
+    const env = {};
+    for (const [name, option] of Object.entries(LAUNCH_OPTIONS)) {
+        if (body[name] === undefined || body[name] === null) {
+            continue;
+        }
+        if (option.boolean) {
+            if (typeof body[name] !== 'boolean') {
+                throw new Error(`${name} must be true or false`);
+            }
+            env[option.env] = body[name] ? '1' : '0';
+            continue;
+        }
+        const value = Number(body[name]);
+        if (!Number.isInteger(value) || value < option.min || value > option.max) {
+            throw new Error(`${name} must be an integer between ${option.min} and ${option.max}`);
+        }
+        env[option.env] = String(value);
+    }
+    return env;
+};
+
+const getBotStatus = (botType) => {
+    const process = runningBots[botType];
+    return {
+        name: BOT_CONFIG[botType].name,
+        running: !!process && !process.killed,
+        pid: process ? process.pid : null,
+        startTime: process ? process.startTime : null
+    };
+};
+
+const getAllBotStatus = () => {
+    const status = {};
+    Object.keys(BOT_CONFIG).forEach(botType => {
+        status[botType] = getBotStatus(botType);
+    });
+    return status;
+};
+
+const emitBotEvent = (event, botType, extra = {}) => {
+    botEvents.emit('bot', {
+        event,
+        botType,
+        status: getBotStatus(botType),
+        timestamp: new Date().toISOString(),
+        ...extra
+    });
+};
+
 router.get('/status', staffOrAdmin, (req, res) => {
     try {
-        const status = {};
-        
-        Object.keys(BOT_CONFIG).forEach(botType => {
-            const process = runningBots[botType];
-            status[botType] = {
-                name: BOT_CONFIG[botType].name,
-                running: !!process && !process.killed,
-                pid: process ? process.pid : null,
-                startTime: process ? process.startTime : null
-            };
-        });
+        const status = getAllBotStatus();
 
         res.json({
             success: true,
@@ -70,6 +155,32 @@ router.get('/status', staffOrAdmin, (req, res) => {
     }
 });
 
+router.get(STREAM_PATH, staffOrAdmin, limitStreams, (req, res) => {
+    res.set({
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no'
+    });
+    res.flushHeaders();
+
+    const send = (event, data) => {
+        res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+    };
+
+    send('snapshot', { status: getAllBotStatus(), timestamp: new Date().toISOString() });
+
+    const onBotEvent = (payload) => send(payload.event, payload);
+    botEvents.on('bot', onBotEvent);
+
+    const heartbeat = setInterval(() => res.write(': ping\n\n'), STREAM_HEARTBEAT_MS);
+
+    req.on('close', () => {
+        clearInterval(heartbeat);
+        botEvents.off('bot', onBotEvent);
+    });
+});
+
 router.post('/:botType/start', authorize('bots', 'run'), (req, res) => {
     try {
         const { botType } = req.params;
@@ -88,13 +199,24 @@ router.post('/:botType/start', authorize('bots', 'run'), (req, res) => {
             });
         }
 
+        let launchEnv;
+        try {
+            launchEnv = getLaunchEnv(req.body);
+        } catch (error) {
+            return res.status(400).json({
+                success: false,
+                message: error.message
+            });
+        }
+
         const config = BOT_CONFIG[botType];
         const scriptPath = path.join(process.cwd(), config.script);
         const excelPath = path.join(process.cwd(), config.excel);
 
         const botProcess = spawn('node', [scriptPath, '--excel', excelPath], {
             detached: false,
-            stdio: ['pipe', 'pipe', 'pipe']
+            stdio: ['pipe', 'pipe', 'pipe'],
+            env: { ...process.env, ...launchEnv }
         });
 
         botProcess.startTime = new Date().toISOString();
@@ -102,16 +224,31 @@ router.post('/:botType/start', authorize('bots', 'run'), (req, res) => {
 
         botProcess.on('exit', (code, signal) => {
             logger.info(`${config.name} exited with code ${code}, signal ${signal}`);
-            delete runningBots[botType];
+            if (runningBots[botType] === botProcess) {
+                delete runningBots[botType];
+            }
+            emitBotEvent('exit', botType, { pid: botProcess.pid, code, signal });
         });
 
         botProcess.on('error', (error) => {
             logger.error(`${config.name} error:`, error.message);
-            delete runningBots[botType];
+            if (runningBots[botType] === botProcess) {
+                delete runningBots[botType];
+            }
+            emitBotEvent('exit', botType, { pid: botProcess.pid, error: error.message });
         });
 
+        // Chunks can end mid-line, so only complete lines are checked for the marker
+        let stdoutTail = '';
         botProcess.stdout.on('data', (data) => {
             logger.info(`${config.name} stdout: ${data}`);
+            const lines = (stdoutTail + data.toString()).split('\n');
+            stdoutTail = lines.pop();
+            for (const line of lines) {
+                if (line.includes(ORDER_SUCCESS_MARKER)) {
+                    emitBotEvent('order', botType, { pid: botProcess.pid });
+                }
+            }
         });
 
         botProcess.stderr.on('data', (data) => {
@@ -119,6 +256,7 @@ router.post('/:botType/start', authorize('bots', 'run'), (req, res) => {
         });
 
         logger.info(`${config.name} started by ${req.user.email} (PID: ${botProcess.pid})`);
+        emitBotEvent('start', botType);
 
         res.json({
             success: true,
@@ -167,6 +305,7 @@ router.post('/:botType/stop', authorize('bots', 'stop'), (req, res) => {
         }, 10000);
 
         delete runningBots[botType];
+        emitBotEvent('stop', botType, { pid: botProcess.pid });
 
         logger.info(`${BOT_CONFIG[botType].name} stopped by ${req.user.email}`);
 
@@ -250,7 +389,9 @@ router.post('/stop-all', authorize('bots', 'stop'), (req, res) => {
             }
         });
 
+        const stoppedTypes = Object.keys(runningBots);
         runningBots = {};
+        stoppedTypes.forEach(botType => emitBotEvent('stop', botType));
 
         logger.info(`All bots stopped by ${req.user.email}`);
 
@@ -26,6 +26,10 @@ router.get('/stats', adminOnly, generalLimiter, userController.getUserStats);
 router.get('/:id', staffOrAdmin, generalLimiter, userController.getUserById);
 
 router.post('/', adminOnly, userModificationLimiter, userController.createUser);
+// Registered before the /:id routes so 'bulk' is never taken for an ID
+router.post('/bulk', adminOnly, userModificationLimiter, userController.bulkCreateUsers);
+router.post('/bulk/status', adminOnly, userModificationLimiter, userController.bulkSetUserStatus);
+router.post('/bulk/reset-password', adminOnly, userModificationLimiter, userController.bulkResetPasswords);
 router.put('/:id', userModificationLimiter, userController.updateUser);
 router.delete('/:id', adminOnly, userModificationLimiter, userController.deleteUser);
 router.post('/:id/reset-password', adminOnly, userModificationLimiter, userController.resetUserPassword);
@@ -112,6 +112,7 @@ app.get('/api', (req, res) => {
             },
             bots: {
                 'GET /api/bots/status': 'Get bot status',
+                'GET /api/bots/status/stream': 'Bot status event stream (SSE)',
                 'POST /api/bots/:botType/start': 'Start bot',
                 'POST /api/bots/:botType/stop': 'Stop bot',
                 'GET /api/bots/:botType/logs': 'Get bot logs',
@@ -5,21 +5,40 @@ const SessionManager = require('../utils/sessionManager');
 const ExcelManager = require('../utils/excelManager');
 const ProxyManager = require('../config/proxyManager');
 const DiscordNotifier = require('../utils/discordNotifier');
+const RunState = require('../utils/runState');
+const BrowserPool = require('../utils/browserPool');
+const LeanMode = require('../utils/leanMode');
 require('dotenv').config();
 
 class BaseBot {
     constructor(config) {
         this.config = config;
+        this.platform = config.platform || this.constructor.name.replace(/Bot$/, '');
+        // Tag every log line from this process so the dashboard can attribute it
+        logger.defaultMeta = { ...(logger.defaultMeta || {}), bot: this.platform, pid: process.pid };
         this.sessionManager = new SessionManager();
-        this.excelManager = new ExcelManager(config.excel);
+        this.excelManager = new ExcelManager(config.excel, this.platform);
         this.discordNotifier = new DiscordNotifier(process.env.DISCORD_WEBHOOK_URL);
+        this.runState = new RunState(this.platform);
+        this.browserPool = BrowserPool.fromEnv({
+            platform: this.platform,
+            launch: () => this.launchBrowser(),
+            createContext: (browser) => this.createContext(browser)
+        });
+        this.lease = null;
+        this.leanMode = LeanMode.fromEnv(this.platform);
     }
 
     async initialize() {
-        const proxyManager = new ProxyManager();
-        const proxyServer = proxyManager.getRandomProxy();
+        // Lease a warm browser + context instead of launching Chromium per account
+        this.lease = await this.browserPool.acquire();
+        this.browser = this.lease.browser;
+        this.context = this.lease.context;
+        this.page = this.lease.page;
+    }
 
-        this.browser = await chromium.launch({
+    launchBrowser() {
+        return chromium.launch({
             headless: true,
             channel: 'chrome',
             args: [
@@ -39,8 +58,13 @@ class BaseBot {
             ],
             // proxy: proxyServer ? { server: proxyServer } : undefined
         });
-        
-        this.context = await this.browser.newContext({
+    }
+
+    async createContext(browser) {
+        const proxyManager = ProxyManager.shared();
+        const proxyServer = proxyManager.getRandomProxy();
+
+        const context = await browser.newContext({
             userAgent: 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             viewport: { width: 1920, height: 1080 },
             locale: 'ja-JP',
@@ -55,15 +79,21 @@ class BaseBot {
             colorScheme: 'light',
             reducedMotion: 'no-preference',
             forcedColors: 'none',
-            proxy: proxyServer || undefined
+            proxy: proxyServer || undefined,
+            // Service worker fetches would bypass lean mode's routing
+            serviceWorkers: this.leanMode ? 'block' : 'allow'
         });
+        if (this.leanMode) {
+            await this.leanMode.attach(context);
+        }
 
-        this.page = await this.context.newPage();
-        await this.setupPage();
+        const page = await context.newPage();
+        await this.setupPage(context, page);
+        return { context, page };
     }
 
-    async setupPage() {
-        await this.page.addInitScript(() => {
+    async setupPage(context = this.context, page = this.page) {
+        await page.addInitScript(() => {
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => false
             });
@@ -78,9 +108,9 @@ class BaseBot {
             );
         });
 
-        this.context.setDefaultTimeout(60000);
+        context.setDefaultTimeout(60000);
         
-        await this.page.setExtraHTTPHeaders({
+        await page.setExtraHTTPHeaders({
             'Accept-Language': 'ja-JP,ja;q=0.9',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -111,6 +141,7 @@ class BaseBot {
         
         const concurrency = 4;
         let index = 0;
+        const carted = [];
 
         const runOrder = async () => {
             while (index < urls.length) {
@@ -121,26 +152,7 @@ class BaseBot {
                     const productInfo = await this.productService.checkProduct(url, page);
                     if (productInfo) {
                         await this.checkoutService.addToCart(page);
-                        const status = 'Purchased';
-                        this.excelManager.logOrder(productInfo, status);
-
-                        // Send Discord notification if purchase was successful
-                        if (
-                          status.toLowerCase().includes('purchased')
-                        ) {
-                          try {
-                            const notificationResults = await this.discordNotifier.sendOrderNotificationToAll(
-                              productInfo,
-                              account.Email,
-                              status
-                            );
-                          } catch (discordError) {
-                            logger.warn(
-                              'Discord notification failed, but order logging continued:',
-                              discordError
-                            );
-                          }
-                        }
+                        carted.push({ url, productInfo });
                     }
                 } finally {
                     await page.close();
@@ -150,11 +162,57 @@ class BaseBot {
 
         await Promise.all(Array(concurrency).fill(0).map(() => runOrder()));
 
-        await this.checkoutService.checkout(account.Card, account.Address, this.page);
+        const checkedOut = await this.checkoutService.checkout(account.Card, account.Address, this.page);
+        if (!checkedOut) {
+            // Leave the URLs pending so the next run retries them
+            logger.warn(`Checkout failed for ${account.Email}; ${carted.length} carted items not recorded as purchased`);
+            return;
+        }
+        await this.recordPurchases(account, carted);
+    }
+
+    // Only called once checkout has succeeded: a purchase is what marks an
+    // (account, URL) pair done, so a crash before this point retries it.
+    async recordPurchases(account, carted) {
+        const status = 'Purchased';
+        for (const { url, productInfo } of carted) {
+            this.excelManager.logOrder(productInfo, status, { account: account.Email, url });
+            this.runState.markDone(account.Email, url);
+
+            // Send Discord notification if purchase was successful
+            try {
+                await this.discordNotifier.sendOrderNotificationToAll(
+                    productInfo,
+                    account.Email,
+                    status
+                );
+            } catch (discordError) {
+                logger.warn(
+                    'Discord notification failed, but order logging continued:',
+                    discordError
+                );
+            }
+        }
+    }
+
+    async releaseBrowser() {
+        if (this.lease) {
+            const lease = this.lease;
+            this.lease = null;
+            await this.browserPool.release(lease);
+        } else if (this.context) {
+            // Bots that override initialize() (e.g. over CDP) own their context
+            await this.context.close().catch(error => logger.warn('Failed to close context:', error));
+        }
+        this.context = null;
+        this.page = null;
     }
 
     async close() {
-        await this.browser.close();
+        await this.browserPool.close();
+        if (this.leanMode) {
+            logger.info(this.leanMode.summary());
+        }
     }
 
     async run() {
@@ -164,6 +222,14 @@ class BaseBot {
             
             // Process each account
             for (const account of accounts) {
+                // Resume: skip accounts whose URLs were all completed in an earlier run
+                const urls = RunState.splitUrls(account.URL);
+                const pendingUrls = this.runState.pending(account.Email, urls);
+                if (urls.length > 0 && pendingUrls.length === 0) {
+                    logger.info(`Skipping completed account: ${account.Email} (${urls.length} URLs already purchased)`);
+                    continue;
+                }
+
                 try {
                     await this.initialize();
                     logger.info(`Processing account: ${account.Email}`);
@@ -176,19 +242,20 @@ class BaseBot {
                     }
 
                     // Process products for this account
-                    await this.monitorProducts(account, account.URL);
+                    await this.monitorProducts(account, pendingUrls.join(','));
                     
                     // Logout before switching to next account
                     // await this.authService.logout();
-
-                    // await this.close();
-                    process.exit(0);
                     
                 } catch (error) {
                     logger.error(`Error processing account ${account.Email}:`, error);
                     continue; // Continue with next account even if current one fails
+                } finally {
+                    // Back to the pool: the context is discarded, the browser stays warm
+                    await this.releaseBrowser();
                 }
             }
+            this.runState.finishIfComplete(accounts);
         } catch (error) {
             logger.error('Bot execution failed:', error);
             throw error;
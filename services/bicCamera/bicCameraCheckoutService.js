@@ -55,6 +55,7 @@ class BicCameraCheckoutService {
 
 
             logger.info('Checkout completed');
+            return true;
         } catch (error) {
             logger.error('Checkout failed:', error);
             return false;
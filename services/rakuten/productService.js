@@ -1,4 +1,7 @@
 const logger = require('../../config/logger');
+const SelectorCache = require('../../utils/selectorCache');
+
+const selectorCache = new SelectorCache('Rakuten');
 
 class ProductService {
     constructor(page) {
@@ -33,64 +36,30 @@ class ProductService {
 
             const productInfo = {};
 
-            // Get product name
-            for (const selector of selectors.name) {
-                try {
-                    const element = await this.page.waitForSelector(selector, { timeout: 2000 });
-                    if (element) {
-                        productInfo.name = await element.textContent();
-                        productInfo.name = productInfo.name.trim();
-                        logger.info(`Found product name with selector: ${selector}`);
-                        break;
-                    }
-                } catch (e) {
-                    continue;
-                }
+            // Each field's candidates are raced, so a miss no longer costs 2 s per selector
+            const [name, price] = await Promise.all([
+                selectorCache.race(this.page, 'name', selectors.name),
+                selectorCache.race(this.page, 'price', selectors.price)
+            ]);
+            if (name) {
+                productInfo.name = (await name.element.textContent()).trim();
+                logger.info(`Found product name with selector: ${name.selector}`);
             }
-
-            // Get product price
-            for (const selector of selectors.price) {
-                try {
-                    const element = await this.page.waitForSelector(selector, { timeout: 2000 });
-                    if (element) {
-                        productInfo.price = await element.textContent();
-                        productInfo.price = productInfo.price.trim();
-                        logger.info(`Found product price with selector: ${selector}`);
-                        break;
-                    }
-                } catch (e) {
-                    continue;
-                }
+            if (price) {
+                productInfo.price = (await price.element.textContent()).trim();
+                logger.info(`Found product price with selector: ${price.selector}`);
             }
 
             // Get product brand
-            // for (const selector of selectors.brand) {
-            //     try {
-            //         const element = await this.page.waitForSelector(selector, { timeout: 2000 });
-            //         if (element) {
-            //             productInfo.brand = await element.textContent();
-            //             productInfo.brand = productInfo.brand.trim();
-            //             logger.info(`Found product brand with selector: ${selector}`);
-            //             break;
-            //         }
-            //     } catch (e) {
-            //         continue;
-            //     }
+            // const brand = await selectorCache.race(this.page, 'brand', selectors.brand);
+            // if (brand) {
+            //     productInfo.brand = (await brand.element.textContent()).trim();
             // }
 
             // Check availability
-            // for (const selector of selectors.availability) {
-            //     try {
-            //         const element = await this.page.waitForSelector(selector, { timeout: 2000 });
-            //         if (element) {
-            //             productInfo.availability = await element.textContent();
-            //             productInfo.availability = productInfo.availability.trim();
-            //             logger.info(`Found availability with selector: ${selector}`);
-            //             break;
-            //         }
-            //     } catch (e) {
-            //         continue;
-            //     }
+            // const availability = await selectorCache.race(this.page, 'availability', selectors.availability);
+            // if (availability) {
+            //     productInfo.availability = (await availability.element.textContent()).trim();
             // }
 
             // If no availability found, try to check for add to cart button
@@ -105,17 +74,10 @@ class ProductService {
                     // '[data-testid="add-to-cart"]'
                 ];
 
-                for (const selector of addToCartSelectors) {
-                    try {
-                        const element = await this.page.waitForSelector(selector, { timeout: 2000 });
-                        if (element) {
-                            productInfo.availability = 'In Stock';
-                            logger.info(`Found add to cart button with selector: ${selector}`);
-                            break;
-                        }
-                    } catch (e) {
-                        continue;
-                    }
+                const addToCart = await selectorCache.race(this.page, 'addToCart', addToCartSelectors);
+                if (addToCart) {
+                    productInfo.availability = 'In Stock';
+                    logger.info(`Found add to cart button with selector: ${addToCart.selector}`);
                 }
             }
 
@@ -0,0 +1,83 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const BaseBot = require('../services/baseBot');
+const BicCameraBot = require('../bicCameraBot');
+const RakutenBot = require('../rakutenBot');
+
+// A bot with fake services, skipping the constructor's browser and file setup
+function fakeBot({ available, checkoutResult }, BotClass = BaseBot) {
+    const bot = Object.create(BotClass.prototype);
+    const calls = { logged: [], done: [], notified: 0, checkouts: 0 };
+    bot.context = { newPage: async () => ({ close: async () => {} }) };
+    bot.page = {};
+    bot.productService = {
+        checkProduct: async (url) => (available.includes(url) ? { name: url, price: '¥100', isAvailable: true } : null)
+    };
+    bot.checkoutService = {
+        addToCart: async () => true,
+        checkout: async () => {
+            calls.checkouts++;
+            if (checkoutResult instanceof Error) {
+                throw checkoutResult;
+            }
+            return checkoutResult;
+        }
+    };
+    bot.excelManager = { logOrder: (productInfo, status, context) => calls.logged.push({ status, ...context }) };
+    bot.runState = { markDone: (account, url) => calls.done.push(url) };
+    bot.discordNotifier = { sendOrderNotificationToAll: async () => { calls.notified++; } };
+    return { bot, calls };
+}
+
+const account = { Email: 'a@example.com', Card: {}, Address: {} };
+const urls = 'https://y/1, https://y/2, https://y/3';
+
+test('records purchases only after checkout succeeds', async () => {
+    const { bot, calls } = fakeBot({ available: ['https://y/1', 'https://y/3'], checkoutResult: true });
+    await bot.monitorProducts(account, urls);
+    assert.deepStrictEqual(calls.done.sort(), ['https://y/1', 'https://y/3']);
+    assert.deepStrictEqual(calls.logged.map(entry => entry.status), ['Purchased', 'Purchased']);
+    assert.strictEqual(calls.notified, 2);
+});
+
+test('a failed checkout leaves every URL pending', async () => {
+    const { bot, calls } = fakeBot({ available: ['https://y/1'], checkoutResult: false });
+    await bot.monitorProducts(account, urls);
+    assert.deepStrictEqual(calls.done, []);
+    assert.deepStrictEqual(calls.logged, []);
+});
+
+test('a checkout that throws leaves every URL pending', async () => {
+    const { bot, calls } = fakeBot({ available: ['https://y/1'], checkoutResult: new Error('payment page timed out') });
+    await assert.rejects(bot.monitorProducts(account, urls), /payment page timed out/);
+    assert.deepStrictEqual(calls.done, []);
+    assert.deepStrictEqual(calls.logged, []);
+});
+
+test('BicCamera records purchases only after checkout succeeds', async () => {
+    const succeeded = fakeBot({ available: ['https://b/1', 'https://b/2'], checkoutResult: true }, BicCameraBot);
+    await succeeded.bot.monitorProducts(account, 'https://b/1, https://b/2');
+    assert.deepStrictEqual(succeeded.calls.done, ['https://b/1', 'https://b/2']);
+    assert.deepStrictEqual(succeeded.calls.logged.map(entry => entry.url), ['https://b/1', 'https://b/2']);
+
+    const failed = fakeBot({ available: ['https://b/1'], checkoutResult: false }, BicCameraBot);
+    await failed.bot.monitorProducts(account, 'https://b/1, https://b/2');
+    assert.deepStrictEqual(failed.calls.done, []);
+    assert.deepStrictEqual(failed.calls.logged, []);
+});
+
+test('Rakuten records and notifies through recordPurchases after checkout', async () => {
+    const succeeded = fakeBot({ available: ['https://r/1'], checkoutResult: true }, RakutenBot);
+    await succeeded.bot.monitorProducts(account, 'https://r/1, https://r/2');
+    assert.deepStrictEqual(succeeded.calls.done, ['https://r/1']);
+    assert.strictEqual(succeeded.calls.notified, 1);
+
+    const failed = fakeBot({ available: ['https://r/1'], checkoutResult: false }, RakutenBot);
+    await failed.bot.monitorProducts(account, 'https://r/1');
+    assert.deepStrictEqual(failed.calls.done, []);
+
+    // Nothing carted: no checkout attempt at all
+    const empty = fakeBot({ available: [], checkoutResult: true }, RakutenBot);
+    await empty.bot.monitorProducts(account, 'https://r/1');
+    assert.strictEqual(empty.calls.checkouts, 0);
+});
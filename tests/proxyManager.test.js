@@ -0,0 +1,101 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const http = require('http');
+const ProxyManager = require('../config/proxyManager');
+
+// Stand-in forward proxy: answers every request itself after `delayMs`
+function startProxy(delayMs, statusCode = 204) {
+    return new Promise((resolve) => {
+        const server = http.createServer((request, response) => {
+            setTimeout(() => {
+                response.writeHead(statusCode);
+                response.end();
+            }, delayMs);
+        });
+        server.listen(0, '127.0.0.1', () => resolve(server));
+    });
+}
+
+async function setup() {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'proxy-scores-'));
+    const servers = {
+        fast: await startProxy(5),
+        slow: await startProxy(150),
+        auth: await startProxy(5, 407)
+    };
+    const ports = {};
+    for (const [name, server] of Object.entries(servers)) {
+        ports[name] = server.address().port;
+    }
+    const proxiesPath = path.join(dir, 'proxies.txt');
+    fs.writeFileSync(proxiesPath, Object.values(ports).map(port => `127.0.0.1:${port}`).join('\n'));
+    const options = { scoresPath: path.join(dir, 'proxy_scores.json'), probeUrl: 'http://probe.test/generate_204' };
+    const server = (name) => `http://127.0.0.1:${ports[name]}`;
+    const teardown = () => {
+        for (const s of Object.values(servers)) {
+            s.close();
+        }
+        fs.rmSync(dir, { recursive: true, force: true });
+    };
+    return { proxiesPath, options, server, teardown };
+}
+
+async function probeRounds(manager, rounds) {
+    for (let i = 0; i < rounds; i++) {
+        await manager.probeAll();
+    }
+}
+
+test('weighs picks by latency and quarantines a proxy that answers 407', async () => {
+    const { proxiesPath, options, server, teardown } = await setup();
+    try {
+        const manager = new ProxyManager(proxiesPath, options);
+        await probeRounds(manager, 3);
+
+        const byServer = Object.fromEntries(manager.proxies.map(proxy => [proxy.server, proxy]));
+        assert.ok(manager.isQuarantined(byServer[server('auth')]));
+        assert.ok(!manager.isQuarantined(byServer[server('fast')]));
+        assert.strictEqual(manager.score(byServer[server('auth')]).lastError, 'HTTP 407');
+
+        const picks = { [server('fast')]: 0, [server('slow')]: 0, [server('auth')]: 0 };
+        for (let i = 0; i < 2000; i++) {
+            picks[manager.getRandomProxy().server]++;
+        }
+        assert.strictEqual(picks[server('auth')], 0);
+        // ~150ms vs a few ms: the fast proxy should win by a wide margin
+        assert.ok(picks[server('fast')] > 3 * picks[server('slow')],
+            `fast ${picks[server('fast')]} vs slow ${picks[server('slow')]}`);
+    } finally {
+        teardown();
+    }
+});
+
+test('saveScores merges with what another process saved', async () => {
+    const { proxiesPath, options, server, teardown } = await setup();
+    try {
+        // Both load before either has saved, like two shards starting together
+        const first = new ProxyManager(proxiesPath, options);
+        const second = new ProxyManager(proxiesPath, options);
+        await probeRounds(first, 3);
+
+        const fast = second.proxies.find(proxy => proxy.server === server('fast'));
+        second.recordResult(fast, true, 20);
+        second.saveScores();
+
+        const saved = JSON.parse(fs.readFileSync(options.scoresPath, 'utf8')).proxies;
+        const auth = saved[server('auth')];
+        assert.strictEqual(auth.failures, 3);
+        assert.ok(Date.parse(auth.quarantinedUntil) > Date.now());
+        assert.strictEqual(saved[server('fast')].successes, 4);
+        assert.strictEqual(saved[server('slow')].successes, 3);
+
+        // The second process picks up the quarantine too
+        const authProxy = second.proxies.find(proxy => proxy.server === server('auth'));
+        assert.ok(second.isQuarantined(authProxy));
+    } finally {
+        teardown();
+    }
+});
@@ -0,0 +1,132 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// RunState keeps its checkpoint under data/run_state/ relative to the cwd
+const workDir = fs.mkdtempSync(path.join(os.tmpdir(), 'run-state-'));
+process.chdir(workDir);
+const RunState = require('../utils/runState');
+
+const statePath = path.join('data', 'run_state', 'Yodobashi.jsonl');
+const orderLogPath = path.join('data', 'order_log.jsonl');
+const OTHER_PID = process.pid + 1;
+
+function writeLines(filePath, lines) {
+    fs.mkdirSync(path.dirname(filePath), { recursive: true });
+    fs.writeFileSync(filePath, lines.map(line => JSON.stringify(line)).join('\n') + '\n');
+}
+
+// Timestamps relative to now, since a run idle for a day is not resumed
+const started = Date.now() - 3600 * 1000;
+function at(seconds) {
+    return new Date(started + seconds * 1000).toISOString();
+}
+
+// An unfinished run by another (crashed) process
+const openRun = { at: at(0), run: 'start', pid: OTHER_PID };
+
+test.afterEach(() => {
+    fs.rmSync('data', { recursive: true, force: true });
+});
+
+test.after(() => {
+    process.chdir(os.tmpdir());
+    fs.rmSync(workDir, { recursive: true, force: true });
+});
+
+test('seeds completed entries from purchases in the order log', () => {
+    writeLines(statePath, [openRun]);
+    writeLines(orderLogPath, [
+        { Timestamp: at(1), Platform: 'Yodobashi', Account: 'A@example.com', URL: 'https://y/1', Status: 'Purchased' },
+        { Timestamp: at(2), Platform: 'Yodobashi', Account: 'a@example.com', URL: 'https://y/2', Status: 'Failed' },
+        { Timestamp: at(3), Platform: 'Rakuten', Account: 'a@example.com', URL: 'https://y/3', Status: 'Purchased' },
+        { Timestamp: at(4), Platform: 'Yodobashi', Product: 'no account', Status: 'Purchased' }
+    ]);
+    const state = new RunState('Yodobashi', orderLogPath);
+    // Accounts compare case-insensitively, URLs after trimming
+    assert.ok(state.isDone('a@example.com', ' https://y/1 '));
+    assert.deepStrictEqual(state.pending('a@example.com', ['https://y/1', 'https://y/2', 'https://y/3']),
+        ['https://y/2', 'https://y/3']);
+});
+
+test('replays resets in time order against done lines', () => {
+    writeLines(orderLogPath, [
+        { Timestamp: at(1), Platform: 'Yodobashi', Account: 'a@example.com', URL: 'https://y/1', Status: 'Purchased' }
+    ]);
+    writeLines(statePath, [
+        openRun,
+        // Written out of order: the reset at 5 s only clears what was done before it
+        { at: at(6), account: 'a@example.com', url: 'https://y/2', status: 'done' },
+        { at: at(5), reset: true, account: 'a@example.com', url: 'https://y/1' },
+        { at: at(5), reset: true, account: 'a@example.com', url: 'https://y/2' },
+        { at: at(2), account: 'a@example.com', url: 'https://y/3', status: 'done' }
+    ]);
+    const state = new RunState('Yodobashi', orderLogPath);
+    assert.deepStrictEqual(state.pending('a@example.com', ['https://y/1', 'https://y/2', 'https://y/3']),
+        ['https://y/1']);
+});
+
+test('a reset-all marker clears everything before it', () => {
+    writeLines(statePath, [
+        openRun,
+        { at: at(1), account: 'a@example.com', url: 'https://y/1', status: 'done' },
+        { at: at(2), reset: 'all' },
+        { at: at(3), account: 'b@example.com', url: 'https://y/1', status: 'done' }
+    ]);
+    const state = new RunState('Yodobashi', orderLogPath);
+    assert.ok(!state.isDone('a@example.com', 'https://y/1'));
+    assert.ok(state.isDone('b@example.com', 'https://y/1'));
+});
+
+test('a finished run is forgotten by the next start', () => {
+    writeLines(statePath, [
+        openRun,
+        { at: at(1), account: 'a@example.com', url: 'https://y/1', status: 'done' },
+        { at: at(2), run: 'end', pid: OTHER_PID }
+    ]);
+    writeLines(orderLogPath, [
+        { Timestamp: at(1), Platform: 'Yodobashi', Account: 'a@example.com', URL: 'https://y/1', Status: 'Purchased' }
+    ]);
+    assert.ok(!new RunState('Yodobashi', orderLogPath).isDone('a@example.com', 'https://y/1'));
+});
+
+test('purchases without a run marker do not count', () => {
+    writeLines(orderLogPath, [
+        { Timestamp: at(1), Platform: 'Yodobashi', Account: 'a@example.com', URL: 'https://y/1', Status: 'Purchased' }
+    ]);
+    assert.ok(!new RunState('Yodobashi', orderLogPath).isDone('a@example.com', 'https://y/1'));
+});
+
+test('an open run idle for longer than the max age is not resumed', () => {
+    const dayAgo = Date.now() - 25 * 3600 * 1000;
+    writeLines(statePath, [
+        { at: new Date(dayAgo).toISOString(), run: 'start', pid: OTHER_PID },
+        { at: new Date(dayAgo + 1000).toISOString(), account: 'a@example.com', url: 'https://y/1', status: 'done' }
+    ]);
+    assert.ok(!new RunState('Yodobashi', orderLogPath).isDone('a@example.com', 'https://y/1'));
+});
+
+test('finishIfComplete closes the run only when nothing is pending', () => {
+    const accounts = [{ Email: 'a@example.com', URL: 'https://y/1, https://y/2' }];
+    const state = new RunState('Yodobashi', orderLogPath);
+    state.markDone('a@example.com', 'https://y/1');
+    assert.strictEqual(state.finishIfComplete(accounts), false);
+
+    // Crashed before the second URL: the next start resumes
+    const resumed = new RunState('Yodobashi', orderLogPath);
+    assert.ok(resumed.isDone('a@example.com', 'https://y/1'));
+    resumed.markDone('a@example.com', 'https://y/2');
+    assert.strictEqual(resumed.finishIfComplete(accounts), true);
+});
+
+test('markDone survives a reload and ignores a partial trailing line', () => {
+    const state = new RunState('Yodobashi', orderLogPath);
+    state.markDone('a@example.com', 'https://y/1');
+    fs.appendFileSync(statePath, '{"at":"2026-');
+
+    const reloaded = new RunState('Yodobashi', orderLogPath);
+    assert.ok(reloaded.isDone('a@example.com', 'https://y/1'));
+    assert.strictEqual(reloaded.completed.size, 1);
+});
@@ -0,0 +1,61 @@
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// SelectorCache keeps its file under data/selector_cache/ relative to the cwd
+const workDir = fs.mkdtempSync(path.join(os.tmpdir(), 'selector-cache-'));
+process.chdir(workDir);
+const SelectorCache = require('../utils/selectorCache');
+
+// Page stand-in where only the selectors in `present` exist
+function fakePage(present) {
+    return {
+        $: async (selector) => (present.includes(selector) ? { selector } : null),
+        waitForSelector: (selector, { timeout }) => (present.includes(selector)
+            ? Promise.resolve({ selector })
+            : new Promise((resolve, reject) => setTimeout(() => reject(new Error('timeout')), timeout)))
+    };
+}
+
+test.afterEach(() => {
+    fs.rmSync('data', { recursive: true, force: true });
+});
+
+test.after(() => {
+    process.chdir(os.tmpdir());
+    fs.rmSync(workDir, { recursive: true, force: true });
+});
+
+test('learns the winning selector and checks it first next time', async () => {
+    const cache = new SelectorCache('Yodobashi');
+    const page = fakePage(['.price-b']);
+    const first = await cache.race(page, 'price', ['.price-a', '.price-b'], 50);
+    assert.strictEqual(first.selector, '.price-b');
+    assert.deepStrictEqual(cache.fields.price, { selector: '.price-b', hits: 0, misses: 1, failures: 0 });
+
+    const second = await new SelectorCache('Yodobashi').race(page, 'price', ['.price-a', '.price-b'], 50);
+    assert.strictEqual(second.selector, '.price-b');
+    const saved = JSON.parse(fs.readFileSync(path.join('data', 'selector_cache', 'Yodobashi.json'), 'utf8'));
+    assert.deepStrictEqual(saved.fields.price, { selector: '.price-b', hits: 1, misses: 1, failures: 0 });
+});
+
+test('records a failure when no candidate appears', async () => {
+    const cache = new SelectorCache('Yodobashi');
+    assert.strictEqual(await cache.race(fakePage([]), 'stock', ['.a', '.b'], 20), null);
+    assert.strictEqual(cache.fields.stock.failures, 1);
+});
+
+test('counters from concurrent processes add up', async () => {
+    // Both load before either has saved, like two shards of the same bot
+    const first = new SelectorCache('Yodobashi');
+    const second = new SelectorCache('Yodobashi');
+    const page = fakePage(['.name']);
+    await first.race(page, 'name', ['.name'], 50);
+    await first.race(page, 'name', ['.name'], 50);
+    await second.race(page, 'name', ['.name'], 50);
+
+    const saved = JSON.parse(fs.readFileSync(path.join('data', 'selector_cache', 'Yodobashi.json'), 'utf8'));
+    assert.deepStrictEqual(saved.fields.name, { selector: '.name', hits: 1, misses: 2, failures: 0 });
+});
@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from dashboard import LogIndex
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def line(second, message, bot='Yodobashi', pid=1, level='info'):
+    timestamp = datetime.fromtimestamp(BASE + second, timezone.utc).isoformat().replace('+00:00', 'Z')
+    return json.dumps({'timestamp': timestamp, 'level': level, 'message': message, 'bot': bot, 'pid': pid}) + '\n'
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / 'combined.log'
+    path.write_text('')
+    return path
+
+
+def write(path, *lines):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def messages(results):
+    return [result['entry'].message for result in results]
+
+
+def test_missing_log_and_index_directory(tmp_path):
+    # Fresh checkout: neither logs/ nor the log exist yet
+    index = LogIndex(str(tmp_path / 'logs' / 'combined.log'))
+    assert index.query() == []
+
+
+def test_filters_by_level_bot_and_account(log):
+    write(log,
+          line(0, 'Processing account: a@example.com'),
+          line(1, 'Product found'),
+          line(2, 'Checkout failed', level='error'),
+          line(3, 'Processing account: b@example.com', bot='Rakuten', pid=2),
+          line(4, 'Product found', bot='Rakuten', pid=2))
+    index = LogIndex(str(log))
+
+    assert messages(index.query()) == ['Product found', 'Processing account: b@example.com',
+                                       'Checkout failed', 'Product found',
+                                       'Processing account: a@example.com']
+    assert messages(index.query(level='error')) == ['Checkout failed']
+    assert messages(index.query(bot='Rakuten')) == ['Product found', 'Processing account: b@example.com']
+    # Lines without an address inherit the account their process is working on
+    assert messages(index.query(email='A@example.com')) == ['Checkout failed', 'Product found',
+                                                            'Processing account: a@example.com']
+    assert index.query(bot='PopMart') == []
+    assert messages(index.query(text='found', bot='Yodobashi')) == ['Product found']
+    assert len(index.query(limit=2)) == 2
+
+
+def test_time_range_with_interleaved_processes(log):
+    # Two processes flush out of order, so timestamps are not monotonic
+    write(log,
+          line(0, 'm0', pid=1),
+          line(2, 'm2', pid=2),
+          line(1, 'm1', pid=1),
+          line(3, 'm3', pid=2),
+          line(5, 'm5', pid=1),
+          line(4, 'm4', pid=2))
+    index = LogIndex(str(log))
+    assert sorted(messages(index.query(start=BASE + 1, end=BASE + 4))) == ['m1', 'm2', 'm3', 'm4']
+    assert sorted(messages(index.query(start=BASE + 1, end=BASE + 4, text='m'))) == ['m1', 'm2', 'm3', 'm4']
+    assert messages(index.query(start=BASE + 5)) == ['m5']
+    assert messages(index.query(end=BASE)) == ['m0']
+
+
+def test_incremental_updates_and_reopen(log):
+    write(log, line(0, 'first'))
+    index = LogIndex(str(log))
+    assert messages(index.query()) == ['first']
+
+    write(log, line(1, 'second'), '{"partial')
+    assert messages(index.query()) == ['second', 'first']
+
+    # A new instance picks up the saved index instead of starting over
+    reopened = LogIndex(str(log))
+    assert reopened.meta['count'] == 2
+    assert messages(reopened.query()) == ['second', 'first']
+
+
+def test_truncated_log_is_reindexed(log):
+    write(log, line(0, 'old'), line(1, 'older'))
+    index = LogIndex(str(log))
+    index.query()
+
+    log.write_text(line(2, 'new'))
+    assert messages(index.query()) == ['new']
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from dashboard import LatencySketch, MetricsEngine, RollingMetrics
+
+
+def test_empty_sketch_has_no_quantiles():
+    assert LatencySketch().quantile(0.5) is None
+
+
+@pytest.mark.parametrize('q', [0.5, 0.95, 0.99])
+def test_quantiles_stay_within_relative_accuracy(q):
+    sketch = LatencySketch(relative_accuracy=0.02)
+    values = [i / 10 for i in range(1, 1001)]
+    for value in values:
+        sketch.add(value)
+    exact = values[int(q * (len(values) - 1))]
+    assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+
+def test_zero_samples_count_towards_rank():
+    sketch = LatencySketch()
+    for value in (0, 0, 0, 5):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(5, rel=0.02)
+
+
+def test_merge_matches_a_single_sketch():
+    merged, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for i in range(1, 201):
+        merged.add(i)
+        (left if i % 2 else right).add(i)
+    left.merge(right)
+    assert left.count == merged.count
+    for q in (0.1, 0.5, 0.9):
+        assert left.quantile(q) == merged.quantile(q)
+
+
+def test_rolling_window_only_counts_recent_buckets():
+    metrics = RollingMetrics()
+    # 45 s into a minute: the 1 m window is the current minute bucket
+    now = 10_000 * 60 + 45
+    metrics.record('Rakuten', now - 30, 'orders', now=now)
+    metrics.record('Rakuten', now - 240, 'orders', now=now)
+    metrics.record('Rakuten', now - 240, 'attempts', now=now)
+    metrics.record('Rakuten', now - 240, 'failures', now=now)
+    # Older than the retention window: dropped on the way in
+    metrics.record('Rakuten', now - 7200, 'orders', now=now)
+
+    assert metrics.summary('Rakuten', '1m', now=now)['orders'] == 1
+    five = metrics.summary('Rakuten', '5m', now=now)
+    assert five['orders'] == 2
+    assert five['orders_per_min'] == pytest.approx(0.4)
+    assert five['failure_rate'] == 1.0
+    assert metrics.summary('Yodobashi', '5m', now=now)['failure_rate'] is None
+
+
+def test_engine_counts_recent_orders_from_applied_rows():
+    now = 10_000 * 60 + 45
+    iso = lambda ts: datetime.fromtimestamp(ts, timezone.utc).isoformat().replace('+00:00', 'Z')
+    engine = MetricsEngine()
+    engine.add_orders(False, [
+        {'Platform': 'Rakuten', 'Timestamp': iso(now - 30)},
+        {'Platform': 'Rakuten', 'Timestamp': iso(now - 7200)},
+        {'Platform': 'Rakuten', 'Timestamp': 'garbage'},
+    ], now=now)
+    assert engine.metrics.summary('Rakuten', '1h', now=now)['orders'] == 1
+
+    engine.add_orders(True, [{'Platform': 'Rakuten', 'Timestamp': iso(now - 90)}], now=now)
+    assert engine.metrics.summary('Rakuten', '1h', now=now)['orders'] == 1
@@ -0,0 +1,39 @@
+from dashboard import parse_order_batch
+
+
+def test_headerless_rows_use_default_bot():
+    text = 'a@example.com,pw,https://example.com/1\n\nb@example.com,pw,https://example.com/2,rakuten\n'
+    rows, errors = parse_order_batch(text, 'Yodobashi')
+    assert errors == []
+    assert rows == {
+        'Yodobashi': [{'Email': 'a@example.com', 'Password': 'pw', 'URL': 'https://example.com/1'}],
+        'Rakuten': [{'Email': 'b@example.com', 'Password': 'pw', 'URL': 'https://example.com/2'}],
+    }
+
+
+def test_header_is_case_insensitive_and_keeps_extra_columns():
+    text = 'url,EMAIL,password,Card\nhttps://example.com/1,a@example.com,pw,4111\n'
+    rows, errors = parse_order_batch(text, 'BicCamera')
+    assert errors == []
+    assert rows['BicCamera'] == [{'URL': 'https://example.com/1', 'Email': 'a@example.com',
+                                  'Password': 'pw', 'Card': '4111'}]
+
+
+def test_invalid_rows_are_reported_with_line_numbers():
+    text = ('Email,Password,URL,Bot\n'
+            'a@example.com,pw,https://example.com/1,Nope\n'
+            'a@example.com,,https://example.com/1,\n'
+            'not-an-email,pw,https://example.com/1,\n'
+            'a@example.com,pw,example.com/1,\n')
+    rows, errors = parse_order_batch(text, 'PopMart')
+    assert rows == {}
+    assert errors == [
+        'Line 2: unknown bot',
+        'Line 3: missing Password',
+        'Line 4: invalid email not-an-email',
+        'Line 5: invalid URL example.com/1',
+    ]
+
+
+def test_empty_text():
+    assert parse_order_batch('  \n', 'Yodobashi') == ({}, [])
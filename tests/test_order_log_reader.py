@@ -0,0 +1,121 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from dashboard import OrderLogReader
+
+
+def order(n, platform='Yodobashi'):
+    return {'Timestamp': f'2026-01-01T00:00:{n:02d}.000Z', 'Platform': platform,
+            'Product': f'Item {n}', 'Price': '¥1,000', 'Status': 'Purchased'}
+
+
+def append(path, *rows, partial=''):
+    with open(path, 'a', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+        f.write(partial)
+
+
+def test_missing_file_reads_nothing(tmp_path):
+    reader = OrderLogReader(str(tmp_path / 'order_log.jsonl'))
+    assert reader.read_new_rows() == (False, [])
+    assert reader.last(5) == []
+
+
+def test_reads_only_new_rows(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    reader = OrderLogReader(path)
+    append(path, order(1), order(2))
+    reset, rows = reader.read_new_rows()
+    assert not reset
+    assert [row['Product'] for row in rows] == ['Item 1', 'Item 2']
+
+    append(path, order(3))
+    assert reader.read_new_rows() == (False, [order(3)])
+    assert reader.read_new_rows() == (False, [])
+
+
+def test_partial_line_waits_for_newline(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    reader = OrderLogReader(path)
+    line = json.dumps(order(2))
+    append(path, order(1), partial=line[:10])
+    assert reader.read_new_rows() == (False, [order(1)])
+
+    append(path, partial=line[10:] + '\n')
+    assert reader.read_new_rows() == (False, [order(2)])
+
+
+def test_malformed_lines_are_skipped(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    append(path, order(1), partial='not json\n[1, 2]\n')
+    append(path, order(2))
+    reset, rows = OrderLogReader(path).read_new_rows()
+    assert rows == [order(1), order(2)]
+
+
+def test_truncation_resets(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    reader = OrderLogReader(path)
+    append(path, order(1), order(2))
+    reader.read_new_rows()
+
+    # Clear Orders Log truncates in place
+    open(path, 'w').close()
+    append(path, order(3))
+    assert reader.read_new_rows() == (True, [order(3)])
+
+
+def test_recreated_file_resets(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    reader = OrderLogReader(path)
+    append(path, order(1))
+    reader.read_new_rows()
+
+    replacement = str(tmp_path / 'replacement.jsonl')
+    append(replacement, order(5), order(6), order(7))
+    os.replace(replacement, path)
+    reset, rows = reader.read_new_rows()
+    assert reset
+    assert rows == [order(5), order(6), order(7)]
+
+
+def test_deleted_file_resets(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    reader = OrderLogReader(path)
+    append(path, order(1))
+    reader.read_new_rows()
+    os.remove(path)
+    assert reader.read_new_rows() == (True, [])
+
+
+def test_last_and_since(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    append(path, *(order(n) for n in range(1, 6)))
+    reader = OrderLogReader(path)
+    assert reader.last(2) == [order(4), order(5)]
+    assert reader.last(10) == [order(n) for n in range(1, 6)]
+    assert reader.last(0) == []
+    assert reader.since('2026-01-01T00:00:03Z') == [order(3), order(4), order(5)]
+
+    append(path, order(6))
+    assert reader.last(1) == [order(6)]
+
+
+def test_since_compares_in_utc(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    append(path, *(order(n) for n in range(1, 6)))
+    reader = OrderLogReader(path)
+    tokyo = timezone(timedelta(hours=9))
+    # 09:00:04 in Tokyo is 00:00:04 UTC
+    assert reader.since(datetime(2026, 1, 1, 9, 0, 4, tzinfo=tokyo)) == [order(4), order(5)]
+    assert reader.since(datetime(2026, 1, 1, 0, 0, 4, tzinfo=timezone.utc).timestamp()) == [order(4), order(5)]
+    assert reader.since('2026-01-01T09:00:05+09:00') == [order(5)]
+
+
+def test_since_drops_older_rows_after_the_split(tmp_path):
+    path = str(tmp_path / 'order_log.jsonl')
+    # A late write from another shard lands after newer rows
+    append(path, order(1), order(3), order(4), order(2), order(5))
+    assert OrderLogReader(path).since('2026-01-01T00:00:03Z') == [order(3), order(4), order(5)]
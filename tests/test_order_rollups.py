@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from dashboard import OrderRollups, parse_price
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('¥12,800', 12800.0),
+    ('12,800円', 12800.0),
+    ('￥ 980', 980.0),
+    ('¥12,800（ポイント10%）', 12800.0),
+    ('税込 10% ¥1,280', 1280.0),
+    ('10%OFF 3,000', 3000.0),
+    ('1,234.50', 1234.5),
+    ('1.280.5', 1.28),
+    (12800, 12800.0),
+    (99.5, 99.5),
+    ('Sold out', None),
+    ('', None),
+    (None, None),
+    (True, None),
+    (float('nan'), None),
+])
+def test_parse_price(value, expected):
+    assert parse_price(value) == expected
+
+
+def row(platform, product, price, status='Purchased', timestamp='2026-01-01T10:15:00Z'):
+    return {'Timestamp': timestamp, 'Platform': platform, 'Product': product, 'Price': price, 'Status': status}
+
+
+def test_rollups_by_platform_and_product():
+    rollups = OrderRollups()
+    rollups.add_rows([
+        row('Rakuten', 'A', '¥1,000（ポイント10%）'),
+        row('Rakuten', 'A', '¥3,000'),
+        row('Rakuten', 'B', 'Sold out'),
+        row('Rakuten', 'B', '¥500', status='Failed'),
+        row('Yodobashi', 'C', '2,000円'),
+    ])
+    platforms = dict(rollups.query('Platform'))
+    rakuten = platforms['Rakuten']
+    assert rakuten['orders'] == 4
+    assert rakuten['purchased'] == 3
+    assert rakuten['success_rate'] == 0.75
+    # Unparseable and failed rows do not count towards spend
+    assert rakuten['spend'] == 4000.0
+    assert rakuten['avg_price'] == 2000.0
+    assert platforms['Yodobashi']['spend'] == 2000.0
+
+    assert [name for name, _ in rollups.query('Product')] == ['Rakuten / A', 'Yodobashi / C', 'Rakuten / B']
+    assert dict(rollups.query('Platform', platform='Yodobashi')).keys() == {'Yodobashi'}
+
+
+def test_rollups_periods():
+    now = time.time()
+    iso = lambda ts: time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(ts))
+    rollups = OrderRollups()
+    rollups.add_rows([
+        row('Rakuten', 'A', '¥100', timestamp=iso(now)),
+        row('Rakuten', 'A', '¥100', timestamp=iso(now - 48 * 3600)),
+        row('Rakuten', 'A', '¥100', timestamp='garbage'),
+    ])
+    assert dict(rollups.query('Platform', 'All time'))['Rakuten']['orders'] == 3
+    assert dict(rollups.query('Platform', 'Last 24h', now=now))['Rakuten']['orders'] == 1
+    hours = rollups.query('Hour', now=now)
+    assert hours[-1][0] == 'Unknown'
+    assert sum(summary['orders'] for _, summary in hours) == 3
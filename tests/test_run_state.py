@@ -0,0 +1,59 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from dashboard import RunState
+
+
+def iso(seconds_ago):
+    return datetime.fromtimestamp(time.time() - seconds_ago, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    # RUN_STATE_DIR and ORDER_LOG_PATH are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join('data', 'run_state'))
+    return RunState('Yodobashi')
+
+
+def write(state, *lines):
+    with open(state.path, 'a', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line) + '\n')
+
+
+def urls(state):
+    return [entry['url'] for entry in state.entries()]
+
+
+def test_lists_entries_of_an_open_run(state):
+    write(state,
+          {'at': iso(60), 'run': 'start', 'pid': 1},
+          {'at': iso(50), 'account': 'a@example.com', 'url': 'https://y/1', 'status': 'done'},
+          {'at': iso(40), 'account': 'a@example.com', 'url': 'https://y/2', 'status': 'done'})
+    state.reset([{'account': 'A@example.com', 'url': 'https://y/1'}])
+    assert urls(state) == ['https://y/2']
+
+
+def test_finished_or_stale_runs_list_nothing(state):
+    write(state,
+          {'at': iso(60), 'run': 'start', 'pid': 1},
+          {'at': iso(50), 'account': 'a@example.com', 'url': 'https://y/1', 'status': 'done'},
+          {'at': iso(40), 'run': 'end', 'pid': 1})
+    assert urls(state) == []
+
+    write(state,
+          {'at': iso(30), 'run': 'start', 'pid': 2},
+          {'at': iso(20), 'account': 'a@example.com', 'url': 'https://y/3', 'status': 'done'})
+    assert urls(state) == ['https://y/3']
+
+
+def test_idle_open_run_is_stale(state):
+    write(state,
+          {'at': iso(48 * 3600), 'run': 'start', 'pid': 1},
+          {'at': iso(47 * 3600), 'account': 'a@example.com', 'url': 'https://y/1', 'status': 'done'})
+    assert urls(state) == []
@@ -0,0 +1,35 @@
+import os
+
+import dashboard
+from dashboard import ShardedRun, new_shard_dir
+
+
+class FakeInstance:
+    def __init__(self, instance_id, running=True, restart_at=None):
+        self.id = instance_id
+        self.running = running
+        self.restart_at = restart_at
+
+
+def test_each_launch_gets_its_own_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(dashboard, 'SHARD_DIR', str(tmp_path))
+    other = tmp_path / 'rakuten-20260101-000000-000000'
+    other.mkdir()
+    first = new_shard_dir('Yodobashi')
+    (tmp_path / os.path.basename(first) / 'yodobashi-1-of-2.xlsx').write_bytes(b'')
+    second = new_shard_dir('Yodobashi')
+
+    assert first != second
+    assert os.path.isdir(second)
+    # The earlier launch of this bot is cleaned up, other bots are left alone
+    assert not os.path.exists(first)
+    assert other.is_dir()
+
+
+def test_run_is_active_while_a_shard_runs_or_waits_to_restart():
+    run = ShardedRun('Yodobashi')
+    run.add_shard(FakeInstance(1, running=False), 'a.xlsx', 2)
+    assert not run.active
+    run.add_shard(FakeInstance(2, running=False, restart_at=123.0), 'b.xlsx', 2)
+    assert run.active
+    assert run.totals()['accounts'] == 4
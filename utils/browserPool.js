@@ -0,0 +1,184 @@
+const fs = require('fs');
+const path = require('path');
+const logger = require('../config/logger');
+
+const STATUS_DIR = path.join('data', 'browser_pool');
+const HEARTBEAT_MS = 5000;
+
+// Warm pool of launched browsers, each holding one ready context and page.
+// A bot leases a slot per account and releases it afterwards: the used context
+// is closed and a fresh one is prepared in the background, and the browser
+// itself is relaunched only after `maxUses` leases. The pool state is published
+// to data/browser_pool/<platform>-<pid>.json for the dashboard.
+class BrowserPool {
+    constructor({ platform, size = 1, maxUses = 10, launch, createContext }) {
+        this.platform = platform;
+        this.size = Math.max(1, size);
+        this.maxUses = Math.max(1, maxUses);
+        this.launch = launch;
+        this.createContext = createContext;
+        this.slots = [];
+        this.waiters = [];
+        this.closed = false;
+        this.statusPath = path.join(STATUS_DIR, `${platform}-${process.pid}.json`);
+        this.heartbeat = null;
+    }
+
+    static fromEnv(options) {
+        return new BrowserPool({
+            size: parseInt(process.env.BROWSER_POOL_SIZE, 10) || 1,
+            maxUses: parseInt(process.env.BROWSER_POOL_MAX_USES, 10) || 10,
+            ...options
+        });
+    }
+
+    warm() {
+        // Starts every slot warming; acquire() waits for the first one ready
+        if (this.slots.length === 0) {
+            for (let id = 1; id <= this.size; id++) {
+                this.slots.push({ id, state: 'cold', browser: null, context: null, page: null, uses: 0, launches: 0, error: null });
+            }
+            this.heartbeat = setInterval(() => this.writeStatus(), HEARTBEAT_MS);
+            this.heartbeat.unref();
+            logger.info(`Warming browser pool for ${this.platform}: ${this.size} slots, recycle after ${this.maxUses} uses`);
+        }
+        return Promise.all(this.slots.filter(slot => slot.state === 'cold').map(slot => this.warmSlot(slot)));
+    }
+
+    async warmSlot(slot) {
+        slot.state = 'warming';
+        this.writeStatus();
+        const started = Date.now();
+        try {
+            if (slot.browser && (slot.uses >= this.maxUses || !slot.browser.isConnected())) {
+                await this.closeBrowser(slot);
+            }
+            if (!slot.browser) {
+                slot.browser = await this.launch();
+                slot.uses = 0;
+                slot.launches++;
+            }
+            const { context, page } = await this.createContext(slot.browser);
+            if (this.closed) {
+                // close() ran while this slot was warming up
+                await this.closeBrowser(slot);
+                return;
+            }
+            slot.context = context;
+            slot.page = page;
+            slot.state = 'idle';
+            slot.error = null;
+            logger.info(`Browser pool slot ${slot.id} ready in ${Date.now() - started}ms`);
+        } catch (error) {
+            slot.state = 'failed';
+            slot.error = error.message;
+            logger.error(`Browser pool slot ${slot.id} failed to warm up:`, error);
+            await this.closeBrowser(slot);
+        }
+        this.writeStatus();
+        this.wakeWaiters();
+    }
+
+    async acquire() {
+        this.warm();
+        while (!this.closed) {
+            const slot = this.slots.find(candidate => candidate.state === 'idle');
+            if (slot) {
+                slot.state = 'leased';
+                slot.uses++;
+                this.writeStatus();
+                return { slot, browser: slot.browser, context: slot.context, page: slot.page };
+            }
+            if (!this.slots.some(candidate => ['warming', 'recycling', 'leased'].includes(candidate.state))) {
+                // Nothing will become free on its own: retry a failed slot in the foreground
+                const failed = this.slots.find(candidate => candidate.state === 'failed');
+                await this.warmSlot(failed);
+                if (failed.state === 'failed') {
+                    throw new Error(`Browser pool could not launch a browser: ${failed.error}`);
+                }
+                continue;
+            }
+            await new Promise(resolve => this.waiters.push(resolve));
+        }
+        throw new Error('Browser pool is closed');
+    }
+
+    async release(lease) {
+        const { slot } = lease;
+        slot.state = 'recycling';
+        this.writeStatus();
+        try {
+            await slot.context.close();
+        } catch (error) {
+            logger.warn(`Browser pool slot ${slot.id}: failed to close context:`, error);
+        }
+        slot.context = null;
+        slot.page = null;
+        if (this.closed) {
+            return;
+        }
+        // Not awaited: the next account can take another warm slot meanwhile
+        this.warmSlot(slot);
+    }
+
+    wakeWaiters() {
+        const waiters = this.waiters;
+        this.waiters = [];
+        waiters.forEach(resolve => resolve());
+    }
+
+    async closeBrowser(slot) {
+        const browser = slot.browser;
+        slot.browser = null;
+        if (browser) {
+            await browser.close().catch(error => logger.warn(`Browser pool slot ${slot.id}: failed to close browser:`, error));
+        }
+    }
+
+    async close() {
+        this.closed = true;
+        clearInterval(this.heartbeat);
+        this.wakeWaiters();
+        await Promise.all(this.slots.map(slot => this.closeBrowser(slot)));
+        try {
+            fs.unlinkSync(this.statusPath);
+        } catch (error) {
+            // Never written or already removed
+        }
+    }
+
+    status() {
+        const count = (state) => this.slots.filter(slot => slot.state === state).length;
+        return {
+            platform: this.platform,
+            pid: process.pid,
+            size: this.size,
+            maxUses: this.maxUses,
+            idle: count('idle'),
+            leased: count('leased'),
+            warming: count('warming') + count('recycling'),
+            failed: count('failed'),
+            slots: this.slots.map(({ id, state, uses, launches, error }) => ({ id, state, uses, launches, error })),
+            updatedAt: new Date().toISOString()
+        };
+    }
+
+    writeStatus() {
+        if (this.closed) {
+            return;
+        }
+        try {
+            if (!fs.existsSync(STATUS_DIR)) {
+                fs.mkdirSync(STATUS_DIR, { recursive: true });
+            }
+            // Write-then-rename so the dashboard never reads a half-written file
+            const tempPath = `${this.statusPath}.tmp`;
+            fs.writeFileSync(tempPath, JSON.stringify(this.status()));
+            fs.renameSync(tempPath, this.statusPath);
+        } catch (error) {
+            logger.warn('Failed to write browser pool status:', error);
+        }
+    }
+}
+
+module.exports = BrowserPool;
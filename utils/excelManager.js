@@ -4,10 +4,14 @@ const fs = require('fs');
 const path = require('path');
 
 class ExcelManager {
-    constructor(filePath) {
+    constructor(filePath, platform = null) {
         this.filePath = filePath;
-        this.logPath = path.join('data', 'order_log.xlsx');
+        this.platform = platform;
+        // Append-only JSON lines: one order per line, never rewritten
+        this.logPath = path.join('data', 'order_log.jsonl');
+        this.legacyLogPath = path.join('data', 'order_log.xlsx');
         this.ensureDirectoriesExist();
+        this.migrateLegacyLog();
     }
 
     ensureDirectoriesExist() {
@@ -17,6 +21,38 @@ class ExcelManager {
         }
     }
 
+    migrateLegacyLog() {
+        // One-time import of the old order_log.xlsx. The rename is atomic, so only
+        // one of several bot processes starting together performs the import.
+        if (!fs.existsSync(this.legacyLogPath)) {
+            return;
+        }
+        const claimedPath = path.join('data', `order_log.legacy-${Date.now()}-${process.pid}.xlsx`);
+        try {
+            fs.renameSync(this.legacyLogPath, claimedPath);
+        } catch (error) {
+            return;
+        }
+        try {
+            const workbook = XLSX.readFile(claimedPath);
+            const sheet = workbook.Sheets['Orders'] || workbook.Sheets[workbook.SheetNames[0]];
+            const rows = XLSX.utils.sheet_to_json(sheet);
+            const lines = rows.map(row => JSON.stringify({
+                Timestamp: row.Timestamp,
+                Platform: row.Platform || null,
+                Product: row.Product,
+                Price: row.Price,
+                Status: row.Status
+            }) + '\n').join('');
+            if (lines) {
+                fs.appendFileSync(this.logPath, lines);
+            }
+            logger.info(`Migrated ${rows.length} orders from ${this.legacyLogPath} to ${this.logPath}`);
+        } catch (error) {
+            logger.error('Failed to migrate legacy order log:', error);
+        }
+    }
+
     readConfig() {
         try {
             const workbook = XLSX.readFile(this.filePath);
@@ -28,35 +64,25 @@ class ExcelManager {
         }
     }
 
-    logOrder(productInfo, status = 'Purchased') {
+    logOrder(productInfo, status = 'Purchased', context = {}) {
         try {
-            let workbook;
-            let sheet;
-
-            // Check if log file exists
-            if (fs.existsSync(this.logPath)) {
-                workbook = XLSX.readFile(this.logPath);
-                sheet = workbook.Sheets['Orders'];
-            } else {
-                // Create new workbook with headers
-                workbook = XLSX.utils.book_new();
-                sheet = XLSX.utils.aoa_to_sheet([
-                    ['Timestamp', 'Product', 'Price', 'Status']
-                ]);
-                XLSX.utils.book_append_sheet(workbook, sheet, 'Orders');
+            const entry = {
+                Timestamp: new Date().toISOString(),
+                Platform: this.platform,
+                Product: productInfo.name,
+                Price: productInfo.price,
+                Status: status
+            };
+            // Account and URL let RunState seed completed entries from this log
+            if (context.account) {
+                entry.Account = context.account;
             }
-
-            // Add new row
-            const newRow = [
-                new Date().toISOString(),
-                productInfo.name,
-                productInfo.price,
-                status
-            ];
-            XLSX.utils.sheet_add_aoa(sheet, [newRow], { origin: -1 });
-
-            // Write to file
-            XLSX.writeFile(workbook, this.logPath);
+            if (context.url) {
+                entry.URL = context.url;
+            }
+            // A single small O_APPEND write, so concurrent bot processes do not
+            // interleave or overwrite each other's orders
+            fs.appendFileSync(this.logPath, JSON.stringify(entry) + '\n');
             logger.info('Order logged successfully');
         } catch (error) {
             logger.error('Failed to log order:', error);
@@ -65,4 +91,4 @@ class ExcelManager {
     }
 }
 
-module.exports = ExcelManager; 
\ No newline at end of file
+module.exports = ExcelManager;
@@ -0,0 +1,123 @@
+const logger = require('../config/logger');
+const leanRules = require('../config/leanRules');
+
+// Blocked requests are never downloaded, so their size is estimated by type
+const ESTIMATED_BYTES = {
+    image: 40 * 1024,
+    media: 500 * 1024,
+    font: 35 * 1024,
+    script: 30 * 1024,
+    stylesheet: 15 * 1024
+};
+const DEFAULT_ESTIMATE = 2 * 1024;
+
+const formatBytes = (bytes) => bytes >= 1024 * 1024
+    ? `${(bytes / (1024 * 1024)).toFixed(1)} MB`
+    : `${Math.round(bytes / 1024)} KB`;
+
+// Lean page mode: context-level routing that aborts images, fonts and tracker
+// requests according to config/leanRules.js, and logs the estimated bytes saved
+// for every page load. Note that routing turns off Chromium's HTTP cache for
+// the context, which matters little here since contexts are per account.
+class LeanMode {
+    constructor(platform, rules = LeanMode.rulesFor(platform)) {
+        this.platform = platform;
+        this.denyTypes = new Set(rules.denyTypes);
+        this.denyPatterns = rules.denyPatterns;
+        this.allowPatterns = rules.allowPatterns;
+        this.pages = new Map();
+        this.totals = { pages: 0, blocked: 0, bytes: 0 };
+    }
+
+    static enabled() {
+        return /^(1|true|yes|on)$/i.test(process.env.LEAN_MODE || '');
+    }
+
+    static fromEnv(platform) {
+        return LeanMode.enabled() ? new LeanMode(platform) : null;
+    }
+
+    static rulesFor(platform) {
+        const base = leanRules.default;
+        const own = leanRules[platform] || {};
+        return {
+            denyTypes: own.denyTypes || base.denyTypes,
+            denyPatterns: [...base.denyPatterns, ...(own.denyPatterns || [])],
+            allowPatterns: [...base.allowPatterns, ...(own.allowPatterns || [])]
+        };
+    }
+
+    shouldBlock(url, resourceType) {
+        if (this.allowPatterns.some(pattern => url.includes(pattern))) {
+            return false;
+        }
+        return this.denyTypes.has(resourceType) || this.denyPatterns.some(pattern => url.includes(pattern));
+    }
+
+    async attach(context) {
+        context.on('page', page => this.trackPage(page));
+        context.pages().forEach(page => this.trackPage(page));
+        await context.route('**/*', (route) => {
+            const request = route.request();
+            if (!this.shouldBlock(request.url(), request.resourceType())) {
+                return route.continue();
+            }
+            this.recordBlocked(request);
+            return route.abort('blockedbyclient');
+        });
+    }
+
+    trackPage(page) {
+        if (this.pages.has(page)) {
+            return;
+        }
+        this.pages.set(page, { url: null, blocked: 0, bytes: 0 });
+        page.on('framenavigated', (frame) => {
+            if (frame === page.mainFrame()) {
+                this.finishPageLoad(page, frame.url());
+            }
+        });
+        page.on('close', () => {
+            this.finishPageLoad(page, null);
+            this.pages.delete(page);
+        });
+    }
+
+    recordBlocked(request) {
+        const bytes = ESTIMATED_BYTES[request.resourceType()] || DEFAULT_ESTIMATE;
+        this.totals.blocked++;
+        this.totals.bytes += bytes;
+        let page = null;
+        try {
+            page = request.frame().page();
+        } catch (error) {
+            // Requests without a frame (e.g. from workers) only count in the totals
+        }
+        const stats = page && this.pages.get(page);
+        if (stats) {
+            stats.blocked++;
+            stats.bytes += bytes;
+        }
+    }
+
+    finishPageLoad(page, nextUrl) {
+        // Reports the load that just ended and starts counting for nextUrl
+        const stats = this.pages.get(page);
+        if (!stats) {
+            return;
+        }
+        if (stats.url && stats.blocked > 0) {
+            this.totals.pages++;
+            logger.info(`Lean mode: blocked ${stats.blocked} requests, saved ~${formatBytes(stats.bytes)} on ${stats.url}`);
+        }
+        stats.url = nextUrl;
+        stats.blocked = 0;
+        stats.bytes = 0;
+    }
+
+    summary() {
+        return `Lean mode total: ${this.totals.blocked} requests blocked, ~${formatBytes(this.totals.bytes)} saved over ${this.totals.pages} page loads`;
+    }
+}
+
+module.exports = LeanMode;
@@ -0,0 +1,153 @@
+const fs = require('fs');
+const path = require('path');
+const logger = require('../config/logger');
+
+// Resumable run state for one platform, keyed by (account, URL).
+// data/run_state/<platform>.jsonl is append-only like the order log: bots append
+// {"status":"done"} lines and the dashboard appends {"reset":...} markers, so
+// several bot processes and the dashboard never rewrite each other's lines.
+// Completed entries are also seeded from purchases in data/order_log.jsonl.
+//
+// Entries only count within a run. Every bot process appends a
+// {"run":"start"} line when it starts and {"run":"end"} when it gets through
+// all its accounts. A start while no other process of the platform is open
+// begins a new run and forgets everything completed before it, so the next
+// drop with the same workbook buys again. A process that crashed or was
+// stopped leaves its run open, and the next start resumes it unless the run
+// has been idle for longer than RUN_STATE_MAX_AGE_HOURS (default 24).
+const DEFAULT_MAX_AGE_HOURS = 24;
+
+class RunState {
+    constructor(platform, orderLogPath = path.join('data', 'order_log.jsonl'), options = {}) {
+        this.platform = platform;
+        this.orderLogPath = orderLogPath;
+        this.statePath = path.join('data', 'run_state', `${platform}.jsonl`);
+        const maxAgeHours = options.maxAgeHours || parseFloat(process.env.RUN_STATE_MAX_AGE_HOURS) || DEFAULT_MAX_AGE_HOURS;
+        this.maxAgeMs = maxAgeHours * 3600 * 1000;
+        this.completed = new Map();
+        this.runStartedAt = null;
+        this.ensureDirectoryExists();
+        this.append({ run: 'start' });
+        this.load();
+    }
+
+    static key(account, url) {
+        return `${String(account || '').trim().toLowerCase()}\t${String(url || '').trim()}`;
+    }
+
+    static splitUrls(productUrls) {
+        return String(productUrls || '').split(',').map(url => url.trim()).filter(Boolean);
+    }
+
+    ensureDirectoryExists() {
+        const dir = path.dirname(this.statePath);
+        if (!fs.existsSync(dir)) {
+            fs.mkdirSync(dir, { recursive: true });
+        }
+    }
+
+    readLines(filePath) {
+        if (!fs.existsSync(filePath)) {
+            return [];
+        }
+        const records = [];
+        for (const line of fs.readFileSync(filePath, 'utf8').split('\n')) {
+            if (!line.trim()) {
+                continue;
+            }
+            try {
+                records.push(JSON.parse(line));
+            } catch (error) {
+                // Partial trailing line from a writer that is still appending
+            }
+        }
+        return records;
+    }
+
+    append(record) {
+        const line = { at: new Date().toISOString(), ...record, pid: process.pid };
+        try {
+            fs.appendFileSync(this.statePath, JSON.stringify(line) + '\n');
+        } catch (error) {
+            logger.error('Failed to update run state:', error);
+        }
+        return line;
+    }
+
+    load() {
+        const events = [];
+        for (const row of this.readLines(this.orderLogPath)) {
+            if (row.Platform === this.platform && row.Account && row.URL && /purchased/i.test(row.Status || '')) {
+                events.push({ at: Date.parse(row.Timestamp) || 0, key: RunState.key(row.Account, row.URL), done: true });
+            }
+        }
+        for (const line of this.readLines(this.statePath)) {
+            const at = Date.parse(line.at) || 0;
+            if (line.run === 'start' || line.run === 'end') {
+                events.push({ at, run: line.run, pid: line.pid });
+            } else if (line.reset === 'all') {
+                events.push({ at, all: true });
+            } else if (line.reset) {
+                events.push({ at, key: RunState.key(line.account, line.url), done: false });
+            } else if (line.status === 'done') {
+                events.push({ at, key: RunState.key(line.account, line.url), done: true });
+            }
+        }
+        // Replay in time order so a reset only clears what was completed before it
+        events.sort((a, b) => a.at - b.at);
+
+        this.completed.clear();
+        const open = new Set();
+        let lastAt = null;
+        for (const event of events) {
+            if (event.run === 'start') {
+                if (open.size === 0 || event.at - lastAt > this.maxAgeMs) {
+                    // New run: whatever was completed before it no longer counts
+                    open.clear();
+                    this.completed.clear();
+                    this.runStartedAt = event.at;
+                }
+                open.add(event.pid);
+            } else if (event.run === 'end') {
+                open.delete(event.pid);
+            } else if (event.all) {
+                this.completed.clear();
+            } else if (event.done) {
+                this.completed.set(event.key, event.at);
+            } else {
+                this.completed.delete(event.key);
+            }
+            lastAt = event.at;
+        }
+        logger.info(`Run state for ${this.platform}: ${this.completed.size} completed entries`);
+    }
+
+    isDone(account, url) {
+        return this.completed.has(RunState.key(account, url));
+    }
+
+    pending(account, urls) {
+        return urls.filter(url => !this.isDone(account, url));
+    }
+
+    markDone(account, url) {
+        const line = this.append({ account, url, status: 'done' });
+        this.completed.set(RunState.key(account, url), Date.parse(line.at));
+    }
+
+    finishIfComplete(accounts) {
+        // Only close the run once every URL is bought; otherwise the next start
+        // resumes it and retries what is still pending. When all processes of
+        // the run have closed it, the next start begins a fresh run.
+        const pending = accounts.reduce((count, account) =>
+            count + this.pending(account.Email, RunState.splitUrls(account.URL)).length, 0);
+        if (pending > 0) {
+            logger.info(`Run for ${this.platform} left open: ${pending} URLs still pending`);
+            return false;
+        }
+        this.append({ run: 'end' });
+        return true;
+    }
+}
+
+module.exports = RunState;
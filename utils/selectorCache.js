@@ -0,0 +1,98 @@
+const fs = require('fs');
+const path = require('path');
+const logger = require('../config/logger');
+
+// Learned selectors for one platform, persisted to
+// data/selector_cache/<platform>.json as
+// { fields: { name: { selector, hits, misses, failures } }, updatedAt }.
+// race() checks the selector that won last time first, then waits on every
+// candidate at once and takes the first one to appear. Counters are kept as
+// deltas and merged into the file on save, so concurrent bot processes of the
+// same platform add up instead of overwriting each other.
+class SelectorCache {
+    constructor(platform) {
+        this.platform = platform;
+        this.filePath = path.join('data', 'selector_cache', `${platform}.json`);
+        this.fields = this.read().fields;
+        this.pending = {};
+    }
+
+    read() {
+        try {
+            const data = JSON.parse(fs.readFileSync(this.filePath, 'utf8'));
+            return { fields: data.fields || {} };
+        } catch (error) {
+            return { fields: {} };
+        }
+    }
+
+    async race(page, field, candidates, timeout = 2000) {
+        const cached = this.fields[field] && this.fields[field].selector;
+        if (cached && candidates.includes(cached)) {
+            const element = await page.$(cached).catch(() => null);
+            if (element) {
+                this.record(field, cached, 'hits');
+                return { selector: cached, element };
+            }
+        }
+
+        try {
+            const result = await Promise.any(candidates.map(selector =>
+                page.waitForSelector(selector, { timeout }).then(element => {
+                    if (!element) {
+                        throw new Error(`No element for ${selector}`);
+                    }
+                    return { selector, element };
+                })
+            ));
+            this.record(field, result.selector, result.selector === cached ? 'hits' : 'misses');
+            return result;
+        } catch (error) {
+            // AggregateError: no candidate appeared within the timeout
+            this.record(field, cached || null, 'failures');
+            return null;
+        }
+    }
+
+    record(field, selector, outcome) {
+        const entry = this.fields[field] || (this.fields[field] = { selector: null, hits: 0, misses: 0, failures: 0 });
+        const delta = this.pending[field] || (this.pending[field] = { hits: 0, misses: 0, failures: 0 });
+        entry[outcome]++;
+        delta[outcome]++;
+        if (selector && entry.selector !== selector) {
+            logger.info(`Learned ${this.platform} selector for ${field}: ${selector}`);
+            entry.selector = selector;
+            delta.selector = selector;
+        }
+        this.save();
+    }
+
+    save() {
+        try {
+            const dir = path.dirname(this.filePath);
+            if (!fs.existsSync(dir)) {
+                fs.mkdirSync(dir, { recursive: true });
+            }
+            const { fields } = this.read();
+            for (const [field, delta] of Object.entries(this.pending)) {
+                const entry = fields[field] || { selector: null, hits: 0, misses: 0, failures: 0 };
+                entry.hits += delta.hits;
+                entry.misses += delta.misses;
+                entry.failures += delta.failures;
+                if (delta.selector) {
+                    entry.selector = delta.selector;
+                }
+                fields[field] = entry;
+            }
+            const tempPath = `${this.filePath}.${process.pid}.tmp`;
+            fs.writeFileSync(tempPath, JSON.stringify({ platform: this.platform, fields, updatedAt: new Date().toISOString() }, null, 2));
+            fs.renameSync(tempPath, this.filePath);
+            this.fields = fields;
+            this.pending = {};
+        } catch (error) {
+            logger.warn('Failed to save selector cache:', error);
+        }
+    }
+}
+
+module.exports = SelectorCache;